@@ -0,0 +1,95 @@
+"""TTS 后端 HTTP 连接池基准测试
+
+在本地启动一个模拟 TTS 服务（返回固定大小的 WAV 数据），分别测量：
+
+- 每次请求新建 ``httpx.AsyncClient``（旧实现）
+- 复用 ``create_http_client`` 创建的长连接客户端（新实现）
+
+的单次请求延迟。
+
+用法::
+
+    uv run python benchmarks/bench_http_pool.py [--requests 200] [--size 65536]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from tts_service.http import create_http_client  # noqa: E402
+
+
+async def _start_server(payload: bytes) -> tuple[web.AppRunner, str]:
+    """启动模拟 TTS 服务，返回 runner 和地址"""
+
+    async def handle(_: web.Request) -> web.Response:
+        return web.Response(body=payload, content_type="audio/wav")
+
+    app = web.Application()
+    app.router.add_post("/v1/tts", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://127.0.0.1:{port}/v1/tts"
+
+
+async def _bench_fresh(url: str, n: int) -> list[float]:
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            response = await client.post(url, json={"text": "测试"}, timeout=300)
+            response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def _bench_pooled(url: str, n: int) -> list[float]:
+    latencies = []
+    client = create_http_client(300.0)
+    try:
+        for _ in range(n):
+            start = time.perf_counter()
+            response = await client.post(url, json={"text": "测试"})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await client.aclose()
+    return latencies
+
+
+def _report(name: str, latencies: list[float]) -> None:
+    ms = sorted(x * 1000 for x in latencies)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(
+        f"{name:<8} mean={statistics.mean(ms):7.3f}ms "
+        f"p50={statistics.median(ms):7.3f}ms p95={p95:7.3f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--size", type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    runner, url = await _start_server(b"\0" * args.size)
+    try:
+        _report("fresh", await _bench_fresh(url, args.requests))
+        _report("pooled", await _bench_pooled(url, args.requests))
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""MiniMax 非流式响应解码基准测试
+
+按不同音频时长构造 MiniMax t2a_v2 的 hex 响应体，分别测量：
+
+- ``response.json()`` + ``MinimaxTTSResponse.model_validate`` + ``bytes.fromhex``（旧实现）
+- ``split_audio_field`` + ``decode_hex_audio``（新实现）
+
+的总耗时，以及新实现中单个分块的解码耗时：解码期间持有 GIL，
+即解码线程最多连续卡住事件循环多久。
+
+用法::
+
+    uv run python benchmarks/bench_minimax_decode.py [--rounds 20]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from models.minimax import MinimaxTTSResponse  # noqa: E402
+from tts_service.minimax import (  # noqa: E402
+    _HEX_CHUNK,
+    decode_hex_audio,
+    split_audio_field,
+)
+
+# 32kHz 单声道 16bit WAV
+BYTES_PER_SECOND = 32000 * 2
+DURATIONS = (1, 5, 15, 30, 60)
+
+
+def _make_response(seconds: int) -> bytes:
+    audio = os.urandom(seconds * BYTES_PER_SECOND)
+    body = {
+        "data": {"audio": audio.hex(), "status": 2},
+        "extra_info": {"audio_length": seconds * 1000, "audio_size": len(audio)},
+        "trace_id": "0" * 32,
+        "base_resp": {"status_code": 0, "status_msg": "success"},
+    }
+    return json.dumps(body).encode()
+
+
+def _decode_old(content: bytes) -> bytes:
+    resp = MinimaxTTSResponse.model_validate(json.loads(content))
+    return bytes.fromhex(resp.data.audio)  # type: ignore[union-attr]
+
+
+def _decode_new(content: bytes) -> bytearray:
+    _, audio = split_audio_field(content)
+    return decode_hex_audio(audio)
+
+
+def _measure(func, content: bytes, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _max_chunk_ms(content: bytes, rounds: int) -> float:
+    """新实现中单个 hex 分块的解码耗时（期间不释放 GIL）"""
+    _, audio = split_audio_field(content)
+    chunk = audio[:_HEX_CHUNK]
+    return _measure(decode_hex_audio, chunk, rounds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'时长':>6} {'响应大小':>10} {'旧实现':>10} {'新实现':>10} {'最长阻塞':>10}"
+    )
+    for seconds in DURATIONS:
+        content = _make_response(seconds)
+        old = _measure(_decode_old, content, args.rounds)
+        new = _measure(_decode_new, content, args.rounds)
+        stall = _max_chunk_ms(content, args.rounds)
+        print(
+            f"{seconds:>5}s {len(content) / 1024 / 1024:>8.1f}MB "
+            f"{old:>8.2f}ms {new:>8.2f}ms {stall:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -59,7 +59,6 @@ hiddenimports = [
     # qasync
     "qasync",
     # 音频相关
-    "pyaudio",
     "sounddevice",
     # 其他
     "loguru",
@@ -5,19 +5,23 @@ from bilibili_api import Credential, live, user
 from loguru import logger
 from PySide6.QtCore import QObject, QTimer, Signal
 
+from core.announcement import announcements
 from core.const import COOKIES_PATH
-from core.player import audio_player
 from core.qconfig import cfg
 from models.bilibili import (
+    AnchorLotAward,
+    AnchorLotStart,
     DanmuMessage,
     EventType,
     GiftMessage,
     GuardBuy,
+    RoomBlockMsg,
     SuperChatMessage,
 )
-from tts_service import get_tts_service
+from tts_service import Channel, speak, text_normalizer
 
 from .gift_merger import gift_merger
+from .lottery import lottery_filter
 
 
 class BiliService(QObject):
@@ -63,6 +67,9 @@ class BiliService(QObject):
             if not cfg.normalDanmakuOn.value:
                 return
             danmu_message = DanmuMessage.parse(event)
+            # 天选时刻的口令弹幕只计数，不显示也不播报
+            if cfg.lotteryFilterOn.value and lottery_filter.suppress(danmu_message):
+                return
             logger.info(danmu_message)
 
             # 发射信号到 GUI
@@ -71,9 +78,21 @@ class BiliService(QObject):
             )
             self.danmaku_received.emit(display_text)
 
-            tts_service = get_tts_service()
-            audio = await tts_service.text_to_speech(display_text)
-            await audio_player.play_bytes_async(audio)
+            # 播报规范化后的内容（压缩重复、去表情、截断刷屏）
+            message = text_normalizer.normalize_message(
+                danmu_message.message,
+                emoticons=danmu_message.emotion.keys(),
+                is_image=bool(danmu_message.pic_emoticon),
+            )
+            if not message:
+                return
+            await speak(
+                cfg.danmakuOnText.value.format(
+                    user_name=danmu_message.user_name, message=message
+                ),
+                event=EventType.DANMU_MSG,
+                user_mid=danmu_message.user_mid,
+            )
 
         @self.room_obj.on(EventType.SEND_GIFT)
         async def on_send_gift(event):
@@ -104,9 +123,12 @@ class BiliService(QObject):
             )
             self.guard_received.emit(display_text)
 
-            tts_service = get_tts_service()
-            audio = await tts_service.text_to_speech(display_text)
-            await audio_player.play_bytes_async(audio)
+            await speak(
+                display_text,
+                Channel.SFX,
+                event=EventType.GUARD_BUY,
+                user_mid=guard_buy_message.user_mid,
+            )
 
         @self.room_obj.on(EventType.SUPER_CHAT_MESSAGE)
         async def on_super_chat_message(event):
@@ -124,9 +146,46 @@ class BiliService(QObject):
             )
             self.superchat_received.emit(display_text)
 
-            tts_service = get_tts_service()
-            audio = await tts_service.text_to_speech(display_text)
-            await audio_player.play_bytes_async(audio)
+            message = text_normalizer.normalize_message(super_chat_message.message)
+            await speak(
+                cfg.superChatOnText.value.format(
+                    user_name=super_chat_message.user_name,
+                    message=message,
+                ),
+                Channel.PRIORITY,
+                event=EventType.SUPER_CHAT_MESSAGE,
+                user_mid=super_chat_message.user_mid,
+            )
+
+        @self.room_obj.on(EventType.ROOM_BLOCK_MSG)
+        async def on_room_block(event):
+            block_message = RoomBlockMsg.parse(event)
+            logger.info(block_message)
+
+            # 被禁言用户已在各环节排队的播报全部丢弃，之后一段时间内的消息也不再播报
+            gifts = gift_merger.remove_user(block_message.user_mid)
+            cancelled = announcements.block_user(
+                block_message.user_mid, cfg.blockDenySeconds.value
+            )
+            if gifts or cancelled:
+                logger.info(
+                    f"已丢弃 {block_message.user_name} 的 {gifts} 组礼物、"
+                    f"{cancelled} 条播报"
+                )
+
+        @self.room_obj.on(EventType.ANCHOR_LOT_START)
+        async def on_lottery_start(event):
+            if not cfg.lotteryFilterOn.value:
+                return
+            lottery_filter.start(AnchorLotStart.parse(event))
+
+        @self.room_obj.on(EventType.ANCHOR_LOT_AWARD)
+        async def on_lottery_award(event):
+            if not cfg.lotteryFilterOn.value:
+                return
+            for text in lottery_filter.award(AnchorLotAward.parse(event)):
+                self.danmaku_received.emit(text)
+                await speak(text, Channel.PRIORITY, event=EventType.ANCHOR_LOT_AWARD)
 
     def load_credential(self):
         with open(COOKIES_PATH, "r", encoding="utf-8") as f:
@@ -174,6 +233,7 @@ class BiliService(QObject):
             self.status_check_timer.stop()
         gift_merger.stop()
         await gift_merger.clear_all()
+        lottery_filter.clear()
         logger.info("停止直播间监听")
 
     def is_logged_in(self) -> bool:
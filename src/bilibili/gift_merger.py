@@ -10,10 +10,10 @@ from pydantic import BaseModel, Field
 from PySide6.QtCore import QObject, QTimer, Signal
 from qasync import asyncSlot
 
-from core.player import audio_player
+from core.announcement import announcements
 from core.qconfig import cfg
-from models.bilibili import GiftMessage
-from tts_service import get_tts_service
+from models.bilibili import EventType, GiftMessage
+from tts_service import Channel, speak
 
 
 class UserGiftGroup(BaseModel):
@@ -24,6 +24,7 @@ class UserGiftGroup(BaseModel):
     """
 
     user_name: str = Field(description="用户名")
+    user_mid: int = Field(default=0, description="用户 ID")
     gift_name: str = Field(description="礼物名称")
     total_num: int = Field(description="累计礼物数量")
     first_time: float = Field(
@@ -59,6 +60,8 @@ class GiftMerger(QObject):
         """
         super().__init__()
         self.user_gift_groups: dict[tuple[str, str], UserGiftGroup] = {}
+        # 用户 ID -> 该用户的礼物组键，禁言时不必遍历全部礼物组
+        self._user_keys: dict[int, set[tuple[str, str]]] = {}
 
         self.check_timer = QTimer(self)
         self.check_timer.timeout.connect(self._check_gift_groups)
@@ -87,6 +90,8 @@ class GiftMerger(QObject):
         Args:
             gift_message: 礼物消息对象
         """
+        if announcements.is_blocked(gift_message.user_mid):
+            return
         if cfg.giftMergeOn.value:
             await self._add_to_user_gift_group(gift_message)
         else:
@@ -108,10 +113,12 @@ class GiftMerger(QObject):
             initial_window = cfg.giftMergeWindowInitial.value
             self.user_gift_groups[user_key] = UserGiftGroup(
                 user_name=gift_message.user_name,
+                user_mid=gift_message.user_mid,
                 gift_name=gift_message.gift_name,
                 total_num=gift_message.gift_num,
                 current_window=initial_window,
             )
+            self._user_keys.setdefault(gift_message.user_mid, set()).add(user_key)
             logger.debug(
                 f"创建新单用户礼物组: {gift_message.user_name} - {gift_message.gift_name} "
                 f"x{gift_message.gift_num}，初始窗口时间: {initial_window}s"
@@ -172,6 +179,7 @@ class GiftMerger(QObject):
             return
 
         user_gift_group = self.user_gift_groups.pop(user_key)
+        self._discard_user_key(user_gift_group.user_mid, user_key)
 
         logger.info(
             f"处理单用户礼物组: {user_gift_group.user_name} - {user_gift_group.gift_name} "
@@ -181,6 +189,7 @@ class GiftMerger(QObject):
         # 创建合并后的 GiftMessage 并直接播报
         merged_gift = GiftMessage(
             user_name=user_gift_group.user_name,
+            user_mid=user_gift_group.user_mid,
             gift_name=user_gift_group.gift_name,
             gift_num=user_gift_group.total_num,
         )
@@ -203,10 +212,28 @@ class GiftMerger(QObject):
         # 发射信号到 GUI
         self.merged_gift_received.emit(display_text)
 
-        # 发送 TTS
-        tts_service = get_tts_service()
-        audio = await tts_service.text_to_speech(display_text)
-        await audio_player.play_bytes_async(audio)
+        # 发送 TTS，礼物感谢可以叠在正在播放的播报上
+        await speak(
+            display_text,
+            Channel.SFX,
+            event=EventType.SEND_GIFT,
+            user_mid=gift_message.user_mid,
+        )
+
+    def _discard_user_key(self, user_mid: int, user_key: tuple[str, str]) -> None:
+        user_keys = self._user_keys.get(user_mid)
+        if user_keys is None:
+            return
+        user_keys.discard(user_key)
+        if not user_keys:
+            del self._user_keys[user_mid]
+
+    def remove_user(self, user_mid: int) -> int:
+        """丢弃某个用户尚未播报的礼物组（用户被禁言时调用），返回丢弃的组数"""
+        user_keys = self._user_keys.pop(user_mid, set())
+        for user_key in user_keys:
+            del self.user_gift_groups[user_key]
+        return len(user_keys)
 
     async def clear_all(self):
         """清空所有礼物组
@@ -215,6 +242,7 @@ class GiftMerger(QObject):
         通常在停止监听或重新连接时调用。
         """
         self.user_gift_groups.clear()
+        self._user_keys.clear()
         logger.info("清空所有礼物组")
 
 
@@ -0,0 +1,122 @@
+"""天选时刻弹幕过滤
+
+天选时刻（主播抽奖）开始后，观众需要发送指定的口令弹幕参与，
+短时间内会涌入成百上千条相同的弹幕，逐条播报既没有意义也会占满合成后端。
+抽奖进行期间与口令完全相同的弹幕不播报，只统计参与人数；
+开奖时播报一次参与人数和中奖用户。
+"""
+
+from dataclasses import dataclass, field
+from time import time
+
+from loguru import logger
+
+from models.bilibili import AnchorLotAward, AnchorLotStart, DanmuMessage
+
+
+@dataclass
+class _Lottery:
+    """进行中的一次抽奖"""
+
+    id: int
+    keyword: str
+    # 发送过口令弹幕的用户
+    entrants: set[int] = field(default_factory=set)
+
+
+class LotteryFilter:
+    """天选时刻口令弹幕过滤器
+
+    每次抽奖在 ``开始时间 + 抽奖时长 + grace`` 后过期：没有收到开奖消息时不再过滤口令弹幕，
+    该抽奖的中奖播报记录也一并清除。
+
+    Attributes:
+        default_duration: 开始消息没有给出时长时使用的抽奖时长（秒）
+        grace: 过期前额外等待的时间（秒），开奖消息可能晚于倒计时结束到达
+    """
+
+    default_duration = 3600
+    grace = 300
+
+    def __init__(self):
+        self._lotteries: dict[int, _Lottery] = {}
+        # 口令 -> 抽奖 ID，按口令过滤弹幕时只需一次字典查找
+        self._keywords: dict[str, int] = {}
+        # 抽奖 ID -> 过期时间，开奖后仍保留到过期，用于中奖播报去重
+        self._expires: dict[int, float] = {}
+        # 抽奖 ID -> 已播报过的中奖用户 ID
+        self._awarded: dict[int, set[int]] = {}
+
+    def start(self, lot_start: AnchorLotStart) -> None:
+        """开始过滤一次抽奖的口令弹幕"""
+        keyword = lot_start.danmu.strip()
+        if not keyword:
+            # 不需要发送弹幕的抽奖（如仅需关注），不会产生口令弹幕
+            return
+        self._expire()
+        duration = lot_start.duration or self.default_duration
+        self._lotteries[lot_start.id] = _Lottery(lot_start.id, keyword)
+        self._keywords[keyword] = lot_start.id
+        self._expires[lot_start.id] = time() + duration + self.grace
+        logger.info(f"天选时刻开始，暂停播报口令弹幕: {keyword}")
+
+    def suppress(self, danmu_message: DanmuMessage) -> bool:
+        """弹幕是否为进行中抽奖的口令，是则计入参与人数并返回 True"""
+        if not self._keywords:
+            return False
+        lottery_id = self._keywords.get(danmu_message.message.strip())
+        if lottery_id is None:
+            return False
+        if time() > self._expires[lottery_id]:
+            self._expire()
+            return False
+        self._lotteries[lottery_id].entrants.add(danmu_message.user_mid)
+        return True
+
+    def award(self, lot_award: AnchorLotAward) -> list[str]:
+        """开奖：结束对应抽奖的过滤，返回需要播报的文本（参与人数、每位中奖用户）
+
+        参与人数只在抽奖结束时播报一次，同一抽奖的同一中奖用户也只播报一次。
+        """
+        self._expire()
+        texts: list[str] = []
+        lottery = self._end(lot_award.id)
+        if lottery is not None and lottery.entrants:
+            texts.append(f"本次天选时刻共有 {len(lottery.entrants)} 人参与")
+            logger.info(
+                f"天选时刻结束: {lottery.keyword}，参与人数 {len(lottery.entrants)}"
+            )
+        # 开始消息之前就已进行的抽奖没有记录，中奖记录保留 grace 秒
+        self._expires.setdefault(lot_award.id, time() + self.grace)
+        awarded = self._awarded.setdefault(lot_award.id, set())
+        for user in lot_award.award_users:
+            if not user.user_name or user.user_mid in awarded:
+                continue
+            awarded.add(user.user_mid)
+            texts.append(f'恭喜 "{user.user_name}" 抽中了{lot_award.award_name}')
+        return texts
+
+    def _end(self, lottery_id: int) -> _Lottery | None:
+        lottery = self._lotteries.pop(lottery_id, None)
+        if lottery is not None and self._keywords.get(lottery.keyword) == lottery_id:
+            del self._keywords[lottery.keyword]
+        return lottery
+
+    def _expire(self) -> None:
+        """结束超时未开奖的抽奖，清除过期抽奖的中奖记录"""
+        now = time()
+        for lottery_id, expires_at in list(self._expires.items()):
+            if expires_at < now:
+                del self._expires[lottery_id]
+                self._end(lottery_id)
+                self._awarded.pop(lottery_id, None)
+
+    def clear(self) -> None:
+        """清除所有抽奖状态（停止监听时调用）"""
+        self._lotteries.clear()
+        self._keywords.clear()
+        self._expires.clear()
+        self._awarded.clear()
+
+
+lottery_filter = LotteryFilter()
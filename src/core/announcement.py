@@ -0,0 +1,165 @@
+"""播报记录
+
+每条播报从开始合成到播放结束都有一条 ``Announcement``，记录编号、来源事件和用户，
+供播放控制按条跳过、按事件类型清空、按用户清除（如被禁言的用户）。
+
+取消只设置标记并取消合成任务，不在队列中查找删除：混音器在取到已取消的播报时直接丢弃，
+正在播放的播报在下一块混音时停止。按用户和事件类型建有索引，清除时只访问相关的播报。
+
+被房管禁言的用户在一段时间内加入拒绝名单，期间不再产生新的播报。
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from itertools import count
+
+from loguru import logger
+
+_ids = count(1)
+
+
+@dataclass(eq=False)
+class Announcement:
+    """一条播报
+
+    Attributes:
+        text: 播报文本
+        event: 来源事件类型（``EventType`` 的值），为空表示手动播报
+        user_mid: 触发播报的用户 ID，为 None 表示与用户无关
+        id: 播报编号
+        cancelled: 是否已取消
+        queued: 是否已交给播放器，此后由混音器在播放结束时注销
+        task: 正在进行的合成任务
+    """
+
+    text: str
+    event: str = ""
+    user_mid: int | None = None
+    id: int = field(default_factory=lambda: next(_ids))
+    cancelled: bool = False
+    queued: bool = False
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+    def cancel(self) -> None:
+        """取消播报：未合成完的停止合成，未播放的不再播放（需在事件循环线程调用）"""
+        self.cancelled = True
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+
+class AnnouncementRegistry:
+    """正在合成或等待播放的播报（线程安全）
+
+    事件循环线程登记、取消播报，混音线程在播报播完或被丢弃时注销。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: dict[int, Announcement] = {}
+        self._by_user: dict[int, dict[int, Announcement]] = {}
+        self._by_event: dict[str, dict[int, Announcement]] = {}
+        # 拒绝名单：用户 ID -> 到期时间（time.monotonic）
+        self._denied: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, announcement: Announcement) -> None:
+        with self._lock:
+            self._items[announcement.id] = announcement
+            if announcement.user_mid is not None:
+                self._by_user.setdefault(announcement.user_mid, {})[announcement.id] = (
+                    announcement
+                )
+            self._by_event.setdefault(announcement.event, {})[announcement.id] = (
+                announcement
+            )
+
+    def remove(self, announcement: Announcement) -> None:
+        """注销播报，可重复调用"""
+        with self._lock:
+            if self._items.pop(announcement.id, None) is None:
+                return
+            self._discard(self._by_user, announcement.user_mid, announcement.id)
+            self._discard(self._by_event, announcement.event, announcement.id)
+
+    @staticmethod
+    def _discard(index: dict, key, announcement_id: int) -> None:
+        group = index.get(key)
+        if group is None:
+            return
+        group.pop(announcement_id, None)
+        if not group:
+            del index[key]
+
+    def get(self, announcement_id: int) -> Announcement | None:
+        return self._items.get(announcement_id)
+
+    def cancel(self, announcement_id: int) -> bool:
+        """按编号取消播报，返回是否找到"""
+        announcement = self.get(announcement_id)
+        if announcement is None:
+            return False
+        announcement.cancel()
+        return True
+
+    def _cancel_all(self, announcements: list[Announcement]) -> int:
+        cancelled = 0
+        for announcement in announcements:
+            if not announcement.cancelled:
+                announcement.cancel()
+                cancelled += 1
+        return cancelled
+
+    def purge_user(self, user_mid: int) -> int:
+        """取消某个用户的全部播报，返回取消的条数"""
+        with self._lock:
+            announcements = list(self._by_user.get(user_mid, {}).values())
+        cancelled = self._cancel_all(announcements)
+        if cancelled:
+            logger.info(f"已清除用户 {user_mid} 的 {cancelled} 条播报")
+        return cancelled
+
+    def flush(self, event: str | None = None) -> int:
+        """取消某类事件（默认全部）的播报，返回取消的条数"""
+        with self._lock:
+            if event is None:
+                announcements = list(self._items.values())
+            else:
+                announcements = list(self._by_event.get(event, {}).values())
+        cancelled = self._cancel_all(announcements)
+        if cancelled:
+            logger.info(f"已清空 {cancelled} 条播报")
+        return cancelled
+
+    def block_user(self, user_mid: int, duration: float) -> int:
+        """清除用户的全部播报，并在 ``duration`` 秒内拒绝该用户的新播报
+
+        Returns:
+            取消的条数
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._denied = {
+                mid: expiry for mid, expiry in self._denied.items() if expiry > now
+            }
+            if duration > 0:
+                self._denied[user_mid] = now + duration
+        return self.purge_user(user_mid)
+
+    def unblock_user(self, user_mid: int) -> bool:
+        """把用户移出拒绝名单，返回用户原本是否在名单中"""
+        with self._lock:
+            return self._denied.pop(user_mid, None) is not None
+
+    def is_blocked(self, user_mid: int | None) -> bool:
+        """用户是否在拒绝名单中"""
+        if user_mid is None:
+            return False
+        expiry = self._denied.get(user_mid)
+        return expiry is not None and expiry > time.monotonic()
+
+
+announcements = AnnouncementRegistry()
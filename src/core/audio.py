@@ -0,0 +1,243 @@
+"""音频数据结构
+
+播放器与各 TTS 后端之间传递音频时使用的轻量数据结构。
+"""
+
+import queue
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class AudioFormat:
+    """PCM 音频格式"""
+
+    sample_rate: int
+    channels: int
+    sample_width: int  # 每个采样的字节数，16-bit PCM 为 2
+
+    @property
+    def frame_size(self) -> int:
+        """每帧字节数"""
+        return self.channels * self.sample_width
+
+    @property
+    def bytes_per_second(self) -> int:
+        """每秒字节数"""
+        return self.sample_rate * self.frame_size
+
+
+def parse_wav_header(data: bytes) -> tuple[AudioFormat, int] | None:
+    """解析 WAV 文件头
+
+    只解析到 ``data`` 块起始位置为止，不依赖 ``data`` 块声明的长度，
+    因此也适用于流式返回、长度字段为 0 或 0xFFFFFFFF 的 WAV。
+
+    Args:
+        data: WAV 数据的开头部分
+
+    Returns:
+        (音频格式, PCM 数据起始偏移)；数据不足以解析完整文件头时返回 None
+
+    Raises:
+        ValueError: 不是 PCM 编码的 WAV 数据
+    """
+    if len(data) < 12:
+        return None
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("不是有效的 WAV 数据")
+    offset = 12
+    audio_format: AudioFormat | None = None
+    while len(data) >= offset + 8:
+        chunk_id = data[offset : offset + 4]
+        (chunk_size,) = struct.unpack_from("<I", data, offset + 4)
+        body = offset + 8
+        if chunk_id == b"data":
+            if audio_format is None:
+                raise ValueError("WAV 数据缺少 fmt 块")
+            return audio_format, body
+        if len(data) < body + chunk_size:
+            return None
+        if chunk_id == b"fmt ":
+            tag, channels, sample_rate = struct.unpack_from("<HHI", data, body)
+            (bits,) = struct.unpack_from("<H", data, body + 14)
+            # 1 = PCM，0xFFFE = WAVE_FORMAT_EXTENSIBLE（常见于多声道）
+            if tag not in (1, 0xFFFE):
+                raise ValueError(f"不支持的 WAV 编码: {tag}")
+            audio_format = AudioFormat(sample_rate, channels, bits // 8)
+        # RIFF 块按 2 字节对齐
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+def pcm_to_wav(audio_format: AudioFormat, pcm: bytes | bytearray | memoryview) -> bytes:
+    """给 PCM 数据加上 WAV 文件头
+
+    Args:
+        audio_format: PCM 音频格式
+        pcm: PCM 数据
+
+    Returns:
+        bytes: WAV 格式的音频
+    """
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + len(pcm),
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        audio_format.channels,
+        audio_format.sample_rate,
+        audio_format.bytes_per_second,
+        audio_format.frame_size,
+        audio_format.sample_width * 8,
+        b"data",
+        len(pcm),
+    )
+    return header + pcm
+
+
+@dataclass(frozen=True, slots=True)
+class Loudness:
+    """一段音频的响度测量结果"""
+
+    # 近似 LUFS（见 ``core.loudness``）
+    lufs: float
+    # 采样峰值，满刻度为 1
+    peak: float
+
+
+@dataclass(frozen=True, slots=True)
+class AudioClip:
+    """一段完整的 PCM 音频
+
+    ``data`` 可以是 bytes、bytearray，也可以是指向 WAV 数据内部的 memoryview，
+    从 WAV 构造时只解析文件头，不复制 PCM 数据。播放器和缓存直接使用 ``data``。
+    ``loudness`` 为合成时测得的响度，随音频一起缓存，播放时据此做响度归一化。
+    """
+
+    format: AudioFormat
+    data: bytes | bytearray | memoryview
+    loudness: Loudness | None = None
+
+    @classmethod
+    def from_wav(cls, wav: bytes | bytearray) -> "AudioClip":
+        """从 WAV 数据构造，PCM 部分以 memoryview 引用原数据
+
+        Raises:
+            ValueError: 不是完整的 PCM WAV 数据
+        """
+        parsed = parse_wav_header(wav)
+        if parsed is None:
+            raise ValueError("WAV 数据不完整")
+        audio_format, offset = parsed
+        (size,) = struct.unpack_from("<I", wav, offset - 4)
+        end = len(wav)
+        # 流式生成的 WAV 长度字段为 0 或 0xFFFFFFFF，此时以实际长度为准
+        if 0 < size <= end - offset:
+            end = offset + size
+        end -= (end - offset) % audio_format.frame_size
+        return cls(audio_format, memoryview(wav)[offset:end])
+
+    @property
+    def sample_rate(self) -> int:
+        return self.format.sample_rate
+
+    @property
+    def channels(self) -> int:
+        return self.format.channels
+
+    @property
+    def sample_width(self) -> int:
+        return self.format.sample_width
+
+    @property
+    def nbytes(self) -> int:
+        """PCM 数据字节数"""
+        return len(self.data)
+
+    @property
+    def duration(self) -> float:
+        """时长（秒）"""
+        return self.nbytes / self.format.bytes_per_second
+
+    def to_wav(self) -> bytes:
+        """封装为 WAV 数据（导出或交给只接受 WAV 的接口时使用）"""
+        return pcm_to_wav(self.format, self.data)
+
+
+class PcmStream:
+    """分块到达的 PCM 音频流
+
+    由事件循环侧的合成协程 ``feed`` 写入，播放线程迭代或 ``read_nowait`` 读取；
+    ``close`` 之后迭代结束。内部使用线程安全队列，写入端永不阻塞。
+
+    ``format`` 允许在第一块数据写入前才确定（如需先解析 WAV 头的后端）。
+    网络分块不保证按帧对齐，写入时会把不足一帧的尾部留到下一块，
+    避免播放端截断半个采样导致爆音。
+    """
+
+    _EOF = object()
+
+    def __init__(self, audio_format: AudioFormat | None = None) -> None:
+        self.format = audio_format
+        # 合成过程中由写入端随已到达的音频更新
+        self.loudness: Loudness | None = None
+        self._queue: queue.SimpleQueue[bytes | object] = queue.SimpleQueue()
+        self._closed = False
+        self._remainder = b""
+        # 写入和读取的字节数分别只由一端修改，差值即缓冲中的数据量
+        self._fed = 0
+        self._read = 0
+
+    def feed(self, chunk: bytes | memoryview) -> None:
+        """写入一块 PCM 数据"""
+        if not chunk or self._closed:
+            return
+        if self._remainder:
+            chunk = self._remainder + chunk
+            self._remainder = b""
+        if self.format is not None:
+            tail = len(chunk) % self.format.frame_size
+            if tail:
+                self._remainder = bytes(chunk[-tail:])
+                chunk = chunk[:-tail]
+        if chunk:
+            self._fed += len(chunk)
+            self._queue.put(chunk)
+
+    def close(self) -> None:
+        """结束写入，重复调用无副作用"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(self._EOF)
+
+    @property
+    def buffered(self) -> int:
+        """已写入但尚未读取的字节数"""
+        return self._fed - self._read
+
+    def read_nowait(self) -> bytes | None:
+        """非阻塞读取一块数据：暂无数据时返回空字节串，流结束后返回 None"""
+        try:
+            chunk = self._queue.get_nowait()
+        except queue.Empty:
+            return b""
+        if chunk is self._EOF:
+            # 保留结束标记，重复读取仍返回 None
+            self._queue.put(self._EOF)
+            return None
+        self._read += len(chunk)  # type: ignore[arg-type]
+        return chunk  # type: ignore[return-value]
+
+    def __iter__(self) -> Iterator[bytes]:
+        """阻塞迭代所有数据块，直到流被关闭"""
+        while True:
+            chunk = self._queue.get()
+            if chunk is self._EOF:
+                return
+            self._read += len(chunk)  # type: ignore[arg-type]
+            yield chunk  # type: ignore[misc]
@@ -81,6 +81,11 @@ MINIMAX_MODELS = [
     "speech-01-turbo",
 ]
 
+# MiniMax 非流式合成的音频返回方式：hex 随响应返回，url 返回下载地址后单独下载
+MINIMAX_OUTPUT_HEX = "hex"
+MINIMAX_OUTPUT_URL = "url"
+MINIMAX_OUTPUT_FORMATS = [MINIMAX_OUTPUT_HEX, MINIMAX_OUTPUT_URL]
+
 # GPT-SoVITS 语言选项
 GPT_SOVITS_LANGUAGES = [
     "auto",
@@ -102,11 +107,43 @@ GPT_SOVITS_TEXT_SPLIT_METHODS = [
     "按标点符号切",
 ]
 
+# GPT-SoVITS 传输方式
+GPT_SOVITS_TRANSPORT_GRADIO = "gradio"
+GPT_SOVITS_TRANSPORT_API_V2 = "api_v2"
+GPT_SOVITS_TRANSPORTS = [GPT_SOVITS_TRANSPORT_GRADIO, GPT_SOVITS_TRANSPORT_API_V2]
+
+# WebUI 语言选项 -> api_v2 语言代码
+GPT_SOVITS_API_V2_LANGUAGES = {
+    "auto": "auto",
+    "Chinese": "zh",
+    "English": "en",
+    "Japanese": "ja",
+    "Korean": "ko",
+    "Cantonese": "yue",
+    "Multilingual Mixed": "auto",
+}
+
+# WebUI 切分方式 -> api_v2 切分方式
+GPT_SOVITS_API_V2_SPLIT_METHODS = {
+    "不切": "cut0",
+    "凑四句一切": "cut1",
+    "凑50字一切": "cut2",
+    "按中文句号。切": "cut3",
+    "按英文句号.切": "cut4",
+    "按标点符号切": "cut5",
+}
+
 MINIMAX_ERROR_VOICE_ID = "未获取到音色列表，请检查API 密钥，然后刷新"
 
 
 COOKIES_PATH = DATA_DIR / "cookies.json"
 
+# 播报音频内存缓存上限（字节）
+AUDIO_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# GPT-SoVITS WebUI 的接口映射与已加载权重缓存
+GRADIO_CACHE_PATH = DATA_DIR / "gradio_cache.json"
+
 GITHUB_URL = "https://github.com/MerlinCN/kinoko7danmaku"
 
 AUTHOR_BILIBILI_URL = "https://space.bilibili.com/103049147"
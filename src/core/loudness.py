@@ -0,0 +1,99 @@
+"""响度测量与归一化
+
+不同 TTS 后端、不同克隆音色的输出响度相差很大，切换后主播只能去 OBS 里反复调音量。
+每段合成音频测量一次响度，随音频一起缓存，播放时按目标响度换算增益，
+缓存命中的播报不需要再分析。
+
+响度按 ITU-R BS.1770 的门限方法近似计算（不含 K 计权滤波）：
+以 100ms 子块的均方能量组成 400ms、重叠 75% 的测量块，
+先去掉低于 -70 LUFS 的块，再去掉比剩余块平均响度低 10dB 以上的块，
+对剩下的块取平均。全部计算在 NumPy 中完成。
+"""
+
+import numpy as np
+
+from .audio import AudioFormat, Loudness
+from .resample import decode_pcm
+
+# 子块时长（秒）和每个测量块包含的子块数
+_SUB_BLOCK = 0.1
+_BLOCK_SUBS = 4
+_ABSOLUTE_GATE = -70.0
+_RELATIVE_GATE = -10.0
+# 归一化最多提升的增益（dB），避免把底噪放大
+MAX_GAIN_DB = 12.0
+# 归一化后允许的最大峰值
+PEAK_LIMIT = 0.98
+
+
+def _to_lufs(energy: np.ndarray | float) -> np.ndarray | float:
+    return -0.691 + 10 * np.log10(np.maximum(energy, 1e-12))
+
+
+class LoudnessMeter:
+    """分块测量一段音频的响度，一次合成使用一个实例"""
+
+    def __init__(self, audio_format: AudioFormat) -> None:
+        self.format = audio_format
+        self._sub_frames = max(1, round(audio_format.sample_rate * _SUB_BLOCK))
+        self._energies: list[np.ndarray] = []
+        # 不足一个子块的逐帧能量
+        self._partial = np.zeros(0, np.float32)
+        self._frames = 0
+        self.peak = 0.0
+
+    @property
+    def duration(self) -> float:
+        """已测量的时长（秒）"""
+        return self._frames / self.format.sample_rate
+
+    @property
+    def ready(self) -> bool:
+        """是否已够一个完整测量块，此前的结果只是粗略估计"""
+        return self.duration >= _SUB_BLOCK * _BLOCK_SUBS
+
+    def add(self, data: bytes | memoryview) -> None:
+        """加入一块 PCM 数据（按帧对齐）"""
+        fmt = self.format
+        samples = decode_pcm(data, fmt.sample_width, fmt.channels)
+        if not len(samples):
+            return
+        self._frames += len(samples)
+        self.peak = max(self.peak, float(np.abs(samples).max()))
+        power = np.concatenate([self._partial, np.square(samples).mean(axis=1)])
+        size = len(power) // self._sub_frames * self._sub_frames
+        if size:
+            self._energies.append(
+                power[:size].reshape(-1, self._sub_frames).mean(axis=1)
+            )
+        self._partial = power[size:]
+
+    def measure(self) -> Loudness | None:
+        """当前已测量部分的响度，全为静音时返回 None"""
+        energies = np.concatenate(self._energies) if self._energies else np.zeros(0)
+        if len(energies) >= _BLOCK_SUBS:
+            # 相邻 4 个子块的平均即为重叠 75% 的 400ms 测量块
+            total = np.concatenate([[0.0], np.cumsum(energies, dtype=np.float64)])
+            blocks = (total[_BLOCK_SUBS:] - total[:-_BLOCK_SUBS]) / _BLOCK_SUBS
+        elif self._frames:
+            # 不足一个测量块时整体作为一块
+            total = energies.sum() * self._sub_frames + self._partial.sum()
+            blocks = np.array([total / self._frames])
+        else:
+            return None
+        blocks = blocks[_to_lufs(blocks) > _ABSOLUTE_GATE]
+        if not len(blocks):
+            return None
+        threshold = _to_lufs(blocks.mean()) + _RELATIVE_GATE
+        blocks = blocks[_to_lufs(blocks) > threshold]
+        return Loudness(float(_to_lufs(blocks.mean())), self.peak)
+
+
+def normalization_gain(loudness: Loudness | None, target: float) -> float:
+    """把音频调整到目标响度（LUFS）所需的线性增益，同时保证峰值不削波"""
+    if loudness is None:
+        return 1.0
+    gain = 10 ** (min(target - loudness.lufs, MAX_GAIN_DB) / 20)
+    if loudness.peak > 0:
+        gain = min(gain, PEAK_LIMIT / loudness.peak)
+    return gain
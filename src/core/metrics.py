@@ -0,0 +1,67 @@
+"""运行时性能指标
+
+进程内的简单指标汇总，用于记录首包延迟、合成耗时等数据，便于日志排查和界面展示。
+可以在事件循环和播放线程中同时写入。
+"""
+
+import threading
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class MetricStat:
+    """单个指标的汇总值"""
+
+    count: int = 0
+    total: float = 0.0
+    last: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Metrics:
+    """指标注册表"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[str, MetricStat] = {}
+
+    def observe(self, name: str, value: float) -> None:
+        """记录一次观测值
+
+        Args:
+            name: 指标名称，如 ``tts.first_audio``
+            value: 观测值（时间类指标统一使用秒）
+        """
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                stat = self._stats[name] = MetricStat()
+            stat.count += 1
+            stat.total += value
+            stat.last = value
+            if value > stat.max:
+                stat.max = value
+
+    def get(self, name: str) -> MetricStat | None:
+        """获取指标汇总（副本）"""
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                return None
+            return MetricStat(stat.count, stat.total, stat.last, stat.max)
+
+    def snapshot(self) -> dict[str, MetricStat]:
+        """获取所有指标的副本"""
+        with self._lock:
+            return {
+                name: MetricStat(s.count, s.total, s.last, s.max)
+                for name, s in self._stats.items()
+            }
+
+
+# 全局指标实例
+metrics = Metrics()
@@ -0,0 +1,398 @@
+"""多声道混音器
+
+播报按用途分到不同声道，声道之间同时播放、在 NumPy 中按块混合：
+
+- ``ANNOUNCEMENT``：弹幕等普通播报
+- ``SFX``：礼物感谢等短播报，可以叠在其他播报上
+- ``PRIORITY``：醒目留言等重要播报，播放期间压低其余声道（ducking）。
+  仍在合成、还没有产出音频的优先播报不压低其余声道
+
+同一声道内的音频依次播放，相邻两段之间插入 ``clip_gap`` 秒静音。
+设置了 ``loudness_target`` 时，每段音频按其响度缩放到目标响度。
+混音器本身不接触设备，由播放器按输出格式逐块取出混音结果。
+
+音频可以附带 ``Announcement``：已取消的播报在轮到时丢弃，正在播放的在下一块停止，
+播完或丢弃后从 ``announcements`` 中注销。
+"""
+
+import threading
+from collections import deque
+from enum import StrEnum
+
+import numpy as np
+
+from .announcement import Announcement, announcements
+from .audio import AudioClip, AudioFormat, PcmStream
+from .loudness import normalization_gain
+from .metrics import metrics
+from .resample import PcmConverter, encode_pcm
+from .stretch import TimeStretcher
+
+
+class Channel(StrEnum):
+    """混音声道"""
+
+    ANNOUNCEMENT = "announcement"
+    SFX = "sfx"
+    PRIORITY = "priority"
+
+
+def _duration(audio: AudioClip | PcmStream) -> float:
+    """音频已到达部分的时长（秒），流式音频只计入已写入未读取的数据"""
+    if isinstance(audio, AudioClip):
+        return audio.duration
+    if audio.format is None:
+        return 0.0
+    return audio.buffered / audio.format.bytes_per_second
+
+
+class _Source:
+    """声道中正在播放的一段音频，按需转换为混音格式（并做时间伸缩）"""
+
+    # 完整音频每次转换的时长（秒），避免长音频一次性占用大量内存
+    _CLIP_BLOCK = 0.25
+
+    def __init__(
+        self,
+        audio: AudioClip | PcmStream,
+        target: AudioFormat,
+        rate: float = 1.0,
+        announcement: Announcement | None = None,
+    ) -> None:
+        self.audio = audio
+        self.target = target
+        self.rate = rate
+        self.announcement = announcement
+        self.finished = False
+        # 是否已经产出过数据（流式音频在首包到达前为 False）
+        self.started = False
+        self._converter: PcmConverter | None = None
+        self._stretcher: TimeStretcher | None = None
+        # 当前的响度归一化增益，流式音频的响度随数据到达而更新
+        self._gain: float | None = None
+        self._offset = 0
+        self._pending = np.zeros((0, target.channels), np.float32)
+
+    def _next_chunk(self) -> bytes | memoryview | None:
+        """取下一块原始 PCM：暂无数据返回空串，结束返回 None"""
+        audio = self.audio
+        if isinstance(audio, PcmStream):
+            return audio.read_nowait()
+        data = memoryview(audio.data).cast("B")
+        if self._offset >= len(data):
+            return None
+        frames = max(1, int(audio.sample_rate * self._CLIP_BLOCK))
+        block = frames * audio.format.frame_size
+        chunk = data[self._offset : self._offset + block]
+        self._offset += len(chunk)
+        return chunk
+
+    def read(self, frames: int) -> np.ndarray:
+        """读取最多 ``frames`` 帧；流式音频数据未到达时返回的帧数会少于请求"""
+        while len(self._pending) < frames and not self.finished:
+            chunk = self._next_chunk()
+            if chunk is None:
+                self.finished = True
+                if self._stretcher is not None:
+                    self._append(self._stretcher.flush())
+                break
+            if not chunk:
+                break
+            if self._converter is None:
+                source_format = self.audio.format
+                if source_format is None:
+                    raise RuntimeError("PCM 流缺少音频格式")
+                self._converter = PcmConverter(source_format, self.target)
+                if self.rate != 1:
+                    self._stretcher = TimeStretcher(
+                        self.rate, self.target.sample_rate, self.target.channels
+                    )
+            samples = self._converter.to_float(chunk)
+            if self._stretcher is not None:
+                samples = self._stretcher.process(samples)
+            self._append(samples)
+        out, self._pending = self._pending[:frames], self._pending[frames:]
+        if len(out):
+            self.started = True
+        return out
+
+    def apply_gain(self, block: np.ndarray, gain: float) -> np.ndarray:
+        """按归一化增益缩放一块音频，增益变化时在块内线性过渡"""
+        start = gain if self._gain is None else self._gain
+        self._gain = gain
+        if start != gain:
+            ramp = np.linspace(start, gain, len(block), dtype=np.float32)
+            return block * ramp[:, None]
+        return block if gain == 1 else block * np.float32(gain)
+
+    def _append(self, samples: np.ndarray) -> None:
+        self._pending = np.concatenate([self._pending, samples])
+
+    @property
+    def drained(self) -> bool:
+        return self.finished and not len(self._pending)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.announcement is not None and self.announcement.cancelled
+
+    @property
+    def remaining(self) -> float:
+        """剩余待播放的时长（秒），按伸缩后的时长计算"""
+        pending = len(self._pending) / self.target.sample_rate
+        audio = self.audio
+        if isinstance(audio, AudioClip):
+            unread = (audio.nbytes - self._offset) / audio.format.bytes_per_second
+        else:
+            unread = _duration(audio)
+        return pending + unread / self.rate
+
+    def retarget(self, target: AudioFormat) -> None:
+        """切换输出格式（换设备），已转换但未播放的部分转换到新格式后继续播放"""
+        if len(self._pending):
+            # 以 32-bit 整数作为中间格式，精度损失可以忽略
+            current = AudioFormat(self.target.sample_rate, self.target.channels, 4)
+            converter = PcmConverter(current, target)
+            self._pending = converter.to_float(encode_pcm(self._pending, 4))
+        else:
+            self._pending = np.zeros((0, target.channels), np.float32)
+        self.target = target
+        self._converter = None
+        self._stretcher = None
+
+
+# (音频, 时间伸缩倍率, 播报)
+_Entry = tuple[AudioClip | PcmStream, float, Announcement | None]
+
+
+def _release(announcement: Announcement | None) -> None:
+    if announcement is not None:
+        announcements.remove(announcement)
+
+
+class _ChannelState:
+    def __init__(self) -> None:
+        self.queue: deque[_Entry] = deque()
+        self.source: _Source | None = None
+        self.gain = 1.0
+        # 剩余的间隔静音帧数
+        self.gap_frames = 0
+        # 上一段结束时的混音帧位置，下一段开始时据此计算实际间隔
+        self.ended_at: int | None = None
+
+    @property
+    def busy(self) -> bool:
+        return self.source is not None or bool(self.queue)
+
+    @property
+    def playing(self) -> bool:
+        """是否正在出声：当前音频已产出数据，或处于两段之间的间隔静音
+
+        排队中、首包尚未到达的流式音频不算。
+        """
+        return (self.source is not None and self.source.started) or self.gap_frames > 0
+
+
+class Mixer:
+    """实时混音器
+
+    Attributes:
+        format: 混音输出格式（即输出设备格式）
+        clip_gap: 同一声道相邻两段之间的静音（秒）
+        loudness_target: 响度归一化的目标响度（LUFS），为 None 时不归一化
+        paused: 是否暂停，暂停期间不产出音频，各声道停在当前位置
+        duck_gain: 优先声道播放时其余声道的增益
+        duck_time: 增益从 1 变化到 ``duck_gain`` 所用的时间（秒）
+    """
+
+    duck_gain = 0.3
+    duck_time = 0.15
+
+    def __init__(self, audio_format: AudioFormat) -> None:
+        self.format = audio_format
+        self.clip_gap = 0.2
+        self.loudness_target: float | None = None
+        self.paused = False
+        self._lock = threading.Lock()
+        self._channels = {channel: _ChannelState() for channel in Channel}
+        # 已混音的总帧数
+        self._position = 0
+
+    def add(
+        self,
+        channel: Channel,
+        audio: AudioClip | PcmStream,
+        rate: float = 1.0,
+        announcement: Announcement | None = None,
+    ) -> None:
+        """把音频排到声道末尾（线程安全）
+
+        Args:
+            channel: 声道
+            audio: 完整音频或 PCM 流
+            rate: 播放速度倍率，不为 1 时做时间伸缩（音高不变）
+            announcement: 音频所属的播报，播完或丢弃后注销
+        """
+        with self._lock:
+            if announcement is not None:
+                announcement.queued = True
+            self._channels[channel].queue.append((audio, rate, announcement))
+
+    def clear(self) -> None:
+        """清空所有声道（线程安全），未结束的流式音频不再读取"""
+        with self._lock:
+            for state in self._channels.values():
+                for _, _, announcement in state.queue:
+                    _release(announcement)
+                if state.source is not None:
+                    _release(state.source.announcement)
+                state.queue.clear()
+                state.source = None
+                state.gap_frames = 0
+                state.ended_at = None
+
+    def skip(self, channel: Channel | None = None) -> list[Announcement]:
+        """停止声道（默认全部声道）正在播放的音频，队列中的下一段随后开始（线程安全）
+
+        Returns:
+            被停止的音频所属的播报，由调用方取消（停止仍在进行的合成）
+        """
+        channels = list(Channel) if channel is None else [channel]
+        skipped: list[Announcement] = []
+        with self._lock:
+            for state in (self._channels[name] for name in channels):
+                source = state.source
+                if source is None:
+                    continue
+                if source.announcement is not None:
+                    skipped.append(source.announcement)
+                self._end_source(state, 0)
+        return skipped
+
+    @property
+    def active(self) -> bool:
+        """是否有正在播放或等待播放的音频，暂停时为 False"""
+        with self._lock:
+            if self.paused:
+                return False
+            return any(state.busy for state in self._channels.values())
+
+    def pending_seconds(self, channel: Channel) -> float:
+        """声道中待播放音频的总时长（秒，线程安全）
+
+        流式音频只计入已到达的部分，因此是积压的下限。
+        """
+        with self._lock:
+            state = self._channels[channel]
+            total = state.gap_frames / self.format.sample_rate
+            if state.source is not None and not state.source.cancelled:
+                total += state.source.remaining
+            for audio, rate, announcement in state.queue:
+                if announcement is None or not announcement.cancelled:
+                    total += _duration(audio) / rate
+            return total
+
+    def set_format(self, audio_format: AudioFormat) -> None:
+        """切换输出格式（设备变化时），正在播放的音频从当前位置按新格式继续"""
+        with self._lock:
+            if audio_format == self.format:
+                return
+            self.format = audio_format
+            for state in self._channels.values():
+                if state.source is not None:
+                    state.source.retarget(audio_format)
+
+    def mix(self, frames: int) -> np.ndarray:
+        """混合下一块音频，返回 (frames, 声道数) 的 float32 数组"""
+        out = np.zeros((frames, self.format.channels), np.float32)
+        with self._lock:
+            if self.paused:
+                return out
+            blocks = {
+                channel: self._render(state, frames)
+                for channel, state in self._channels.items()
+            }
+            priority = self._channels[Channel.PRIORITY].playing
+            for channel, state in self._channels.items():
+                target = (
+                    self.duck_gain
+                    if priority and channel is not Channel.PRIORITY
+                    else 1.0
+                )
+                block = blocks[channel]
+                gain = self._ramp_gain(state, target, frames)
+                if block is not None:
+                    out[: len(block)] += block * gain[: len(block), None]
+            self._position += frames
+        return out
+
+    def _ramp_gain(
+        self, state: _ChannelState, target: float, frames: int
+    ) -> np.ndarray:
+        """增益向目标值线性过渡，避免压低和恢复时出现突变"""
+        start = state.gain
+        ramp_frames = self.duck_time * self.format.sample_rate
+        max_step = (1 - self.duck_gain) * frames / ramp_frames
+        end = start + max(-max_step, min(max_step, target - start))
+        state.gain = end
+        if start == end:
+            return np.full(frames, end, np.float32)
+        return np.linspace(start, end, frames, dtype=np.float32)
+
+    def _render(self, state: _ChannelState, frames: int) -> np.ndarray | None:
+        """产出一个声道的下一块音频，依次播放队列中的音频并插入间隔静音"""
+        parts: list[np.ndarray] = []
+        filled = 0
+        while filled < frames:
+            if state.gap_frames:
+                silence = min(state.gap_frames, frames - filled)
+                parts.append(np.zeros((silence, self.format.channels), np.float32))
+                state.gap_frames -= silence
+                filled += silence
+                continue
+            if state.source is None:
+                if not state.queue:
+                    break
+                audio, rate, announcement = state.queue.popleft()
+                if announcement is not None and announcement.cancelled:
+                    _release(announcement)
+                    continue
+                state.source = _Source(audio, self.format, rate, announcement)
+            source = state.source
+            if source.cancelled:
+                self._end_source(state, filled)
+                continue
+            was_started = source.started
+            block = source.read(frames - filled)
+            if len(block):
+                if self.loudness_target is not None:
+                    gain = normalization_gain(
+                        source.audio.loudness, self.loudness_target
+                    )
+                    block = source.apply_gain(block, gain)
+                if not was_started and state.ended_at is not None:
+                    # 实际间隔 = 插入的静音 + 等待首包的时间
+                    gap = self._position + filled - state.ended_at
+                    metrics.observe("player.gap", gap / self.format.sample_rate)
+                    state.ended_at = None
+                parts.append(block)
+                filled += len(block)
+            if source.drained:
+                self._end_source(state, filled)
+                continue
+            if not len(block):
+                # 流式音频暂无数据，本块剩余部分留空
+                break
+        if not parts:
+            return None
+        return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+    def _end_source(self, state: _ChannelState, filled: int) -> None:
+        """当前音频播完（或被停止），队列中还有音频时插入间隔静音"""
+        _release(state.source.announcement)
+        state.source = None
+        if state.queue:
+            state.gap_frames = round(self.clip_gap * self.format.sample_rate)
+            state.ended_at = self._position + filled
+        else:
+            state.ended_at = None
@@ -1,52 +1,235 @@
 import asyncio
-import io
-import wave
+import threading
+import time
+from dataclasses import dataclass
+from time import perf_counter
 
-import pyaudio
 import sounddevice as sd
 from loguru import logger
 
 from models.device import OutputDevice
 
+from .announcement import Announcement, announcements
+from .audio import AudioClip, AudioFormat, PcmStream
+from .metrics import metrics
+from .mixer import Channel, Mixer
+from .resample import encode_pcm
+from .ring_buffer import RingBuffer
+
+# 采样位宽 -> sounddevice 数据类型
+_DTYPES = {1: "uint8", 2: "int16", 3: "int24", 4: "int32"}
+
+# 设备索引为该值时跟随系统默认输出设备，打开输出流时才解析为实际设备
+DEFAULT_OUTPUT_DEVICE = -1
+
+
+@dataclass(frozen=True, slots=True)
+class _DeviceList:
+    """一次设备枚举的结果，整体替换，读取时不需要加锁"""
+
+    # PortAudio 的全部设备信息，按设备索引排列
+    infos: list[dict]
+    # 可选的输出设备
+    outputs: list[OutputDevice]
+    indices: frozenset[int]
+
 
 class StreamPlayer:
+    """音频播放器
+
+    各声道的音频交给 ``Mixer`` 混音，由一个后台线程按块写入环形缓冲区，
+    常驻的输出流在音频回调中从缓冲区取数据。
+
+    所选设备断开（如拔出 USB 耳机）时临时改用系统默认设备，空闲时定期检查，
+    设备接回后自动切回。切换期间混音器的状态不变：正在播放的音频从中断处继续，
+    排队的音频保持不变。
+
+    所有 sounddevice 调用都在 ``_device_lock`` 下进行：重新扫描设备会重新初始化 PortAudio，
+    不能与其他线程（界面线程、混音线程）的 PortAudio 调用并发。音频回调不调用 sounddevice。
+
+    Attributes:
+        underruns: 播放中缓冲区被取空的次数（混音线程没跟上）
+        underrun_frames: 因此补入的静音帧数
+        device_underflows: 音频驱动报告的输出欠载次数
+    """
+
+    # 混音块时长（秒），也是音频回调的块大小
+    block_duration = 0.02
+    # 环形缓冲区时长（秒），决定混音延迟的上限和能吸收的调度抖动
+    buffer_duration = 0.1
+    # 无法查询设备格式时使用的输出格式
+    fallback_format = AudioFormat(48000, 2, 2)
+    # 输出流运行中超过该时长（秒）没有回调，视为设备已断开
+    stall_timeout = 1.0
+    # 自动重新扫描设备的最短间隔（秒），如临时使用默认设备期间检查原设备是否接回
+    reattach_interval = 5.0
+    # 设备一直没有恢复时，自动重新扫描的间隔逐次翻倍，最长不超过该值（秒）
+    max_rescan_interval = 60.0
+    # 设备持续不可用时重试的最长间隔（秒）
+    max_retry_delay = 5.0
+
     def __init__(self):
-        self.p = pyaudio.PyAudio()
-        self.device_index = sd.default.device[1]
-        self.audio_queue: asyncio.Queue[bytes] | None = None
-        self.worker_task: asyncio.Task | None = None
+        # 所选设备的索引，为 DEFAULT_OUTPUT_DEVICE 时跟随系统默认设备
+        self.device_index = DEFAULT_OUTPUT_DEVICE
+        self.mixer = Mixer(self.fallback_format)
         self.is_running = False
+        self._thread: threading.Thread | None = None
+        # 有新音频入队或需要退出时唤醒混音线程
+        self._wake = threading.Event()
+        # 常驻输出流，key 为 (设备, 格式)
+        self._stream: sd.RawOutputStream | None = None
+        self._stream_key: tuple[int, AudioFormat] | None = None
+        # 混音线程写入、音频回调读取，输出格式变化时才重建，
+        # 重新打开同一格式的输出流时保留其中待播的数据
+        self._ring = RingBuffer(0)
+        self._ring_format: AudioFormat | None = None
+        self._silence = memoryview(b"")
+        self._frame_size = 1
+        # 混音器中有音频时为 True，此时缓冲区被取空才算欠载
+        self._playing = False
+        self.underruns = 0
+        self.underrun_frames = 0
+        self.device_underflows = 0
+        self._reported_underrun_frames = 0
+        # 设备索引 -> 设备原生格式
+        self._device_formats: dict[int, AudioFormat | None] = {}
+        # 设备列表缓存，只在 refresh_devices 时重新枚举
+        self._devices: _DeviceList | None = None
+        # 用户选择的设备名称，为 None 时跟随系统默认设备
+        self._device_name: str | None = None
+        # 所选设备断开，临时使用默认设备
+        self._fallback = False
+        # 自动重新扫描的退避：下次允许扫描的时间（time.monotonic）和当前间隔
+        self._next_rescan = 0.0
+        self._rescan_interval = self.reattach_interval
+        # 最近一次音频回调的时间，用于发现设备无响应
+        self._last_callback = 0.0
+        # 保护设备枚举、重新扫描和输出流的打开关闭
+        self._device_lock = threading.RLock()
 
     @property
     def default_output_index(self) -> int:
-        return sd.default.device[1]
+        """系统默认输出设备的索引（PortAudio 重新初始化后才反映系统设置的变化）"""
+        with self._device_lock:
+            return sd.default.device[1]
 
-    def get_output_devices(self) -> list[OutputDevice]:
-        """获取设备选择列表（使用sounddevice）- 返回元组列表格式"""
+    def _device_list(self) -> _DeviceList:
+        """设备列表缓存，首次使用时枚举"""
+        devices = self._devices
+        if devices is None:
+            with self._device_lock:
+                if self._devices is None:
+                    self._devices = self._enumerate_devices()
+                devices = self._devices
+        return devices
 
-        # 获取所有设备
-        all_devices: list[dict] = sd.query_devices()  # type: ignore
+    def _enumerate_devices(self) -> _DeviceList:
+        """枚举所有设备，只保留与默认输出设备同一主机 API 的输出设备"""
+        infos: list[dict] = list(sd.query_devices())  # type: ignore
         # 如果没有输出设备就报错
-        if len(all_devices) == 0:
+        if not infos:
             raise RuntimeError("没有找到输出设备")
-        default_output_index: int = sd.default.device[1]  # type: ignore
+        hostapis = [api["name"] for api in sd.query_hostapis()]  # type: ignore
+        default_api = hostapis[infos[self.default_output_index]["hostapi"]]
+        outputs = [
+            OutputDevice(index=idx, name=info["name"])
+            for idx, info in enumerate(infos)
+            if info["max_output_channels"] > 0
+            and default_api in hostapis[info["hostapi"]]
+        ]
+        return _DeviceList(
+            infos=infos,
+            outputs=outputs,
+            indices=frozenset(device.index for device in outputs),
+        )
 
-        default_output_device: dict = all_devices[default_output_index]  # type: ignore
+    def refresh_devices(self) -> list[OutputDevice]:
+        """重新扫描设备（设备插拔后调用）
 
-        choices = []
+        PortAudio 只在初始化时扫描设备，需要重新初始化才能看到变化，因此会先关闭输出流，
+        下一块音频时再按新的设备列表打开。重新扫描后设备索引可能变化，
+        当前设备按名称重新定位。
+        """
+        with self._device_lock:
+            self._close_stream()
+            previous = self._devices
+            self._reinitialize_portaudio()
+            self._devices = None
+            self._device_formats.clear()
+            devices = self._device_list()
+            if previous is None or previous.outputs != devices.outputs:
+                logger.info(f"已重新扫描音频设备，共 {len(devices.outputs)} 个输出设备")
+            else:
+                logger.debug("已重新扫描音频设备，设备列表没有变化")
+            self._relocate_device(devices)
+        return list(devices.outputs)
 
-        default_api: str = sd.query_hostapis()[default_output_device["hostapi"]]["name"]  # type: ignore
-        # 遍历所有设备，只添加纯输出设备
-        for idx, device in enumerate(all_devices):
-            if device["max_output_channels"] <= 0:
-                continue
-            name = device["name"]
-            api_name: str = sd.query_hostapis()[device["hostapi"]]["name"]  # type: ignore
-            if default_api not in api_name:
-                continue
-            choices.append(OutputDevice(index=idx, name=name))  # (显示名称, 实际索引)
+    @staticmethod
+    def _reinitialize_portaudio():
+        """重新初始化 PortAudio，使其重新扫描设备
 
-        return choices
+        sounddevice 没有公开的重新扫描接口，这里使用其私有函数
+        ``_terminate``/``_initialize``（sounddevice 0.5.x，见 pyproject 中的版本要求）。
+        以后的版本若去掉了这两个函数，只重新枚举设备，插拔后的变化要重启程序才能看到。
+        调用前必须关闭所有输出流，且不能与其他 PortAudio 调用并发（由 ``_device_lock`` 保证）。
+        """
+        terminate = getattr(sd, "_terminate", None)
+        initialize = getattr(sd, "_initialize", None)
+        if terminate is None or initialize is None:
+            logger.warning(
+                "当前 sounddevice 版本不支持重新初始化 PortAudio，设备列表可能不是最新"
+            )
+            return
+        terminate()
+        initialize()
+
+    def _relocate_device(self, devices: _DeviceList):
+        """重新扫描后按名称找回所选设备，找不到时临时使用默认设备"""
+        name = self._device_name
+        if name is None:
+            return
+        for device in devices.outputs:
+            if device.name == name:
+                self.device_index = device.index
+                if self._fallback:
+                    self._fallback = False
+                    self._reset_rescan_backoff()
+                    logger.info(f"输出设备已接回，切回: {name}")
+                return
+        if not self._fallback:
+            self._fallback = True
+            logger.warning(f"输出设备已断开: {name}，临时使用默认设备")
+
+    @property
+    def selected_device_available(self) -> bool:
+        """用户选择了具体设备且该设备当前可用（``device_index`` 为其最新索引）"""
+        return self._device_name is not None and not self._fallback
+
+    @property
+    def active_device_index(self) -> int:
+        """实际输出的设备：跟随系统默认设备或所选设备断开时为系统默认设备"""
+        if self._fallback or self.device_index == DEFAULT_OUTPUT_DEVICE:
+            return self.default_output_index
+        return self.device_index
+
+    def _device_info(self, device_index: int) -> dict:
+        """从缓存中取设备信息
+
+        Raises:
+            IndexError: 设备不存在
+        """
+        infos = self._device_list().infos
+        if not 0 <= device_index < len(infos):
+            raise IndexError(f"设备 {device_index} 不存在")
+        return infos[device_index]
+
+    def get_output_devices(self) -> list[OutputDevice]:
+        """获取可选的输出设备（缓存，设备变化后需 ``refresh_devices``）"""
+        return list(self._device_list().outputs)
+
+    def has_output_device(self, device_index: int) -> bool:
+        """设备索引是否为可选的输出设备（O(1)，不查询 PortAudio）"""
+        return device_index in self._device_list().indices
 
     def set_output_device_by_name(self, device_name: str):
         """根据设备名称设置输出设备"""
@@ -57,14 +240,22 @@ class StreamPlayer:
         logger.error(f"未找到设备: {device_name}")
 
     def set_output_device(self, device_index: int):
-        """设置输出设备"""
+        """设置输出设备，``DEFAULT_OUTPUT_DEVICE`` 表示跟随系统默认设备"""
+        if device_index == DEFAULT_OUTPUT_DEVICE:
+            logger.info("已设置输出设备: 系统默认设备")
+            self.device_index = DEFAULT_OUTPUT_DEVICE
+            self._device_name = None
+            self._fallback = False
+            self._reset_rescan_backoff()
+            return True
         try:
-            if device_index == -1:
-                device_index = sd.default.device[1]  # type: ignore
-            device_info: dict = sd.query_devices(device_index)  # type: ignore
-            if int(device_info["max_output_channels"]) > 0:  # type: ignore
+            device_info = self._device_info(device_index)
+            if int(device_info["max_output_channels"]) > 0:
                 logger.info(f"已设置输出设备: {device_info['name']}")
                 self.device_index = device_index
+                self._device_name = device_info["name"]
+                self._fallback = False
+                self._reset_rescan_backoff()
                 return True
             else:
                 logger.error(f"设备 {device_index} 不支持音频输出")
@@ -73,103 +264,370 @@ class StreamPlayer:
             logger.exception(f"设置设备失败: {e}")
             return False
 
-    def play_bytes(self, audio_bytes: bytes):
-        """播放音频字节流（WAV 格式）
+    @property
+    def output_format(self) -> AudioFormat:
+        """当前输出设备的原生格式，查询失败时使用 ``fallback_format``"""
+        device_index = self.active_device_index
+        if device_index not in self._device_formats:
+            self._device_formats[device_index] = self._query_device_format(device_index)
+        return self._device_formats[device_index] or self.fallback_format
 
-        Args:
-            audio_bytes: WAV 格式的音频字节流
+    def _query_device_format(self, device_index: int) -> AudioFormat | None:
+        """查询设备原生格式：默认采样率、最多双声道、16-bit"""
+        try:
+            info = self._device_info(device_index)
+        except Exception as e:
+            logger.warning(f"查询设备 {device_index} 的格式失败: {e}")
+            return None
+        channels = min(2, int(info["max_output_channels"]))
+        if channels <= 0:
+            return None
+        return AudioFormat(int(info["default_samplerate"]), channels, 2)
+
+    def set_clip_gap(self, gap_ms: float):
+        """设置同一声道连续播报之间插入的静音时长（毫秒）"""
+        self.mixer.clip_gap = max(0.0, float(gap_ms)) / 1000
+
+    def set_loudness_target(self, target: float | None):
+        """设置响度归一化的目标响度（LUFS），为 None 时关闭归一化"""
+        self.mixer.loudness_target = None if target is None else float(target)
+
+    def _frames(self, audio_format: AudioFormat, duration: float) -> int:
+        return max(1, round(audio_format.sample_rate * duration))
+
+    def _open_stream(self, audio_format: AudioFormat) -> sd.RawOutputStream:
+        """获取输出流
+
+        每个 (设备, 格式) 只打开一次，设备变化时才重新打开。
+        环形缓冲区只在格式变化时重建，同一格式重新打开（如设备断开后恢复）时
+        其中待播的数据继续播放，正在播放的音频从中断处接上。
+        """
+        with self._device_lock:
+            return self._open_stream_locked(audio_format)
+
+    def _open_stream_locked(self, audio_format: AudioFormat) -> sd.RawOutputStream:
+        key = (self.active_device_index, audio_format)
+        if self._stream is not None and self._stream_key == key:
+            return self._stream
+        self._close_stream()
+        block_frames = self._frames(audio_format, self.block_duration)
+        if self._ring_format != audio_format:
+            buffer_frames = self._frames(audio_format, self.buffer_duration)
+            self._frame_size = audio_format.frame_size
+            self._ring = RingBuffer(buffer_frames * self._frame_size)
+            self._ring_format = audio_format
+            self._silence = memoryview(bytes(buffer_frames * self._frame_size))
+        start = perf_counter()
+        self._stream = sd.RawOutputStream(
+            samplerate=audio_format.sample_rate,
+            blocksize=block_frames,
+            device=key[0],
+            channels=audio_format.channels,
+            dtype=_DTYPES[audio_format.sample_width],
+            callback=self._callback,
+        )
+        self._stream_key = key
+        metrics.observe("player.open", perf_counter() - start)
+        return self._stream
+
+    def _close_stream(self):
+        """关闭输出流（设备变化、出错、退出时调用）"""
+        with self._device_lock:
+            stream, self._stream = self._stream, None
+            self._stream_key = None
+            if stream is None:
+                return
+            try:
+                stream.close(ignore_errors=True)
+            except Exception as e:
+                logger.warning(f"关闭输出流失败: {e}")
+
+    def _callback(self, outdata, frames: int, time_info, status: sd.CallbackFlags):
+        """音频回调（运行在音频驱动线程）：从环形缓冲区取数据，不足部分补静音
+
+        回调里不加锁、不分配大块内存，只做 memoryview 拷贝。
         """
-        # 使用 wave 模块解析 WAV 文件
-        with wave.open(io.BytesIO(audio_bytes), "rb") as wf:
-            # 获取音频参数
-            channels = wf.getnchannels()
-            sample_width = wf.getsampwidth()
-            frame_rate = wf.getframerate()
-
-            # 读取所有音频数据
-            raw_data = wf.readframes(wf.getnframes())
-
-        # 使用 pyaudio 播放音频
-        stream = None
+        self._last_callback = time.monotonic()
+        if status.output_underflow:
+            self.device_underflows += 1
+        out = memoryview(outdata).cast("B")
+        size = self._ring.read_into(out)
+        missing = len(out) - size
+        if missing:
+            out[size:] = self._silence[:missing]
+            if self._playing:
+                self.underruns += 1
+                self.underrun_frames += missing // self._frame_size
+
+    def _idle(self):
+        """没有音频可播：等缓冲播完后停止输出流，保留设备句柄供下一段使用"""
+        while self._ring.available and self._stream is not None:
+            if self.mixer.active or not self.is_running:
+                return
+            time.sleep(self.block_duration)
+        with self._device_lock:
+            stream = self._stream
+            if stream is None:
+                return
+            try:
+                if stream.active:
+                    stream.stop()
+            except Exception as e:
+                logger.warning(f"停止输出流失败: {e}")
+                self._close_stream()
+
+    def _check_stream(self, stream: sd.RawOutputStream):
+        """检查输出流是否仍在正常运行
+
+        Raises:
+            RuntimeError: 输出流没有被停止却不再运行，或长时间没有回调（设备已断开）
+        """
+        if stream.stopped:
+            return
+        if not stream.active:
+            raise RuntimeError("输出流意外停止")
+        if time.monotonic() - self._last_callback > self.stall_timeout:
+            raise RuntimeError("输出设备无响应")
+
+    def _fill(self, stream: sd.RawOutputStream, audio_format: AudioFormat):
+        """把环形缓冲区填满（最多 ``buffer_duration`` 秒），需要时启动输出流
+
+        输出流可能已被其他线程（如重新扫描设备）关闭，此时直接返回，
+        下一轮按新的设备列表重新打开。
+        """
+        with self._device_lock:
+            if stream is not self._stream:
+                return
+            self._check_stream(stream)
+        block_frames = self._frames(audio_format, self.block_duration)
+        block_bytes = block_frames * audio_format.frame_size
+        while self._ring.free >= block_bytes and self.mixer.active:
+            block = self.mixer.mix(block_frames)
+            self._ring.write(encode_pcm(block, audio_format.sample_width))
+        with self._device_lock:
+            if stream is self._stream and stream.stopped:
+                self._last_callback = time.monotonic()
+                stream.start()
+
+    def _report_underruns(self, audio_format: AudioFormat):
+        """把新增的欠载（缓冲区被取空时补入的静音时长）记入性能指标"""
+        frames = self.underrun_frames - self._reported_underrun_frames
+        if frames:
+            self._reported_underrun_frames += frames
+            metrics.observe("player.underrun", frames / audio_format.sample_rate)
+
+    def _rescan(self):
+        """自动重新扫描设备
+
+        重新初始化 PortAudio 代价不小，设备一直没有恢复时扫描间隔从 ``reattach_interval``
+        逐次翻倍到 ``max_rescan_interval``，未到时间的调用直接返回。
+        设备恢复（接回原设备、重新选择设备或输出恢复正常）后间隔重置。
+        """
+        if time.monotonic() < self._next_rescan:
+            return
+        fallback = self._fallback
         try:
-            stream = self.p.open(
-                format=self.p.get_format_from_width(sample_width),
-                channels=channels,
-                rate=frame_rate,
-                output=True,
-                output_device_index=self.device_index,
-            )
-            # 分块写入音频数据
-            chunk = 4096
-            for i in range(0, len(raw_data), chunk):
-                stream.write(raw_data[i : i + chunk])
-            stream.stop_stream()
-        finally:
-            if stream:
-                stream.close()
-
-    async def _play_worker(self):
-        """后台任务：从队列中取出音频并播放"""
-        if self.audio_queue is None:
-            logger.error("音频队列未初始化")
+            self.refresh_devices()
+        except Exception as e:
+            logger.warning(f"重新扫描音频设备失败: {e}")
+        if fallback and not self._fallback:
+            # 原设备已接回，退避已在 _relocate_device 中重置
             return
+        self._next_rescan = time.monotonic() + self._rescan_interval
+        self._rescan_interval = min(self._rescan_interval * 2, self.max_rescan_interval)
 
+    def _reset_rescan_backoff(self):
+        self._next_rescan = 0.0
+        self._rescan_interval = self.reattach_interval
+
+    def _rescan_timeout(self) -> float | None:
+        """空闲时等待的最长时间：临时使用默认设备期间到下次自动扫描为止"""
+        if not self._fallback:
+            return None
+        return max(self._next_rescan - time.monotonic(), 0.0)
+
+    def _mix_loop(self):
+        """混音线程：保持环形缓冲区有 ``buffer_duration`` 秒的待播数据
+
+        输出流在音频回调中自行从缓冲区取数据，混音线程只负责补充，
+        偶尔的调度延迟被缓冲区吸收，不会阻塞或打断播放。
+        输出出错时重新扫描设备后重试，待播音频一直保留。
+        """
+        failures = 0
         while self.is_running:
+            if not self.mixer.active:
+                self._playing = False
+                self._idle()
+                if not self._wake.wait(self._rescan_timeout()):
+                    # 临时使用默认设备期间，空闲时检查原设备是否已接回
+                    self._rescan()
+                self._wake.clear()
+                continue
+            self._playing = True
+            audio_format = self.output_format
+            self.mixer.set_format(audio_format)
             try:
-                # 从队列中获取音频数据
-                audio_bytes = await self.audio_queue.get()
-                # 在线程中播放音频（避免阻塞）
-                await asyncio.to_thread(self.play_bytes, audio_bytes)
-                self.audio_queue.task_done()
-            except asyncio.CancelledError:
-                logger.info("音频播放队列任务已取消")
-                break
+                stream = self._open_stream(audio_format)
+                self._fill(stream, audio_format)
+                self._report_underruns(audio_format)
+                if failures and not self._fallback:
+                    self._reset_rescan_backoff()
+                failures = 0
             except Exception as e:
-                logger.exception(f"播放音频时出错: {e}")
+                if failures:
+                    logger.warning(f"输出设备仍不可用: {e}")
+                else:
+                    logger.exception(f"播放音频时出错: {e}")
+                self._close_stream()
+                failures += 1
+                # 多半是设备被拔出或系统默认设备变了：重新扫描（按退避间隔），
+                # 所选设备不在时改用默认设备。混音器不清空，恢复后正在播放的音频从中断处继续
+                self._rescan()
+                time.sleep(min(0.5 * failures, self.max_retry_delay))
+                continue
+            time.sleep(self.block_duration / 2)
 
     def start_worker(self):
-        """启动音频播放队列处理任务"""
+        """启动混音播放线程"""
         if not self.is_running:
-            # 在事件循环运行时创建队列，避免在 __init__ 中创建导致 RuntimeError
-            self.audio_queue = asyncio.Queue()
             self.is_running = True
-            self.worker_task = asyncio.create_task(self._play_worker())
-            logger.info("音频播放队列已启动")
+            self._wake.clear()
+            self._thread = threading.Thread(
+                target=self._mix_loop, name="audio-mixer", daemon=True
+            )
+            self._thread.start()
+            logger.info("音频播放线程已启动")
 
     async def stop_worker(self):
-        """停止音频播放队列处理任务"""
+        """停止混音播放线程并清空待播音频"""
         if self.is_running:
             self.is_running = False
-            if self.worker_task:
-                self.worker_task.cancel()
-                try:
-                    await self.worker_task
-                except asyncio.CancelledError:
-                    pass
-            # 清空队列
-            if self.audio_queue is not None:
-                while not self.audio_queue.empty():
-                    try:
-                        self.audio_queue.get_nowait()
-                        self.audio_queue.task_done()
-                    except asyncio.QueueEmpty:
-                        break
-                self.audio_queue = None
-            logger.info("音频播放队列已停止")
-
-    async def play_bytes_async(self, audio_bytes: bytes):
-        """异步方式播放音频（添加到队列）
+            self._wake.set()
+            if self._thread is not None:
+                await asyncio.to_thread(self._thread.join)
+                self._thread = None
+            self.mixer.clear()
+            self._close_stream()
+            # 丢弃缓冲区中未播完的数据，下次启动时不再播放
+            self._ring = RingBuffer(0)
+            self._ring_format = None
+            logger.info("音频播放线程已停止")
+
+    def pending_seconds(self, channel: Channel = Channel.ANNOUNCEMENT) -> float:
+        """声道中待播放音频的总时长（秒）"""
+        return self.mixer.pending_seconds(channel)
+
+    # ------------------------------------------------------------------
+    # 播放控制（在事件循环线程调用）
+    # ------------------------------------------------------------------
+
+    def skip(self, channel: Channel | None = None) -> int:
+        """跳过声道（默认全部声道）正在播放的播报，返回跳过的条数"""
+        skipped = self.mixer.skip(channel)
+        for announcement in skipped:
+            announcement.cancel()
+        if skipped:
+            logger.info(f"已跳过 {len(skipped)} 条正在播放的播报")
+        return len(skipped)
+
+    def cancel(self, announcement_id: int) -> bool:
+        """按编号取消播报（正在合成、排队或正在播放），返回是否找到"""
+        return announcements.cancel(announcement_id)
+
+    def flush(self, event: str | None = None) -> int:
+        """清空某类事件（默认全部）的播报，返回取消的条数"""
+        return announcements.flush(event)
+
+    def purge_user(self, user_mid: int) -> int:
+        """清除某个用户的全部播报，返回取消的条数"""
+        return announcements.purge_user(user_mid)
+
+    @property
+    def paused(self) -> bool:
+        return self.mixer.paused
+
+    def pause(self):
+        """暂停播放，各声道停在当前位置，新的播报照常排队"""
+        if not self.mixer.paused:
+            self.mixer.paused = True
+            logger.info("播放已暂停")
+
+    def resume(self):
+        """从暂停的位置继续播放"""
+        if self.mixer.paused:
+            self.mixer.paused = False
+            self._wake.set()
+            logger.info("播放已继续")
+
+    def _enqueue(
+        self,
+        channel: Channel,
+        audio: AudioClip | PcmStream,
+        rate: float = 1.0,
+        announcement: Announcement | None = None,
+    ) -> bool:
+        if not self.is_running:
+            logger.error("音频播放线程未启动，请先调用 start_worker()")
+            return False
+        self.mixer.add(channel, audio, rate, announcement)
+        self._wake.set()
+        return True
+
+    async def play_bytes_async(
+        self, audio_bytes: bytes, channel: Channel = Channel.ANNOUNCEMENT
+    ):
+        """异步方式播放音频（添加到声道队列）
 
         Args:
             audio_bytes: WAV 格式的音频字节流
+            channel: 播放声道
         """
-        if self.audio_queue is None:
-            logger.error("音频队列未初始化，请先调用 start_worker()")
+        try:
+            clip = AudioClip.from_wav(audio_bytes)
+        except ValueError as e:
+            logger.error(f"无法播放音频: {e}")
             return
-        await self.audio_queue.put(audio_bytes)
+        self._enqueue(channel, clip)
+
+    async def play_clip_async(
+        self,
+        clip: AudioClip,
+        channel: Channel = Channel.ANNOUNCEMENT,
+        rate: float = 1.0,
+        announcement: Announcement | None = None,
+    ):
+        """异步方式播放 PCM 音频（添加到声道队列）
+
+        Args:
+            clip: 要播放的音频
+            channel: 播放声道
+            rate: 播放速度倍率，不为 1 时做时间伸缩（音高不变）
+            announcement: 音频所属的播报，用于跳过、清空和按用户清除
+        """
+        self._enqueue(channel, clip, rate, announcement)
+
+    async def play_stream_async(
+        self,
+        pcm_stream: PcmStream,
+        channel: Channel = Channel.ANNOUNCEMENT,
+        rate: float = 1.0,
+        announcement: Announcement | None = None,
+    ):
+        """异步方式播放 PCM 流（添加到声道队列）
+
+        流入队后即可继续写入数据，轮到它播放时从已到达的部分开始播放。
+
+        Args:
+            pcm_stream: 分块到达的 PCM 音频流
+            channel: 播放声道
+            rate: 播放速度倍率，不为 1 时做时间伸缩（音高不变）
+            announcement: 音频所属的播报，用于跳过、清空和按用户清除
+        """
+        if not self._enqueue(channel, pcm_stream, rate, announcement):
+            pcm_stream.close()
 
     def close(self):
-        self.p.terminate()
+        self._close_stream()
 
 
 # ============================================================================
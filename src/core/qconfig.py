@@ -24,11 +24,15 @@ from .const import (
     DATA_DIR,
     GPT_SOVITS_LANGUAGES,
     GPT_SOVITS_TEXT_SPLIT_METHODS,
+    GPT_SOVITS_TRANSPORT_GRADIO,
+    GPT_SOVITS_TRANSPORTS,
     MINIMAX_ERROR_VOICE_ID,
     MINIMAX_MODELS,
+    MINIMAX_OUTPUT_FORMATS,
+    MINIMAX_OUTPUT_HEX,
     SUPPORTED_SERVICES,
 )
-from .player import audio_player
+from .player import DEFAULT_OUTPUT_DEVICE, audio_player
 
 
 class ConfigGroup(StrEnum):
@@ -41,6 +45,24 @@ class ConfigGroup(StrEnum):
     GPT_SOVITS_SERVICE = "GptSovitsService"
     PIPER_SERVICE = "PiperService"
     PLAYER = "Player"
+    TEXT_NORMALIZER = "TextNormalizer"
+
+
+# 参与语音合成的配置分组：其中任一配置变化都会使已合成的音频失效
+TTS_CONFIG_GROUPS = (
+    ConfigGroup.TTS_SERVICE,
+    ConfigGroup.MINIMAX_SERVICE,
+    ConfigGroup.FISH_SPEECH_SERVICE,
+    ConfigGroup.GPT_SOVITS_SERVICE,
+    ConfigGroup.PIPER_SERVICE,
+)
+
+
+class EmoticonMode(StrEnum):
+    """表情代码处理方式"""
+
+    STRIP = "strip"  # 直接去除
+    NAME = "name"  # 只读出表情名称
 
 
 class ConfigKey(StrEnum):
@@ -64,9 +86,12 @@ class ConfigKey(StrEnum):
     GIFT_MERGE_WINDOW = "GiftMergeWindow"
     GIFT_MERGE_WINDOW_INITIAL = "GiftMergeWindowInitial"
     GIFT_MERGE_WINDOW_INCREMENT = "GiftMergeWindowIncrement"
+    BLOCK_DENY_SECONDS = "BlockDenySeconds"
+    LOTTERY_FILTER_ON = "LotteryFilterOn"
 
     # TTS 服务通用
     ACTIVE_TTS = "ActiveTTS"
+    TTS_TRIM_THRESHOLD = "TrimThreshold"
 
     # Minimax 服务
     MINIMAX_API_URL = "ApiUrl"
@@ -76,9 +101,14 @@ class ConfigKey(StrEnum):
     MINIMAX_SPEED = "Speed"
     MINIMAX_VOL = "Vol"
     MINIMAX_PITCH = "Pitch"
+    MINIMAX_STREAM_ON = "StreamOn"
+    MINIMAX_OUTPUT_FORMAT = "OutputFormat"
+    MINIMAX_MAX_TRIM = "MaxTrim"
 
     # Fish Speech 服务
     FISH_SPEECH_API_URL = "ApiUrl"
+    FISH_SPEECH_STREAM_ON = "StreamOn"
+    FISH_SPEECH_MAX_TRIM = "MaxTrim"
 
     # GPT-SoVITS 服务
     GPT_SOVITS_API_URL = "ApiUrl"
@@ -97,6 +127,10 @@ class ConfigKey(StrEnum):
     GPT_SOVITS_SAMPLE_STEPS = "SampleSteps"
     GPT_SOVITS_SUPER_SAMPLING = "SuperSampling"
     GPT_SOVITS_PAUSE_SECONDS = "PauseSeconds"
+    GPT_SOVITS_TRANSPORT = "Transport"
+    GPT_SOVITS_API_V2_URL = "ApiV2Url"
+    GPT_SOVITS_STREAM_ON = "StreamOn"
+    GPT_SOVITS_MAX_TRIM = "MaxTrim"
 
     # Piper 服务
     PIPER_API_URL = "ApiUrl"
@@ -106,9 +140,24 @@ class ConfigKey(StrEnum):
     PIPER_LENGTH_SCALE = "LengthScale"
     PIPER_NOISE_SCALE = "NoiseScale"
     PIPER_NOISE_W_SCALE = "NoiseWScale"
+    PIPER_MAX_TRIM = "MaxTrim"
 
     # 播放器
     PLAYER_DEVICE = "PlayerDevice"
+    PLAYER_CLIP_GAP = "ClipGap"
+    PLAYER_ADAPTIVE_RATE_ON = "AdaptiveRateOn"
+    PLAYER_RATE_MAX = "RateMax"
+    PLAYER_RATE_BACKLOG_LOW = "RateBacklogLow"
+    PLAYER_RATE_BACKLOG_HIGH = "RateBacklogHigh"
+    PLAYER_LOUDNESS_ON = "LoudnessOn"
+    PLAYER_LOUDNESS_TARGET = "LoudnessTarget"
+
+    # 文本规范化
+    NORMALIZE_ON = "NormalizeOn"
+    NORMALIZE_MAX_REPEAT = "MaxRepeat"
+    NORMALIZE_EMOTICON_MODE = "EmoticonMode"
+    NORMALIZE_SKIP_IMAGE_ON = "SkipImageOn"
+    NORMALIZE_MAX_LENGTH = "MaxLength"
 
     # 别名字典
     ALIAS_DICT = "AliasDict"
@@ -155,11 +204,18 @@ class IntValidator(ConfigValidator):
 class OutputDeviceValidator(OptionsValidator):
     """输出设备验证器
 
-    动态获取输出设备列表，验证设备索引是否有效。
+    使用播放器缓存的设备列表验证设备索引，不重复枚举设备。
+    ``DEFAULT_OUTPUT_DEVICE`` 表示跟随系统默认设备，始终有效。
     """
 
     def __init__(self):
-        self.options = [device.index for device in audio_player.get_output_devices()]
+        pass
+
+    @property
+    def options(self) -> list[int]:  # type: ignore[override]
+        return [DEFAULT_OUTPUT_DEVICE] + [
+            device.index for device in audio_player.get_output_devices()
+        ]
 
     @override
     def validate(self, value) -> bool:
@@ -171,9 +227,7 @@ class OutputDeviceValidator(OptionsValidator):
         Returns:
             bool: 索引是否有效
         """
-
-        self.options = [device.index for device in audio_player.get_output_devices()]
-        return value in self.options
+        return value == DEFAULT_OUTPUT_DEVICE or audio_player.has_output_device(value)
 
     @override
     def correct(self, value) -> int:
@@ -372,6 +426,21 @@ class Config(QConfig):
         validator=RangeValidator(1.0, 30.0),
     )
 
+    lotteryFilterOn = ConfigItem(
+        group=ConfigGroup.BILI_SERVICE,
+        name=ConfigKey.LOTTERY_FILTER_ON,
+        default=True,
+        validator=BoolValidator(),
+    )
+
+    # 用户被禁言后拒绝其播报的时长（秒）
+    blockDenySeconds = RangeConfigItem(
+        group=ConfigGroup.BILI_SERVICE,
+        name=ConfigKey.BLOCK_DENY_SECONDS,
+        default=600,
+        validator=RangeValidator(0, 3600),
+    )
+
     # TTS 服务通用配置
     activeTTS = OptionsConfigItem(
         group=ConfigGroup.TTS_SERVICE,
@@ -380,6 +449,13 @@ class Config(QConfig):
         validator=OptionsValidator(list(SUPPORTED_SERVICES.keys())),
     )
 
+    ttsTrimThreshold = RangeConfigItem(
+        group=ConfigGroup.TTS_SERVICE,
+        name=ConfigKey.TTS_TRIM_THRESHOLD,
+        default=-50,
+        validator=RangeValidator(-80, -20),
+    )
+
     # Minimax TTS 服务配置
 
     minimaxApiKey = ConfigItem(
@@ -430,6 +506,27 @@ class Config(QConfig):
         validator=RangeValidator(-12, 12),
     )
 
+    minimaxStreamOn = ConfigItem(
+        group=ConfigGroup.MINIMAX_SERVICE,
+        name=ConfigKey.MINIMAX_STREAM_ON,
+        default=True,
+        validator=BoolValidator(),
+    )
+
+    minimaxOutputFormat = OptionsConfigItem(
+        group=ConfigGroup.MINIMAX_SERVICE,
+        name=ConfigKey.MINIMAX_OUTPUT_FORMAT,
+        default=MINIMAX_OUTPUT_HEX,
+        validator=OptionsValidator(MINIMAX_OUTPUT_FORMATS),
+    )
+
+    minimaxMaxTrim = RangeConfigItem(
+        group=ConfigGroup.MINIMAX_SERVICE,
+        name=ConfigKey.MINIMAX_MAX_TRIM,
+        default=600,
+        validator=RangeValidator(0, 2000),
+    )
+
     # Fish Speech TTS 服务配置
     fishSpeechApiUrl = ConfigItem(
         group=ConfigGroup.FISH_SPEECH_SERVICE,
@@ -437,6 +534,20 @@ class Config(QConfig):
         default="http://localhost:8080/v1/tts",
     )
 
+    fishSpeechStreamOn = ConfigItem(
+        group=ConfigGroup.FISH_SPEECH_SERVICE,
+        name=ConfigKey.FISH_SPEECH_STREAM_ON,
+        default=True,
+        validator=BoolValidator(),
+    )
+
+    fishSpeechMaxTrim = RangeConfigItem(
+        group=ConfigGroup.FISH_SPEECH_SERVICE,
+        name=ConfigKey.FISH_SPEECH_MAX_TRIM,
+        default=600,
+        validator=RangeValidator(0, 2000),
+    )
+
     # GPT-SoVITS TTS 服务配置
     gptSovitsApiUrl = ConfigItem(
         group=ConfigGroup.GPT_SOVITS_SERVICE,
@@ -545,6 +656,33 @@ class Config(QConfig):
         validator=RangeValidator(0.0, 5.0),
     )
 
+    gptSovitsMaxTrim = RangeConfigItem(
+        group=ConfigGroup.GPT_SOVITS_SERVICE,
+        name=ConfigKey.GPT_SOVITS_MAX_TRIM,
+        default=600,
+        validator=RangeValidator(0, 2000),
+    )
+
+    gptSovitsTransport = OptionsConfigItem(
+        group=ConfigGroup.GPT_SOVITS_SERVICE,
+        name=ConfigKey.GPT_SOVITS_TRANSPORT,
+        default=GPT_SOVITS_TRANSPORT_GRADIO,
+        validator=OptionsValidator(GPT_SOVITS_TRANSPORTS),
+    )
+
+    gptSovitsApiV2Url = ConfigItem(
+        group=ConfigGroup.GPT_SOVITS_SERVICE,
+        name=ConfigKey.GPT_SOVITS_API_V2_URL,
+        default="http://127.0.0.1:9880",
+    )
+
+    gptSovitsStreamOn = ConfigItem(
+        group=ConfigGroup.GPT_SOVITS_SERVICE,
+        name=ConfigKey.GPT_SOVITS_STREAM_ON,
+        default=True,
+        validator=BoolValidator(),
+    )
+
     # Piper TTS 服务配置
     piperApiUrl = ConfigItem(
         group=ConfigGroup.PIPER_SERVICE,
@@ -592,14 +730,122 @@ class Config(QConfig):
         validator=RangeValidator(0.0, 1.0),
     )
 
+    piperMaxTrim = RangeConfigItem(
+        group=ConfigGroup.PIPER_SERVICE,
+        name=ConfigKey.PIPER_MAX_TRIM,
+        default=600,
+        validator=RangeValidator(0, 2000),
+    )
+
     # 播放器配置
     playerDevice = OptionsConfigItem(
         group=ConfigGroup.PLAYER,
         name=ConfigKey.PLAYER_DEVICE,
-        default=audio_player.default_output_index,  # 在实际使用时会通过 validator 修正为有效值
+        default=DEFAULT_OUTPUT_DEVICE,
         validator=OutputDeviceValidator(),
     )
 
+    playerClipGap = RangeConfigItem(
+        group=ConfigGroup.PLAYER,
+        name=ConfigKey.PLAYER_CLIP_GAP,
+        default=200,
+        validator=RangeValidator(0, 2000),
+    )
+
+    playerAdaptiveRateOn = ConfigItem(
+        group=ConfigGroup.PLAYER,
+        name=ConfigKey.PLAYER_ADAPTIVE_RATE_ON,
+        default=True,
+        validator=BoolValidator(),
+    )
+
+    playerRateMax = RangeConfigItem(
+        group=ConfigGroup.PLAYER,
+        name=ConfigKey.PLAYER_RATE_MAX,
+        default=1.4,
+        validator=RangeValidator(1.0, 2.0),
+    )
+
+    playerRateBacklogLow = RangeConfigItem(
+        group=ConfigGroup.PLAYER,
+        name=ConfigKey.PLAYER_RATE_BACKLOG_LOW,
+        default=10,
+        validator=RangeValidator(0, 300),
+    )
+
+    playerRateBacklogHigh = RangeConfigItem(
+        group=ConfigGroup.PLAYER,
+        name=ConfigKey.PLAYER_RATE_BACKLOG_HIGH,
+        default=40,
+        validator=RangeValidator(1, 600),
+    )
+
+    playerLoudnessOn = ConfigItem(
+        group=ConfigGroup.PLAYER,
+        name=ConfigKey.PLAYER_LOUDNESS_ON,
+        default=True,
+        validator=BoolValidator(),
+    )
+
+    playerLoudnessTarget = RangeConfigItem(
+        group=ConfigGroup.PLAYER,
+        name=ConfigKey.PLAYER_LOUDNESS_TARGET,
+        default=-18,
+        validator=RangeValidator(-36, -10),
+    )
+
+    # 文本规范化配置
+    normalizeOn = ConfigItem(
+        group=ConfigGroup.TEXT_NORMALIZER,
+        name=ConfigKey.NORMALIZE_ON,
+        default=True,
+        validator=BoolValidator(),
+    )
+
+    normalizeMaxRepeat = RangeConfigItem(
+        group=ConfigGroup.TEXT_NORMALIZER,
+        name=ConfigKey.NORMALIZE_MAX_REPEAT,
+        default=3,
+        validator=RangeValidator(1, 10),
+    )
+
+    normalizeEmoticonMode = OptionsConfigItem(
+        group=ConfigGroup.TEXT_NORMALIZER,
+        name=ConfigKey.NORMALIZE_EMOTICON_MODE,
+        default=EmoticonMode.STRIP,
+        validator=OptionsValidator(list(EmoticonMode)),
+    )
+
+    normalizeSkipImageOn = ConfigItem(
+        group=ConfigGroup.TEXT_NORMALIZER,
+        name=ConfigKey.NORMALIZE_SKIP_IMAGE_ON,
+        default=True,
+        validator=BoolValidator(),
+    )
+
+    normalizeMaxLength = RangeConfigItem(
+        group=ConfigGroup.TEXT_NORMALIZER,
+        name=ConfigKey.NORMALIZE_MAX_LENGTH,
+        default=80,
+        validator=RangeValidator(10, 500),
+    )
+
+
+def iter_config_items(*groups: str) -> list[ConfigItem]:
+    """列出属于指定分组的所有配置项
+
+    Args:
+        *groups: 配置分组名称
+
+    Returns:
+        list[ConfigItem]: 配置项列表
+    """
+    return [
+        item
+        for item in vars(Config).values()
+        if isinstance(item, ConfigItem) and item.group in groups
+    ]
+
 
 def _migrate_voice_dict_to_minimax(config_path: Path) -> None:
     """把旧 BiliService.VoiceDict 物理迁到 MinimaxService.VoiceDict
@@ -651,3 +897,18 @@ _preload_voice_dict(DATA_DIR / "config.json")
 
 # 加载配置文件
 qconfig.load(str(DATA_DIR / "config.json"), cfg)
+
+# 播放器不依赖配置模块，相关配置在这里同步过去
+audio_player.set_clip_gap(cfg.playerClipGap.value)
+cfg.playerClipGap.valueChanged.connect(audio_player.set_clip_gap)
+
+
+def _sync_loudness_target(*_) -> None:
+    audio_player.set_loudness_target(
+        cfg.playerLoudnessTarget.value if cfg.playerLoudnessOn.value else None
+    )
+
+
+_sync_loudness_target()
+cfg.playerLoudnessOn.valueChanged.connect(_sync_loudness_target)
+cfg.playerLoudnessTarget.valueChanged.connect(_sync_loudness_target)
@@ -0,0 +1,131 @@
+"""PCM 格式转换
+
+把各 TTS 后端返回的音频（采样率、声道数、采样位宽各不相同）统一转换为输出设备的
+原生格式，播放器因此只需一个常驻输出流，也不再依赖系统层面的重采样。
+
+转换用 NumPy 向量化实现：解码为 float32 → 声道映射 → 线性插值重采样 → 编码。
+与源格式相关的参数按 (源格式, 目标格式) 缓存，流式播放时每个流使用一个
+``PcmConverter``，在块与块之间保留插值状态，拼接处不会产生爆音。
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .audio import AudioFormat
+
+
+@dataclass(frozen=True, slots=True)
+class ConversionPlan:
+    """某个 (源格式, 目标格式) 的转换参数"""
+
+    source: AudioFormat
+    target: AudioFormat
+    # 每个输出采样对应的输入采样数，为 1 时不重采样
+    step: float
+
+    @property
+    def identity(self) -> bool:
+        return self.source == self.target
+
+
+@lru_cache(maxsize=32)
+def get_plan(source: AudioFormat, target: AudioFormat) -> ConversionPlan:
+    """获取转换参数（按源格式缓存）"""
+    return ConversionPlan(source, target, source.sample_rate / target.sample_rate)
+
+
+def decode_pcm(
+    data: bytes | memoryview, sample_width: int, channels: int
+) -> np.ndarray:
+    """把 PCM 数据解码为 (帧数, 声道数) 的 float32 数组，取值范围 [-1, 1)"""
+    if sample_width == 1:
+        # 8-bit WAV 为无符号数
+        samples = (np.frombuffer(data, np.uint8).astype(np.float32) - 128) / 128
+    elif sample_width == 2:
+        samples = np.frombuffer(data, "<i2").astype(np.float32) / 32768
+    elif sample_width == 3:
+        raw = np.frombuffer(data, np.uint8).reshape(-1, 3).astype(np.int32)
+        value = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        value = np.where(value >= 1 << 23, value - (1 << 24), value)
+        samples = value.astype(np.float32) / (1 << 23)
+    elif sample_width == 4:
+        samples = np.frombuffer(data, "<i4").astype(np.float32) / (1 << 31)
+    else:
+        raise ValueError(f"不支持的采样位宽: {sample_width}")
+    return samples.reshape(-1, channels)
+
+
+def encode_pcm(samples: np.ndarray, sample_width: int) -> bytes:
+    """把 float32 数组编码为 PCM 数据（超出 [-1, 1] 的部分削波）"""
+    samples = np.clip(samples, -1.0, 1.0)
+    if sample_width == 1:
+        return (samples * 127 + 128).astype(np.uint8).tobytes()
+    if sample_width == 2:
+        return (samples * 32767).astype("<i2").tobytes()
+    if sample_width == 4:
+        return (samples * 2147483647.0).astype("<i4").tobytes()
+    raise ValueError(f"不支持的输出采样位宽: {sample_width}")
+
+
+def _map_channels(samples: np.ndarray, channels: int) -> np.ndarray:
+    """声道映射：单声道复制到所有声道，多声道缩混为单声道，其余按序截取或补零"""
+    source = samples.shape[1]
+    if source == channels:
+        return samples
+    if source == 1:
+        return np.repeat(samples, channels, axis=1)
+    if channels == 1:
+        return samples.mean(axis=1, keepdims=True)
+    if source > channels:
+        return samples[:, :channels]
+    padding = np.zeros((len(samples), channels - source), np.float32)
+    return np.hstack([samples, padding])
+
+
+class PcmConverter:
+    """有状态的 PCM 转换器，一个音频流（或一段完整音频）使用一个实例"""
+
+    def __init__(self, source: AudioFormat, target: AudioFormat) -> None:
+        self.plan = get_plan(source, target)
+        # 上一块的最后一帧（插值时作为下一块的第 0 帧）
+        self._prev: np.ndarray | None = None
+        # 下一个输出采样在输入中的位置（相对 _prev）
+        self._pos = 0.0
+
+    def convert(self, data: bytes | memoryview) -> bytes | memoryview:
+        """转换一块 PCM 数据（必须按源格式的帧对齐）"""
+        if self.plan.identity:
+            return data
+        return encode_pcm(self.to_float(data), self.plan.target.sample_width)
+
+    def to_float(self, data: bytes | memoryview) -> np.ndarray:
+        """转换一块 PCM 数据，返回目标采样率和声道数的 float32 数组（供混音使用）"""
+        plan = self.plan
+        samples = decode_pcm(data, plan.source.sample_width, plan.source.channels)
+        samples = _map_channels(samples, plan.target.channels)
+        if plan.step != 1:
+            samples = self._resample(samples)
+        return samples
+
+    def _resample(self, samples: np.ndarray) -> np.ndarray:
+        """线性插值重采样，跨块保持相位连续"""
+        if self._prev is not None:
+            samples = np.vstack([self._prev, samples])
+        last = len(samples) - 1
+        if last < self._pos:
+            # 数据不足一个输出采样，留到下一块
+            self._prev = samples[-1:]
+            self._pos -= last
+            return samples[:0]
+        step = self.plan.step
+        count = int((last - self._pos) // step) + 1
+        positions = self._pos + step * np.arange(count)
+        index = positions.astype(np.int64)
+        frac = (positions - index).astype(np.float32)[:, None]
+        upper = np.minimum(index + 1, last)
+        out = samples[index] * (1 - frac) + samples[upper] * frac
+        self._pos = self._pos + step * count - last
+        self._prev = samples[-1:]
+        return out
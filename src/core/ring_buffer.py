@@ -0,0 +1,66 @@
+"""PCM 环形缓冲区
+
+混音线程写入、音频回调读取。回调运行在音频驱动的实时线程里，不能等锁，
+因此采用单生产者单消费者的无锁结构：写入端只推进 ``_write_pos``，
+读取端只推进 ``_read_pos``，两个位置单调递增、各自只由一个线程修改。
+数据通过 memoryview 切片直接拷入回调的输出缓冲区，不产生中间对象。
+"""
+
+
+class RingBuffer:
+    """单生产者单消费者的字节环形缓冲区"""
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Args:
+            capacity: 容量（字节）
+        """
+        self.capacity = capacity
+        self._view = memoryview(bytearray(capacity))
+        self._write_pos = 0
+        self._read_pos = 0
+
+    @property
+    def available(self) -> int:
+        """可读取的字节数"""
+        return self._write_pos - self._read_pos
+
+    @property
+    def free(self) -> int:
+        """可写入的字节数"""
+        return self.capacity - self.available
+
+    def write(self, data: bytes | memoryview) -> int:
+        """写入数据（生产者调用），空间不足时只写入能放下的部分
+
+        Returns:
+            实际写入的字节数
+        """
+        src = memoryview(data).cast("B")
+        size = min(len(src), self.free)
+        if not size:
+            return 0
+        start = self._write_pos % self.capacity
+        first = min(size, self.capacity - start)
+        self._view[start : start + first] = src[:first]
+        if size > first:
+            self._view[: size - first] = src[first:size]
+        self._write_pos += size
+        return size
+
+    def read_into(self, out: memoryview) -> int:
+        """读取数据到 ``out``（消费者调用），数据不足时只填充开头部分
+
+        Returns:
+            实际读取的字节数
+        """
+        size = min(len(out), self.available)
+        if not size:
+            return 0
+        start = self._read_pos % self.capacity
+        first = min(size, self.capacity - start)
+        out[:first] = self._view[start : start + first]
+        if size > first:
+            out[first:size] = self._view[: size - first]
+        self._read_pos += size
+        return size
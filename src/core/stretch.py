@@ -0,0 +1,103 @@
+"""WSOLA 时间伸缩
+
+不能通过参数调整语速的 TTS 后端由播放器在混音前对音频做时间伸缩：改变时长而不改变音高。
+
+WSOLA（波形相似叠加）按固定输出步长逐帧叠加，每帧在理想分析位置附近的
+``tolerance`` 范围内搜索与上一帧自然延续最相似的位置，避免相位错位产生的颤音。
+每帧的相似度搜索对所有候选位置一次性用矩阵乘法计算，Python 层只按帧循环。
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class TimeStretcher:
+    """有状态的时间伸缩器，一个音频流（或一段完整音频）使用一个实例
+
+    输入可以任意分块，块与块之间保持连续；``rate`` 大于 1 时加快播放。
+    """
+
+    # 分析帧长（秒），相邻帧重叠一半
+    frame_duration = 0.04
+    # 相似位置的搜索范围（秒）
+    tolerance_duration = 0.01
+
+    def __init__(self, rate: float, sample_rate: int, channels: int) -> None:
+        self.rate = rate
+        self._frame = max(2, round(sample_rate * self.frame_duration) // 2 * 2)
+        self._hop = self._frame // 2
+        self._tolerance = max(1, round(sample_rate * self.tolerance_duration))
+        # 周期 Hann 窗，重叠一半时叠加结果恒为 1
+        n = np.arange(self._frame)
+        window = 0.5 - 0.5 * np.cos(2 * np.pi * n / self._frame)
+        self._window = window.astype(np.float32)[:, None]
+        self._input = np.zeros((0, channels), np.float32)
+        # _input[0] 在整个输入中的位置
+        self._base = 0
+        # 下一帧的理想分析位置（整个输入中的位置）
+        self._position = 0.0
+        # 上一帧的自然延续（单声道），为 None 表示还没有输出过帧
+        self._natural: np.ndarray | None = None
+        # 上一帧后半部分，等待与下一帧叠加
+        self._tail = np.zeros((self._hop, channels), np.float32)
+        self._consumed = 0
+        self._produced = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """伸缩一块 (帧数, 声道数) 的 float32 音频，返回已能确定的输出部分"""
+        self._consumed += len(samples)
+        self._input = np.concatenate([self._input, samples])
+        frame, hop, tolerance = self._frame, self._hop, self._tolerance
+        outputs: list[np.ndarray] = []
+        while True:
+            ideal = round(self._position) - self._base
+            if ideal + tolerance + frame + hop > len(self._input):
+                break
+            if self._natural is None:
+                # 第一帧前半部分不加窗，避免开头淡入
+                start = ideal
+                segment = self._input[start : start + frame] * self._window
+                outputs.append(self._input[start : start + hop])
+            else:
+                start = self._search(max(0, ideal - tolerance), ideal + tolerance)
+                segment = self._input[start : start + frame] * self._window
+                outputs.append(self._tail + segment[:hop])
+            self._tail = segment[hop:]
+            self._natural = self._input[start + hop : start + hop + frame].mean(axis=1)
+            self._position += hop * self.rate
+        # 丢弃后续搜索不会再用到的输入
+        drop = round(self._position) - self._base - tolerance
+        drop = min(len(self._input), max(0, drop))
+        self._input = self._input[drop:]
+        self._base += drop
+        return self._emit(outputs)
+
+    def _search(self, low: int, high: int) -> int:
+        """在 [low, high] 中找与上一帧自然延续最相似的起点（归一化互相关）"""
+        frame = self._frame
+        region = self._input[low : high + frame].mean(axis=1)
+        candidates = sliding_window_view(region, frame)
+        correlation = candidates @ self._natural
+        energy = np.concatenate([[0.0], np.cumsum(region.astype(np.float64) ** 2)])
+        norm = np.sqrt(energy[frame:] - energy[:-frame]) + 1e-9
+        return low + int(np.argmax(correlation / norm[: len(correlation)]))
+
+    def flush(self) -> np.ndarray:
+        """输入结束：输出剩余部分，总时长为输入时长除以 ``rate``"""
+        channels = self._input.shape[1]
+        size = self._frame + self._hop + self._tolerance
+        consumed, produced = self._consumed, self._produced
+        # 补静音把缓冲中剩余的输入推出来，再按期望时长截断
+        out = np.concatenate(
+            [self.process(np.zeros((size, channels), np.float32)), self._tail]
+        )
+        self._tail = np.zeros_like(self._tail)
+        self._consumed = consumed
+        return out[: max(0, round(consumed / self.rate) - produced)]
+
+    def _emit(self, outputs: list[np.ndarray]) -> np.ndarray:
+        if not outputs:
+            return self._input[:0]
+        out = np.concatenate(outputs)
+        self._produced += len(out)
+        return out
@@ -0,0 +1,158 @@
+"""首尾静音裁剪
+
+不少 TTS 后端会在音频首尾各留 200~600ms 静音，每条播报都因此多等一截，
+一场直播累计下来就是几分钟的空白。合成结果进入播放器和缓存之前，
+按能量阈值裁掉首尾静音，只保留 ``padding`` 秒的自然过渡。
+
+裁剪边合成边进行：开头的静音在遇到第一段有声音频前暂存（只保留最后 ``padding`` 秒），
+中间的静音段在后面出现有声音频时原样放行，结尾的静音在合成结束时丢弃。
+能量按 10ms 窗口用 NumPy 一次性计算。
+"""
+
+from collections import deque
+
+import numpy as np
+
+from .audio import AudioFormat
+from .resample import decode_pcm
+
+
+class SilenceTrimmer:
+    """流式静音裁剪器，一次合成使用一个实例
+
+    Attributes:
+        leading: 已裁掉的开头静音（秒）
+        trailing: 已裁掉的结尾静音（秒）
+    """
+
+    # 能量计算的窗口时长（秒）
+    window_duration = 0.01
+    # 首尾保留的静音（秒）
+    padding = 0.05
+
+    def __init__(
+        self, audio_format: AudioFormat, max_trim: float, threshold_db: float
+    ) -> None:
+        """
+        Args:
+            audio_format: 音频格式
+            max_trim: 首尾各最多裁掉的时长（秒），为 0 时不裁剪
+            threshold_db: 有声判定阈值（dBFS），窗口能量低于该值视为静音
+        """
+        self.format = audio_format
+        self.threshold_db = threshold_db
+        frame_size = audio_format.frame_size
+        self._window = max(1, round(audio_format.sample_rate * self.window_duration))
+        self._max_trim = round(audio_format.sample_rate * max_trim) * frame_size
+        self._padding = round(audio_format.sample_rate * self.padding) * frame_size
+        # 是否已经遇到有声音频（或开头已裁到上限）
+        self._started = max_trim <= 0
+        # 暂存的静音：开头为最后 padding 字节，之后为最近一段有声音频之后的静音
+        self._held: deque[bytes | memoryview] = deque()
+        self._held_bytes = 0
+        # 不足一帧的尾部，留到下一块
+        self._remainder = b""
+        self._leading = 0
+        self._trailing = 0
+
+    @property
+    def leading(self) -> float:
+        return self._leading / self.format.bytes_per_second
+
+    @property
+    def trailing(self) -> float:
+        return self._trailing / self.format.bytes_per_second
+
+    def _voiced_range(self, data: bytes | memoryview) -> tuple[int, int] | None:
+        """返回数据中第一个和最后一个有声窗口的字节范围，全为静音时返回 None"""
+        fmt = self.format
+        samples = decode_pcm(data, fmt.sample_width, fmt.channels)
+        power = np.square(samples).mean(axis=1)
+        windows = -(-len(power) // self._window)
+        power = np.pad(power, (0, windows * self._window - len(power)))
+        energy = power.reshape(windows, self._window).mean(axis=1)
+        voiced = np.flatnonzero(10 * np.log10(energy + 1e-12) > self.threshold_db)
+        if not len(voiced):
+            return None
+        window_bytes = self._window * fmt.frame_size
+        start = int(voiced[0]) * window_bytes
+        end = min(len(data), (int(voiced[-1]) + 1) * window_bytes)
+        return start, end
+
+    def _hold(self, data: bytes | memoryview) -> None:
+        if data:
+            self._held.append(data)
+            self._held_bytes += len(data)
+
+    def _release(self, limit: int | None = None) -> list[bytes | memoryview]:
+        """取出暂存数据的前 ``limit`` 字节（默认全部）"""
+        parts: list[bytes | memoryview] = []
+        remaining = self._held_bytes if limit is None else limit
+        while remaining > 0 and self._held:
+            part = self._held.popleft()
+            if len(part) > remaining:
+                self._held.appendleft(part[remaining:])
+                part = part[:remaining]
+            parts.append(part)
+            remaining -= len(part)
+            self._held_bytes -= len(part)
+        return parts
+
+    def _drop_leading(self) -> None:
+        """开头静音只保留最后 padding 字节；裁到上限后不再裁剪开头"""
+        excess = self._held_bytes - self._padding
+        if excess <= 0:
+            return
+        excess = min(excess, self._max_trim - self._leading)
+        self._leading += sum(len(part) for part in self._release(excess))
+        if self._leading >= self._max_trim:
+            self._started = True
+
+    def feed(self, chunk: bytes | memoryview) -> list[bytes | memoryview]:
+        """写入一块 PCM 数据，返回可以播放的部分（可能为空）"""
+        if self._remainder:
+            chunk = self._remainder + chunk
+            self._remainder = b""
+        tail = len(chunk) % self.format.frame_size
+        if tail:
+            self._remainder = bytes(chunk[-tail:])
+            chunk = chunk[:-tail]
+        if not chunk:
+            return []
+        if self._max_trim <= 0:
+            return [chunk]
+        data = memoryview(chunk).cast("B")
+        voiced = self._voiced_range(data)
+        if voiced is None:
+            self._hold(data)
+            if not self._started:
+                self._drop_leading()
+                if self._started:
+                    return self._release()
+            return self._release(self._held_bytes - self._max_trim - self._padding)
+        start, end = voiced
+        if not self._started:
+            self._hold(data[:start])
+            self._drop_leading()
+            self._started = True
+            out = self._release()
+            out.append(data[start:end])
+        else:
+            out = self._release()
+            out.append(data[:end])
+        # 有声部分之后的静音先暂存，后面还有声音时再放行
+        self._hold(data[end:])
+        return out
+
+    def finish(self) -> list[bytes | memoryview]:
+        """合成结束：丢弃结尾静音（保留 padding），返回剩余可播放的部分"""
+        if not self._started:
+            # 整段都是静音：按开头静音处理
+            self._drop_leading()
+            return self._release()
+        trim = min(max(0, self._held_bytes - self._padding), self._max_trim)
+        out = self._release(self._held_bytes - trim)
+        self._trailing += trim
+        self._held.clear()
+        self._held_bytes = 0
+        return out
@@ -8,6 +8,7 @@ from .int_setting_card import IntSettingCard
 from .login_panel import LoginPanel
 from .message_display_card import MessageDisplayCard
 from .readonly_info_card import ReadOnlyInfoCard
+from .refreshable_combo_box_setting_card import RefreshableComboBoxSettingCard
 from .single_audio_upload_widget import SingleAudioUploadWidget
 from .str_setting_card import StrSettingCard
 from .user_info_card import UserInfoCard
@@ -23,6 +24,7 @@ __all__ = [
     "LoginPanel",
     "MessageDisplayCard",
     "ReadOnlyInfoCard",
+    "RefreshableComboBoxSettingCard",
     "SingleAudioUploadWidget",
     "StrSettingCard",
     "UploadedFileCard",
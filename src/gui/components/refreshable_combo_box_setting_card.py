@@ -0,0 +1,66 @@
+"""可刷新选项的下拉框设置卡片"""
+
+from typing import Union
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QIcon
+from qfluentwidgets import (
+    ComboBoxSettingCard,
+    FluentIconBase,
+    OptionsConfigItem,
+    ToolButton,
+    qconfig,
+)
+from qfluentwidgets import (
+    FluentIcon as FIF,
+)
+
+
+class RefreshableComboBoxSettingCard(ComboBoxSettingCard):
+    """带刷新按钮的下拉框设置卡片
+
+    选项会在运行中变化（如插拔音频设备）时使用：点击刷新按钮发出 ``refreshRequested``，
+    由调用方重新获取选项后调用 ``setOptions`` 更新下拉框。
+    """
+
+    refreshRequested = Signal()  # 刷新按钮点击信号
+
+    def __init__(
+        self,
+        configItem: OptionsConfigItem,
+        icon: Union[str, QIcon, FluentIconBase],
+        title: str,
+        content: str | None = None,
+        texts: list[str] | None = None,
+        parent=None,
+    ) -> None:
+        super().__init__(configItem, icon, title, content, texts, parent)
+        self.refresh_btn = ToolButton(FIF.SYNC, self)
+        # 插在下拉框之后、末尾的间隔之前
+        index = self.hBoxLayout.indexOf(self.comboBox) + 1
+        self.hBoxLayout.insertSpacing(index, 8)
+        self.hBoxLayout.insertWidget(
+            index + 1, self.refresh_btn, 0, Qt.AlignmentFlag.AlignRight
+        )
+        self.refresh_btn.clicked.connect(self.refreshRequested.emit)
+
+    def setOptions(self, options: list, texts: list[str]) -> None:
+        """替换下拉框的全部选项
+
+        当前值不在新选项中时下拉框不选中任何项，配置值保持不变。
+
+        Args:
+            options: 选项值，与 ``texts`` 一一对应
+            texts: 选项显示文本
+        """
+        self.comboBox.blockSignals(True)
+        self.comboBox.clear()
+        self.optionToText = dict(zip(options, texts))
+        for text, option in zip(texts, options):
+            self.comboBox.addItem(text, userData=option)
+        value = qconfig.get(self.configItem)
+        if value in self.optionToText:
+            self.comboBox.setCurrentText(self.optionToText[value])
+        else:
+            self.comboBox.setCurrentIndex(-1)
+        self.comboBox.blockSignals(False)
@@ -19,10 +19,9 @@ from qfluentwidgets import (
     FluentIcon as FIF,
 )
 
-from core.player import audio_player
 from core.qconfig import cfg
 from models.service import ServiceType
-from tts_service import get_tts_service
+from tts_service import speak
 
 from ..components import ReadOnlyInfoCard
 
@@ -271,9 +270,7 @@ class AudioTestInterface(ScrollArea):
         if not text:
             return
         try:
-            tts_service = get_tts_service()
-            audio = await tts_service.text_to_speech(text)
-            await audio_player.play_bytes_async(audio)
+            await speak(text)
         except Exception as e:
             logger.exception(f"音频测试失败: {e}")
             InfoBar.error(
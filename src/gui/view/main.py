@@ -36,6 +36,7 @@ from bilibili import bili_service
 from core.const import AUTHOR_BILIBILI_URL, GITHUB_URL, RESOURCE_DIR
 from core.player import audio_player
 from core.update_checker import UpdateChecker
+from tts_service import close_tts_service
 
 from ..components import HomePanel, LoginPanel
 from ..icons import CustomIcon
@@ -385,6 +386,9 @@ class MainWindow(FluentWindow):
         logger.info("应用退出，正在停止音频播放队列")
         await audio_player.stop_worker()
 
+        # 关闭 TTS 服务的长连接
+        await close_tts_service()
+
         # run_forever() 返回后（QApplication.quit() 被调用后）
         # 在事件循环关闭前，手动清理 bilibili_api 的 session
         async def cleanup_bilibili_sessions():
@@ -2,6 +2,7 @@
 
 import asyncio
 
+from loguru import logger
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QWidget
 from qasync import asyncSlot
@@ -28,10 +29,16 @@ from core.const import (
     MINIMAX_MODELS,
     SUPPORTED_SERVICES,
 )
-from core.player import audio_player
+from core.player import DEFAULT_OUTPUT_DEVICE, audio_player
 from core.qconfig import cfg, get_voices
+from models.device import OutputDevice
 
-from ..components import FloatRangeSettingCard, IntSettingCard, StrSettingCard
+from ..components import (
+    FloatRangeSettingCard,
+    IntSettingCard,
+    RefreshableComboBoxSettingCard,
+    StrSettingCard,
+)
 from ..components.alias_dict_card import AliasDictCard
 from ..components.dict_edit_card import DictEditCard
 from ..icons import CustomIcon
@@ -236,6 +243,83 @@ class SettingsInterface(ScrollArea):
         self.giftMergeCard.addGroupWidget(self.giftMergeWindowIncrementCard)
         self.giftMergeCard.addGroupWidget(self.giftMergeWindowCard)
 
+        self.lotteryFilterCard = SwitchSettingCard(
+            icon=FIF.GAME,
+            title="天选时刻口令过滤",
+            content="天选时刻进行期间不播报口令弹幕，开奖时播报参与人数和中奖用户",
+            configItem=cfg.lotteryFilterOn,
+            parent=self.biliGroup,
+        )
+
+        self.blockDenySecondsCard = FloatRangeSettingCard(
+            configItem=cfg.blockDenySeconds,
+            icon=FIF.CANCEL,
+            title="禁言后屏蔽时长（秒）",
+            content=f"用户被房管禁言时丢弃其待播报的消息，并在此时长内不再播报该用户（{cfg.blockDenySeconds.range[0]}-{cfg.blockDenySeconds.range[1]}秒）",
+            step=60,
+            decimals=0,
+            parent=self.biliGroup,
+        )
+
+        # 文本规范化设置卡片（可展开）
+        self.normalizeCard = ExpandGroupSettingCard(
+            icon=FIF.FILTER,
+            title="文本规范化",
+            content="播报前压缩重复字符、处理表情、截断过长的弹幕",
+            parent=self.biliGroup,
+        )
+
+        self.normalizeOnCard = SwitchSettingCard(
+            icon=FIF.FILTER,
+            title="启用文本规范化",
+            content="关闭后按原文播报",
+            configItem=cfg.normalizeOn,
+            parent=self.normalizeCard,
+        )
+
+        self.normalizeMaxRepeatCard = FloatRangeSettingCard(
+            configItem=cfg.normalizeMaxRepeat,
+            icon=FIF.SYNC,
+            title="最多重复次数",
+            content=f"连续重复的字或短语最多保留的次数（{cfg.normalizeMaxRepeat.range[0]}-{cfg.normalizeMaxRepeat.range[1]}）",
+            step=1,
+            decimals=0,
+            parent=self.normalizeCard,
+        )
+
+        self.normalizeEmoticonModeCard = ComboBoxSettingCard(
+            configItem=cfg.normalizeEmoticonMode,
+            icon=FIF.EMOJI_TAB_SYMBOLS,
+            title="表情处理",
+            content="弹幕中的表情代码（如 [dog]）的播报方式",
+            texts=["不播报", "只读名称"],
+            parent=self.normalizeCard,
+        )
+
+        self.normalizeSkipImageOnCard = SwitchSettingCard(
+            icon=FIF.PHOTO,
+            title="跳过图片表情",
+            content="不播报只有图片表情的弹幕",
+            configItem=cfg.normalizeSkipImageOn,
+            parent=self.normalizeCard,
+        )
+
+        self.normalizeMaxLengthCard = FloatRangeSettingCard(
+            configItem=cfg.normalizeMaxLength,
+            icon=FIF.FONT_SIZE,
+            title="最大长度",
+            content=f"超过该长度的消息会在标点处截断（{cfg.normalizeMaxLength.range[0]}-{cfg.normalizeMaxLength.range[1]}字）",
+            step=1,
+            decimals=0,
+            parent=self.normalizeCard,
+        )
+
+        self.normalizeCard.addGroupWidget(self.normalizeOnCard)
+        self.normalizeCard.addGroupWidget(self.normalizeMaxRepeatCard)
+        self.normalizeCard.addGroupWidget(self.normalizeEmoticonModeCard)
+        self.normalizeCard.addGroupWidget(self.normalizeSkipImageOnCard)
+        self.normalizeCard.addGroupWidget(self.normalizeMaxLengthCard)
+
         self.aliasDictCard = AliasDictCard(self.biliGroup)
 
         # TTS 服务通用设置组
@@ -250,6 +334,16 @@ class SettingsInterface(ScrollArea):
             parent=self.ttsGroup,
         )
 
+        self.ttsTrimThresholdCard = FloatRangeSettingCard(
+            configItem=cfg.ttsTrimThreshold,
+            icon=FIF.CUT,
+            title="静音判定阈值",
+            content=f"裁剪首尾静音时，音量低于该值视为静音（{cfg.ttsTrimThreshold.range[0]}-{cfg.ttsTrimThreshold.range[1]}dB）",
+            step=1,
+            decimals=0,
+            parent=self.ttsGroup,
+        )
+
         # Minimax 服务设置组
         self.minimaxGroup = SettingCardGroup("Minimax 设置", self.scrollWidget)
 
@@ -321,6 +415,33 @@ class SettingsInterface(ScrollArea):
             parent=self.minimaxGroup,
         )
 
+        self.minimaxStreamOnCard = SwitchSettingCard(
+            icon=FIF.SPEED_HIGH,
+            title="流式合成",
+            content="边合成边播放，长文本可以更快开始播报",
+            configItem=cfg.minimaxStreamOn,
+            parent=self.minimaxGroup,
+        )
+
+        self.minimaxOutputFormatCard = ComboBoxSettingCard(
+            configItem=cfg.minimaxOutputFormat,
+            icon=FIF.DOWNLOAD,
+            title="音频返回方式",
+            content="非流式合成时，hex 随响应一起返回；url 返回下载地址后单独下载，响应更小",
+            texts=["hex", "url"],
+            parent=self.minimaxGroup,
+        )
+
+        self.minimaxMaxTrimCard = FloatRangeSettingCard(
+            configItem=cfg.minimaxMaxTrim,
+            icon=FIF.CUT,
+            title="裁剪首尾静音",
+            content=f"合成音频首尾各最多裁掉的静音时长，0 为不裁剪（{cfg.minimaxMaxTrim.range[0]}-{cfg.minimaxMaxTrim.range[1]}毫秒）",
+            step=50,
+            decimals=0,
+            parent=self.minimaxGroup,
+        )
+
         # Fish Speech 服务设置组
         self.fishSpeechGroup = SettingCardGroup("Fish Speech 设置", self.scrollWidget)
 
@@ -333,6 +454,24 @@ class SettingsInterface(ScrollArea):
             placeholder="http://localhost:8080/v1/tts",
         )
 
+        self.fishSpeechStreamOnCard = SwitchSettingCard(
+            icon=FIF.SPEED_HIGH,
+            title="流式合成",
+            content="边合成边播放，服务端不支持时自动退回整段合成",
+            configItem=cfg.fishSpeechStreamOn,
+            parent=self.fishSpeechGroup,
+        )
+
+        self.fishSpeechMaxTrimCard = FloatRangeSettingCard(
+            configItem=cfg.fishSpeechMaxTrim,
+            icon=FIF.CUT,
+            title="裁剪首尾静音",
+            content=f"合成音频首尾各最多裁掉的静音时长，0 为不裁剪（{cfg.fishSpeechMaxTrim.range[0]}-{cfg.fishSpeechMaxTrim.range[1]}毫秒）",
+            step=50,
+            decimals=0,
+            parent=self.fishSpeechGroup,
+        )
+
         # GPT-SoVITS 服务设置组
         self.gptSovitsGroup = SettingCardGroup("GPT-SoVITS 设置", self.scrollWidget)
 
@@ -345,6 +484,32 @@ class SettingsInterface(ScrollArea):
             placeholder="http://localhost:19874",
         )
 
+        self.gptSovitsTransportCard = ComboBoxSettingCard(
+            configItem=cfg.gptSovitsTransport,
+            icon=FIF.SYNC,
+            title="接口类型",
+            content="gradio 为 WebUI 接口；api_v2 为 api_v2.py 接口，一次请求直接返回音频",
+            texts=["WebUI (Gradio)", "api_v2"],
+            parent=self.gptSovitsGroup,
+        )
+
+        self.gptSovitsApiV2UrlCard = StrSettingCard(
+            configItem=cfg.gptSovitsApiV2Url,
+            icon=FIF.LINK,
+            title="api_v2 地址",
+            content="设置 GPT-SoVITS api_v2.py 服务的地址（接口类型为 api_v2 时使用）",
+            parent=self.gptSovitsGroup,
+            placeholder="http://127.0.0.1:9880",
+        )
+
+        self.gptSovitsStreamOnCard = SwitchSettingCard(
+            icon=FIF.SPEED_HIGH,
+            title="流式合成",
+            content="边合成边播放（仅 api_v2 接口支持）",
+            configItem=cfg.gptSovitsStreamOn,
+            parent=self.gptSovitsGroup,
+        )
+
         self.gptSovitsSovitsModelCard = StrSettingCard(
             configItem=cfg.gptSovitsSovitsModel,
             icon=FIF.DOCUMENT,
@@ -480,6 +645,16 @@ class SettingsInterface(ScrollArea):
             parent=self.gptSovitsGroup,
         )
 
+        self.gptSovitsMaxTrimCard = FloatRangeSettingCard(
+            configItem=cfg.gptSovitsMaxTrim,
+            icon=FIF.CUT,
+            title="裁剪首尾静音",
+            content=f"合成音频首尾各最多裁掉的静音时长，0 为不裁剪（{cfg.gptSovitsMaxTrim.range[0]}-{cfg.gptSovitsMaxTrim.range[1]}毫秒）",
+            step=50,
+            decimals=0,
+            parent=self.gptSovitsGroup,
+        )
+
         # Piper 服务设置组
         self.piperGroup = SettingCardGroup("Piper 设置", self.scrollWidget)
 
@@ -548,16 +723,92 @@ class SettingsInterface(ScrollArea):
             parent=self.piperGroup,
         )
 
+        self.piperMaxTrimCard = FloatRangeSettingCard(
+            configItem=cfg.piperMaxTrim,
+            icon=FIF.CUT,
+            title="裁剪首尾静音",
+            content=f"合成音频首尾各最多裁掉的静音时长，0 为不裁剪（{cfg.piperMaxTrim.range[0]}-{cfg.piperMaxTrim.range[1]}毫秒）",
+            step=50,
+            decimals=0,
+            parent=self.piperGroup,
+        )
+
         # 播放器设置组
         self.playerGroup = SettingCardGroup("音频设置", self.scrollWidget)
 
-        self.playerDeviceCard = ComboBoxSettingCard(
+        self.playerDeviceCard = RefreshableComboBoxSettingCard(
             configItem=cfg.playerDevice,
             icon=FIF.SPEAKERS,
             title="输出设备",
-            content="设置音频输出设备",
+            content="设置音频输出设备，插拔设备后点击刷新",
+            parent=self.playerGroup,
+            texts=[text for _, text in self._output_device_options()],
+        )
+
+        self.playerClipGapCard = FloatRangeSettingCard(
+            configItem=cfg.playerClipGap,
+            icon=FIF.STOP_WATCH,
+            title="播报间隔",
+            content=f"连续播报之间插入的静音时长（{cfg.playerClipGap.range[0]}-{cfg.playerClipGap.range[1]}毫秒）",
+            step=50,
+            decimals=0,
+            parent=self.playerGroup,
+        )
+
+        self.playerAdaptiveRateOnCard = SwitchSettingCard(
+            icon=FIF.SPEED_HIGH,
+            title="积压时加快语速",
+            content="待播报内容较多时自动加快语速，减少延迟",
+            configItem=cfg.playerAdaptiveRateOn,
+            parent=self.playerGroup,
+        )
+
+        self.playerRateMaxCard = FloatRangeSettingCard(
+            configItem=cfg.playerRateMax,
+            icon=FIF.SPEED_HIGH,
+            title="最大语速倍率",
+            content=f"积压最多时相对设定语速的倍率（{cfg.playerRateMax.range[0]}-{cfg.playerRateMax.range[1]}）",
+            step=0.05,
+            decimals=2,
+            parent=self.playerGroup,
+        )
+
+        self.playerRateBacklogLowCard = FloatRangeSettingCard(
+            configItem=cfg.playerRateBacklogLow,
+            icon=FIF.HISTORY,
+            title="开始加速的积压",
+            content="待播报时长超过该值（秒）后开始加快语速",
+            step=1,
+            decimals=0,
+            parent=self.playerGroup,
+        )
+
+        self.playerRateBacklogHighCard = FloatRangeSettingCard(
+            configItem=cfg.playerRateBacklogHigh,
+            icon=FIF.HISTORY,
+            title="最大加速的积压",
+            content="待播报时长达到该值（秒）时使用最大语速倍率",
+            step=1,
+            decimals=0,
+            parent=self.playerGroup,
+        )
+
+        self.playerLoudnessOnCard = SwitchSettingCard(
+            icon=FIF.VOLUME,
+            title="响度归一化",
+            content="把不同 TTS 服务和音色的音量调整到一致",
+            configItem=cfg.playerLoudnessOn,
+            parent=self.playerGroup,
+        )
+
+        self.playerLoudnessTargetCard = FloatRangeSettingCard(
+            configItem=cfg.playerLoudnessTarget,
+            icon=FIF.VOLUME,
+            title="目标响度",
+            content=f"响度归一化的目标值（{cfg.playerLoudnessTarget.range[0]}-{cfg.playerLoudnessTarget.range[1]} LUFS），越大越响",
+            step=1,
+            decimals=0,
             parent=self.playerGroup,
-            texts=[device.name for device in audio_player.get_output_devices()],
         )
 
         # 初始化布局
@@ -569,6 +820,7 @@ class SettingsInterface(ScrollArea):
         # 连接主题切换信号
         qconfig.themeChanged.connect(setTheme)
         cfg.playerDevice.valueChanged.connect(self._on_output_device_changed)
+        self.playerDeviceCard.refreshRequested.connect(self._on_refresh_devices)
         # 连接 voiceDict 变更信号
         cfg.voiceDict.valueChanged.connect(self._on_voice_dict_changed)
 
@@ -603,6 +855,40 @@ class SettingsInterface(ScrollArea):
     def _on_output_device_changed(self) -> None:
         audio_player.set_output_device(cfg.playerDevice.value)
 
+    @asyncSlot()
+    async def _on_refresh_devices(self) -> None:
+        """重新扫描音频设备并更新输出设备下拉框
+
+        设备验证器实时读取播放器的设备列表，扫描后即按新列表验证。
+        重新扫描后设备索引可能变化，所选设备仍在时配置改为其新索引。
+        """
+        self.playerDeviceCard.refresh_btn.setEnabled(False)
+        try:
+            # 重新初始化 PortAudio 需等待混音线程释放设备锁，不在界面线程中执行
+            devices = await asyncio.to_thread(audio_player.refresh_devices)
+        except Exception as e:
+            logger.exception(f"刷新音频设备失败: {e}")
+            return
+        finally:
+            self.playerDeviceCard.refresh_btn.setEnabled(True)
+        if audio_player.selected_device_available:
+            qconfig.set(cfg.playerDevice, audio_player.device_index)
+        options = self._output_device_options(devices)
+        self.playerDeviceCard.setOptions(
+            [option for option, _ in options], [text for _, text in options]
+        )
+
+    @staticmethod
+    def _output_device_options(
+        devices: list[OutputDevice] | None = None,
+    ) -> list[tuple[int, str]]:
+        """输出设备下拉框的选项 (设备索引, 名称)，与 ``cfg.playerDevice`` 的选项一一对应"""
+        if devices is None:
+            devices = audio_player.get_output_devices()
+        return [(DEFAULT_OUTPUT_DEVICE, "系统默认设备")] + [
+            (device.index, device.name) for device in devices
+        ]
+
     def _on_voice_dict_changed(self) -> None:
         """voiceDict 改变时更新音色选择卡片的选项
 
@@ -652,10 +938,14 @@ class SettingsInterface(ScrollArea):
         self.biliGroup.addSettingCard(self.guardOnTextCard)
         self.biliGroup.addSettingCard(self.superChatOnTextCard)
         self.biliGroup.addSettingCard(self.giftMergeCard)
+        self.biliGroup.addSettingCard(self.lotteryFilterCard)
+        self.biliGroup.addSettingCard(self.blockDenySecondsCard)
+        self.biliGroup.addSettingCard(self.normalizeCard)
         self.biliGroup.addSettingCard(self.aliasDictCard)
 
         # 添加 TTS 服务通用设置卡片
         self.ttsGroup.addSettingCard(self.activeTTSCard)
+        self.ttsGroup.addSettingCard(self.ttsTrimThresholdCard)
 
         # 添加 Minimax 服务设置卡片
         self.minimaxGroup.addSettingCard(self.minimaxApiKeyCard)
@@ -665,12 +955,20 @@ class SettingsInterface(ScrollArea):
         self.minimaxGroup.addSettingCard(self.minimaxSpeedCard)
         self.minimaxGroup.addSettingCard(self.minimaxVolCard)
         self.minimaxGroup.addSettingCard(self.minimaxPitchCard)
+        self.minimaxGroup.addSettingCard(self.minimaxStreamOnCard)
+        self.minimaxGroup.addSettingCard(self.minimaxOutputFormatCard)
+        self.minimaxGroup.addSettingCard(self.minimaxMaxTrimCard)
 
         # 添加 Fish Speech 服务设置卡片
         self.fishSpeechGroup.addSettingCard(self.fishSpeechApiUrlCard)
+        self.fishSpeechGroup.addSettingCard(self.fishSpeechStreamOnCard)
+        self.fishSpeechGroup.addSettingCard(self.fishSpeechMaxTrimCard)
 
         # 添加 GPT-SoVITS 服务设置卡片
         self.gptSovitsGroup.addSettingCard(self.gptSovitsApiUrlCard)
+        self.gptSovitsGroup.addSettingCard(self.gptSovitsTransportCard)
+        self.gptSovitsGroup.addSettingCard(self.gptSovitsApiV2UrlCard)
+        self.gptSovitsGroup.addSettingCard(self.gptSovitsStreamOnCard)
         self.gptSovitsGroup.addSettingCard(self.gptSovitsSovitsModelCard)
         self.gptSovitsGroup.addSettingCard(self.gptSovitsGptModelCard)
         self.gptSovitsGroup.addSettingCard(self.gptSovitsTextLangCard)
@@ -686,6 +984,7 @@ class SettingsInterface(ScrollArea):
         self.gptSovitsGroup.addSettingCard(self.gptSovitsSampleStepsCard)
         self.gptSovitsGroup.addSettingCard(self.gptSovitsSuperSamplingCard)
         self.gptSovitsGroup.addSettingCard(self.gptSovitsPauseSecondsCard)
+        self.gptSovitsGroup.addSettingCard(self.gptSovitsMaxTrimCard)
         
         # 添加 Piper 服务设置卡片
         self.piperGroup.addSettingCard(self.piperApiUrlCard)
@@ -695,9 +994,17 @@ class SettingsInterface(ScrollArea):
         self.piperGroup.addSettingCard(self.piperLengthScaleCard)
         self.piperGroup.addSettingCard(self.piperNoiseScaleCard)
         self.piperGroup.addSettingCard(self.piperNoiseWScaleCard)
+        self.piperGroup.addSettingCard(self.piperMaxTrimCard)
 
         # 添加播放器设置卡片
         self.playerGroup.addSettingCard(self.playerDeviceCard)
+        self.playerGroup.addSettingCard(self.playerClipGapCard)
+        self.playerGroup.addSettingCard(self.playerAdaptiveRateOnCard)
+        self.playerGroup.addSettingCard(self.playerRateMaxCard)
+        self.playerGroup.addSettingCard(self.playerRateBacklogLowCard)
+        self.playerGroup.addSettingCard(self.playerRateBacklogHighCard)
+        self.playerGroup.addSettingCard(self.playerLoudnessOnCard)
+        self.playerGroup.addSettingCard(self.playerLoudnessTargetCard)
 
         # 设置展开布局
         self.expandLayout.setSpacing(28)
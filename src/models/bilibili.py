@@ -37,6 +37,9 @@ class EventType(str, Enum):
     SEND_GIFT = "SEND_GIFT"  # 礼物
     GUARD_BUY = "GUARD_BUY"  # 舰长
     SUPER_CHAT_MESSAGE = "SUPER_CHAT_MESSAGE"  # 醒目留言
+    ROOM_BLOCK_MSG = "ROOM_BLOCK_MSG"  # 用户被禁言
+    ANCHOR_LOT_START = "ANCHOR_LOT_START"  # 天选时刻开始
+    ANCHOR_LOT_AWARD = "ANCHOR_LOT_AWARD"  # 天选时刻开奖
 
 
 class DanmuMessage(BaseModel):
@@ -263,6 +266,9 @@ class RoomBlockMsg(BaseModel):
         instance.timestamp = int(time.time())
         return instance
 
+    def __str__(self):
+        return f"{self.user_name}[{self.user_mid}] 被禁言"
+
 
 class AnchorLotStart(BaseModel):
     room_id: int = Field(default=0, description="房间 ID")
@@ -271,6 +277,7 @@ class AnchorLotStart(BaseModel):
     gift_name: str = Field(default="", description="礼物名称")
     gift_num: int = Field(default=0, description="礼物数量")
     require_text: str = Field(default="", description="要求文本")
+    duration: int = Field(default=0, description="距开奖的剩余时间（秒），未知为 0")
     timestamp: int = Field(default=0, description="发送时的 UNIX 毫秒时间戳")
 
     @classmethod
@@ -283,15 +290,25 @@ class AnchorLotStart(BaseModel):
         instance.gift_name = data["gift_name"]
         instance.gift_num = data["gift_num"]
         instance.require_text = data["require_text"]
+        # time 为剩余秒数（进房时抽奖可能已开始一段时间），max_time 为总时长
+        instance.duration = int(data.get("time") or data.get("max_time") or 0)
         instance.timestamp = int(time.time())
         return instance
 
 
+class LotAwardUser(BaseModel):
+    user_mid: int = Field(default=0, description="用户 ID")
+    user_name: str = Field(default="", description="用户名")
+
+
 class AnchorLotAward(BaseModel):
     room_id: int = Field(default=0, description="房间 ID")
     id: int = Field(default=0, description="ID")
-    user_mid: int = Field(default=0, description="用户 ID")
-    user_name: str = Field(default="", description="用户名")
+    user_mid: int = Field(default=0, description="第一位中奖用户 ID")
+    user_name: str = Field(default="", description="第一位中奖用户名")
+    award_users: list[LotAwardUser] = Field(
+        default_factory=list, description="全部中奖用户"
+    )
     award_name: str = Field(default="", description="奖励名称")
     award_num: int = Field(default=0, description="奖励数量")
     timestamp: int = Field(default=0, description="发送时的 UNIX 毫秒时间戳")
@@ -300,10 +317,19 @@ class AnchorLotAward(BaseModel):
     def parse(cls, event_data: Dict[str, Any]) -> "AnchorLotAward":
         instance = cls()
         instance.room_id = int(event_data["room_display_id"])
+        # 与 ANCHOR_LOT_START 相同，抽奖 ID 在内层 data 中
         data = event_data["data"]["data"]
-        instance.id = event_data["data"]["id"]
-        instance.user_mid = data["user_info"]["uid"]
-        instance.user_name = data["user_info"]["uname"]
+        instance.id = data["id"]
+        users = data.get("award_users") or []
+        if not users and data.get("user_info"):
+            users = [data["user_info"]]
+        instance.award_users = [
+            LotAwardUser(user_mid=user["uid"], user_name=user["uname"])
+            for user in users
+        ]
+        if instance.award_users:
+            instance.user_mid = instance.award_users[0].user_mid
+            instance.user_name = instance.award_users[0].user_name
         instance.award_name = data["award_name"]
         instance.award_num = data["award_num"]
         instance.timestamp = int(time.time())
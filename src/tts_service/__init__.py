@@ -1,44 +1,209 @@
+import asyncio
+from time import perf_counter
+
+from loguru import logger
+
+from core.announcement import Announcement, announcements
+from core.audio import AudioClip, Loudness, PcmStream
+from core.loudness import LoudnessMeter
+from core.metrics import metrics
+from core.mixer import Channel
+from core.player import audio_player
 from core.qconfig import cfg
-from models.service import ServiceType
+from core.trim import SilenceTrimmer
 
 from .base import TTSService
+from .cache import audio_cache
 from .fish_speech import FishSpeechService
 from .gpt_sovits import GPTSovitsService
 from .minimax import MinimaxService
+from .normalizer import text_normalizer
 from .piper import PiperService
+from .rate import rate_controller
+from .registry import tts_registry
+
+
+def get_tts_service() -> TTSService:
+    """获取当前TTS服务"""
+
+    return tts_registry.get()
+
+
+async def close_tts_service() -> None:
+    """关闭TTS服务，释放连接池（应用退出时调用）"""
+
+    await tts_registry.close()
+
+
+# 各后端上一次合成的响度，流式合成测够一个测量块之前先沿用
+_last_loudness: dict[type[TTSService], Loudness] = {}
+
+
+async def _speak_stream(
+    service: TTSService,
+    text: str,
+    channel: Channel,
+    rate: float,
+    announcement: Announcement,
+) -> None:
+    """把 ``stream_speech`` 产出的音频按顺序写入 PCM 流并播放
+
+    不支持流式的后端经默认适配一次产出整段音频，同样走这条路径，
+    首包延迟对所有后端都按同一口径统计。
+    流式后端先把 PCM 流放入播放队列，占住在声道中的顺序，音频边到边播；
+    整段合成的后端等音频到达后才入队，合成慢或卡住时不会挡住同一声道后面的播报。
+    首尾静音在进入播放器之前裁掉（``SilenceTrimmer``），缓存的也是裁剪后的音频。
+    裁剪后的音频随到达测量响度（``LoudnessMeter``），结果与音频一起缓存。
+    完整收到后拼成 ``AudioClip`` 写入缓存；合成中途失败的不缓存。
+    语速倍率由后端实现时合成结果不是正常语速，也不缓存。
+    """
+
+    backend_rate = rate if service.supports_rate else 1.0
+    pcm_stream = PcmStream()
+    queued = False
+
+    async def enqueue() -> None:
+        nonlocal queued
+        queued = True
+        await audio_player.play_stream_async(
+            pcm_stream, channel, rate / backend_rate, announcement
+        )
+
+    if service.supports_streaming:
+        await enqueue()
+    start = perf_counter()
+    first_audio: float | None = None
+    chunks: list[bytes | memoryview] = []
+    trimmer: SilenceTrimmer | None = None
+    meter: LoudnessMeter | None = None
+    pcm_stream.loudness = _last_loudness.get(type(service))
+
+    def push(parts: list[bytes | memoryview]) -> None:
+        # 先测量再写入，整段产出的音频从第一块起就使用准确的响度
+        for part in parts:
+            meter.add(part)
+        if meter.ready or pcm_stream.loudness is None:
+            pcm_stream.loudness = meter.measure()
+        for part in parts:
+            pcm_stream.feed(part)
+            chunks.append(part)
+
+    try:
+        async for audio_format, chunk in service.stream_speech(text, backend_rate):
+            if trimmer is None:
+                first_audio = perf_counter() - start
+                metrics.observe("tts.first_audio", first_audio)
+                pcm_stream.format = audio_format
+                trimmer = SilenceTrimmer(
+                    audio_format, service.max_trim, cfg.ttsTrimThreshold.value
+                )
+                meter = LoudnessMeter(audio_format)
+                if not queued:
+                    await enqueue()
+            push(trimmer.feed(chunk))
+        if trimmer is not None:
+            push(trimmer.finish())
+            metrics.observe("tts.trim.leading", trimmer.leading)
+            metrics.observe("tts.trim.trailing", trimmer.trailing)
+    finally:
+        pcm_stream.close()
+    loudness = meter.measure() if meter is not None else None
+    if loudness is not None:
+        pcm_stream.loudness = loudness
+        _last_loudness[type(service)] = loudness
+        metrics.observe("tts.loudness", loudness.lufs)
+    if pcm_stream.format is not None and backend_rate == 1:
+        # 整段产出时直接引用原缓冲区，不再拼接复制
+        data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+        audio_cache.put(text, AudioClip(pcm_stream.format, data, loudness))
+    total = perf_counter() - start
+    metrics.observe("tts.synthesis", total)
+    mode = "流式" if service.supports_streaming else "整段"
+    logger.info(
+        f"{mode}合成完成: 首包 {(first_audio or total) * 1000:.0f}ms，"
+        f"总耗时 {total * 1000:.0f}ms"
+    )
+
 
-_default_tts_service = None
+async def _synthesize(
+    cache_key: str, channel: Channel, rate: float, announcement: Announcement
+) -> None:
+    # 合成期间持有服务，配置切换不会关闭正在使用的旧服务
+    async with tts_registry.acquire() as service:
+        await _speak_stream(service, cache_key, channel, rate, announcement)
 
 
-def get_tts_service() -> FishSpeechService | GPTSovitsService | MinimaxService | PiperService:
-    """获取TTS服务"""
+async def speak(
+    text: str,
+    channel: Channel = Channel.ANNOUNCEMENT,
+    event: str = "",
+    user_mid: int | None = None,
+) -> Announcement | None:
+    """合成文本并加入播放队列
 
-    global _default_tts_service
-    if _default_tts_service is not None:
-        return _default_tts_service
-    model_type = cfg.activeTTS.value
-    if model_type == ServiceType.FISH_SPEECH:
-        _default_tts_service = FishSpeechService()
+    所有播报统一从这里进入，经 ``TTSService.stream_speech`` 取音频：
+    支持流式合成的后端在收到第一块音频时即可开始播放，其余后端合成完整音频后播放。
+    首包延迟和总合成耗时分别记录到 ``metrics``。
+    以规范化后的文本为键缓存合成结果，重复的播报不再请求后端。
+    声道积压较多时由 ``rate_controller`` 加快语速。
 
-    elif model_type == ServiceType.GPT_SOVITS:
-        _default_tts_service = GPTSovitsService()
+    每条播报登记为一条 ``Announcement``，可通过 ``audio_player`` 跳过、按事件类型清空
+    或按用户清除。合成在单独的任务中进行，播报被取消时合成随之中止，
+    后端连接立即释放，调用方不会因此收到 ``CancelledError``。
 
-    elif model_type == ServiceType.MINIMAX:
-        _default_tts_service = MinimaxService()
-    
-    elif model_type == ServiceType.PIPER:
-        _default_tts_service = PiperService()
+    Args:
+        text: 要播报的文本（用户消息部分应已经过 ``text_normalizer`` 处理）
+        channel: 播放声道，不同声道可同时播放，``PRIORITY`` 播放时压低其余声道
+        event: 来源事件类型（``EventType``），用于按类型清空
+        user_mid: 触发播报的用户 ID，用于按用户清除
 
-    else:
-        raise ValueError(f"Invalid TTS service: {model_type}")
-    return _default_tts_service
+    Returns:
+        本条播报；文本为空或用户在拒绝名单中（刚被禁言）时返回 None
+    """
+    if announcements.is_blocked(user_mid):
+        logger.debug(f"用户 {user_mid} 已被禁言，跳过播报")
+        return None
+    cache_key = text_normalizer.cache_key(text)
+    if not cache_key:
+        return None
+    announcement = Announcement(cache_key, event, user_mid)
+    announcements.add(announcement)
+    rate = rate_controller.update(channel)
+    try:
+        clip = audio_cache.get(cache_key)
+        if clip is not None:
+            logger.debug(f"命中音频缓存: {cache_key[:50]}")
+            await audio_player.play_clip_async(clip, channel, rate, announcement)
+            return announcement
+        announcement.task = asyncio.create_task(
+            _synthesize(cache_key, channel, rate, announcement)
+        )
+        try:
+            await announcement.task
+        except asyncio.CancelledError:
+            # 调用方自身被取消时照常抛出，只吞掉取消播报引起的中止
+            if not announcement.cancelled or asyncio.current_task().cancelling():
+                raise
+            logger.info(f"已取消播报 #{announcement.id}: {cache_key[:50]}")
+    finally:
+        announcement.task = None
+        if not announcement.queued:
+            # 未交给播放器（合成前失败或被取消），不会由混音器注销
+            announcements.remove(announcement)
+    return announcement
 
 
 __all__ = [
+    "Channel",
     "TTSService",
     "FishSpeechService",
     "GPTSovitsService",
     "MinimaxService",
     "PiperService",
     "get_tts_service",
+    "rate_controller",
+    "tts_registry",
+    "close_tts_service",
+    "speak",
+    "text_normalizer",
 ]
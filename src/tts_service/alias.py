@@ -0,0 +1,87 @@
+"""别名字典匹配引擎
+
+把 ``cfg.aliasDict`` 编译成一个正则，所有 TTS 后端共用。
+"""
+
+import re
+
+from qfluentwidgets import ConfigItem
+
+from core.qconfig import cfg
+
+
+def _trie_pattern(node: dict[str, dict]) -> str:
+    """把字典树转换成正则表达式
+
+    每层分支只可能有一个字符命中，终止节点用贪婪的可选组表示，
+    因此正则引擎在每个位置上自然得到最长匹配，且无需逐个尝试所有别名。
+
+    Args:
+        node: 字典树节点，键为字符，``""`` 键表示此处有别名结束
+    """
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in node.items()
+        if char != ""
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and "" not in node:
+        return branches[0]
+    body = "(?:" + "|".join(branches) + ")"
+    return body + "?" if "" in node else body
+
+
+class AliasMatcher:
+    """别名匹配器
+
+    别名字典变化时（``valueChanged``）才重新编译，之后每条消息只需单次扫描：
+
+    - ``substitute``: 一次遍历完成所有替换，同一位置取最长的别名，替换结果不会被再次替换
+    - ``matched``: 只返回文本中实际出现的别名，供 MiniMax 发音字典使用
+    """
+
+    def __init__(self, config_item: ConfigItem) -> None:
+        self._config_item = config_item
+        self._aliases: dict[str, str] = {}
+        self._pattern: re.Pattern[str] | None = None
+        self._dirty = True
+        config_item.valueChanged.connect(self._invalidate)
+
+    def _invalidate(self, *_: object) -> None:
+        self._dirty = True
+
+    def _compile(self) -> re.Pattern[str] | None:
+        """按需重新编译别名正则"""
+        if not self._dirty:
+            return self._pattern
+        self._aliases = {k: v for k, v in (self._config_item.value or {}).items() if k}
+        root: dict[str, dict] = {}
+        for key in self._aliases:
+            node = root
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self._pattern = re.compile(_trie_pattern(root)) if root else None
+        self._dirty = False
+        return self._pattern
+
+    def substitute(self, text: str) -> str:
+        """把文本中的别名替换为对应读音"""
+        pattern = self._compile()
+        if pattern is None:
+            return text
+        aliases = self._aliases
+        return pattern.sub(lambda m: aliases[m.group()], text)
+
+    def matched(self, text: str) -> dict[str, str]:
+        """返回文本中出现过的别名及其读音（按首次出现顺序）"""
+        pattern = self._compile()
+        if pattern is None:
+            return {}
+        aliases = self._aliases
+        return {key: aliases[key] for key in pattern.findall(text)}
+
+
+# 全局别名匹配器
+alias_matcher = AliasMatcher(cfg.aliasDict)
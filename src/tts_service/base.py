@@ -1,12 +1,68 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import AsyncIterator, Callable
+from typing import Any, TypeVar
+
+import httpx
+
+from core.audio import AudioClip, AudioFormat
+from core.qconfig import iter_config_items
+
+from .http import create_http_client
+from .snapshot import ConfigSnapshot
+
+T = TypeVar("T")
 
 
 class TTSService(ABC):
     """TTS适配器基类，定义统一的接口规范"""
 
+    # 请求超时时间（秒），子类可覆盖
+    http_timeout: float = 300.0
+    # 是否尝试使用 HTTP/2（远端 HTTPS 服务才有收益）
+    http2: bool = False
+    # 能否通过后端参数调整语速；不能的由播放器做时间伸缩
+    supports_rate: bool = False
+
     def __init__(self, api_url: str):
         self.api_url = api_url
+        self._client: httpx.AsyncClient | None = None
+        self._snapshots: list[ConfigSnapshot] = []
+
+    def _create_snapshot(self, group: str, build: Callable[[], T]) -> ConfigSnapshot[T]:
+        """创建依赖某个配置分组的快照，服务关闭时自动断开
+
+        Args:
+            group: 配置分组名称
+            build: 根据当前配置构建快照的函数
+        """
+        snapshot = ConfigSnapshot(iter_config_items(group), build)
+        self._snapshots.append(snapshot)
+        return snapshot
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """获取或创建长连接 HTTP 客户端
+
+        同一个服务实例的所有请求复用同一个连接池，避免每次播报都重新握手。
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = create_http_client(self.http_timeout, http2=self.http2)
+        return self._client
+
+    async def close(self) -> None:
+        """关闭 HTTP 客户端，释放连接池"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        for snapshot in self._snapshots:
+            snapshot.disconnect()
+        self._snapshots.clear()
+
+    async def warm_up(self) -> None:
+        """预热服务，提前建立连接，切换后的第一次合成不必等待握手
+
+        子类可扩展（例如加载模型权重）。失败时抛出异常。
+        """
+        await self._get_client().head(self.api_url)
 
     @abstractmethod
     async def text_to_speech(self, text: str, **kwargs: Any) -> bytes:
@@ -21,3 +77,56 @@ class TTSService(ABC):
             bytes: 音频数据（WAV格式）
         """
         pass
+
+    def _rate_overrides(self, rate: float) -> dict[str, Any]:
+        """把语速倍率换算为 ``text_to_speech`` 的参数
+
+        ``supports_rate`` 的后端重写，倍率为 1 时返回空字典（直接使用配置）。
+        """
+        return {}
+
+    async def synthesize(self, text: str, rate: float = 1.0) -> AudioClip:
+        """合成为 PCM 音频片段（播报使用）
+
+        默认解析 ``text_to_speech`` 返回的 WAV 文件头，PCM 数据不复制；
+        能直接输出裸 PCM 的后端可重写以省去 WAV 封装。
+
+        Args:
+            text: 要转换的文本
+            rate: 相对配置语速的倍率，仅 ``supports_rate`` 的后端生效
+        """
+        return AudioClip.from_wav(
+            await self.text_to_speech(text, **self._rate_overrides(rate))
+        )
+
+    @property
+    def max_trim(self) -> float:
+        """合成音频首尾各最多裁掉的静音（秒），0 表示不裁剪，子类按各自配置覆盖"""
+        return 0.0
+
+    @property
+    def supports_streaming(self) -> bool:
+        """当前配置下 ``stream_speech`` 是否边合成边产出音频
+
+        为 False 时 ``stream_speech`` 使用默认实现：合成完整音频后一次产出。
+        """
+        return False
+
+    async def stream_speech(
+        self, text: str, rate: float = 1.0
+    ) -> AsyncIterator[tuple[AudioFormat, bytes | memoryview]]:
+        """流式合成，按到达顺序逐块产出 PCM 数据
+
+        播报统一通过本方法取音频，首包到达的时间即可在整条链路上度量。
+        默认实现适配不支持流式的后端：``synthesize`` 完成后一次产出整段音频。
+
+        Args:
+            text: 要转换的文本
+            rate: 相对配置语速的倍率，仅 ``supports_rate`` 的后端生效
+
+        Yields:
+            tuple[AudioFormat, bytes | memoryview]: 音频格式和 PCM 音频块，
+            同一次合成中格式保持不变
+        """
+        clip = await self.synthesize(text, rate)
+        yield clip.format, clip.data
@@ -0,0 +1,66 @@
+"""播报音频缓存
+
+相同的播报文本（如固定的礼物感谢语、刷屏弹幕）只合成一次。
+缓存键为规范化后的文本，TTS 相关配置任一变化时整体失效。
+"""
+
+from collections import OrderedDict
+
+from loguru import logger
+
+from core.audio import AudioClip
+from core.const import AUDIO_CACHE_MAX_BYTES
+from core.qconfig import TTS_CONFIG_GROUPS, cfg, iter_config_items
+
+
+class AudioCache:
+    """按总字节数限制容量的 LRU 音频缓存
+
+    直接保存 ``AudioClip``，命中时原样交给播放器，不再解析或复制。
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, AudioClip] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> AudioClip | None:
+        """读取缓存，命中时移到最近使用的位置"""
+        clip = self._entries.get(key)
+        if clip is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return clip
+
+    def put(self, key: str, clip: AudioClip) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        if clip.nbytes > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old.nbytes
+        self._entries[key] = clip
+        self._size += clip.nbytes
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.nbytes
+
+    def clear(self, *_: object) -> None:
+        """清空缓存"""
+        if self._entries:
+            logger.debug(f"清空音频缓存（{len(self._entries)} 条）")
+        self._entries.clear()
+        self._size = 0
+
+
+# 全局音频缓存
+audio_cache = AudioCache(AUDIO_CACHE_MAX_BYTES)
+
+# 音色、模型、语速或别名变化后，旧音频不再有效
+for _item in iter_config_items(*TTS_CONFIG_GROUPS):
+    _item.valueChanged.connect(audio_cache.clear)
+cfg.aliasDict.valueChanged.connect(audio_cache.clear)
@@ -1,17 +1,60 @@
+from collections.abc import AsyncIterator
+from typing import Any
+
 import httpx
 from loguru import logger
 
+from core.audio import AudioFormat, parse_wav_header
 from core.qconfig import cfg
 
+from .alias import alias_matcher
 from .base import TTSService
 
 
 class FishSpeechService(TTSService):
     """Fish Speech TTS适配器"""
 
+    # 说明服务端不接受流式请求的状态码；429、401/403 等其他错误只让本次请求退回整段合成
+    streaming_unsupported_status = frozenset({400, 404, 405, 415, 422})
+
     def __init__(self) -> None:
         """初始化Fish Speech适配器"""
-        self.api_url = cfg.fishSpeechApiUrl.value
+        super().__init__(cfg.fishSpeechApiUrl.value)
+        # 服务端不支持流式时置为 False，之后直接走整段合成
+        self._streaming_supported = True
+
+    @staticmethod
+    def _format_text(text: str) -> str:
+        """应用别名替换"""
+        return alias_matcher.substitute(text)
+
+    @staticmethod
+    def _build_payload(
+        text: str,
+        chunk_length: int = 200,
+        seed: int = -1,
+        use_memory_cache: str = "off",
+        normalize: bool = True,
+        streaming: bool = False,
+        max_new_tokens: int = 1024,
+        top_p: float = 0.8,
+        repetition_penalty: float = 1.1,
+        temperature: float = 0.8,
+    ) -> dict[str, Any]:
+        """构造请求数据"""
+        return {
+            "text": text,
+            "chunk_length": chunk_length,
+            "format": "wav",
+            "seed": seed,
+            "use_memory_cache": use_memory_cache,
+            "normalize": normalize,
+            "streaming": streaming,
+            "max_new_tokens": max_new_tokens,
+            "top_p": top_p,
+            "repetition_penalty": repetition_penalty,
+            "temperature": temperature,
+        }
 
     async def text_to_speech(
         self,
@@ -47,30 +90,104 @@ class FishSpeechService(TTSService):
         Raises:
             httpx.HTTPStatusError: HTTP请求失败
         """
-        # 应用别名替换
-        format_text = text
-        if cfg.aliasDict.value:
-            for k, v in cfg.aliasDict.value.items():
-                format_text = format_text.replace(k, v)
-
-        # 准备请求数据
-        data = {
-            "text": format_text,
-            "chunk_length": chunk_length,
-            "format": "wav",
-            "seed": seed,
-            "use_memory_cache": use_memory_cache,
-            "normalize": normalize,
-            "streaming": streaming,
-            "max_new_tokens": max_new_tokens,
-            "top_p": top_p,
-            "repetition_penalty": repetition_penalty,
-            "temperature": temperature,
-        }
+        format_text = self._format_text(text)
+        data = self._build_payload(
+            format_text,
+            chunk_length=chunk_length,
+            seed=seed,
+            use_memory_cache=use_memory_cache,
+            normalize=normalize,
+            streaming=streaming,
+            max_new_tokens=max_new_tokens,
+            top_p=top_p,
+            repetition_penalty=repetition_penalty,
+            temperature=temperature,
+        )
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.api_url, json=data, timeout=300)
-            response.raise_for_status()
-            logger.info(f"Fish Speech TTS 成功: {format_text}")
+        client = self._get_client()
+        response = await client.post(self.api_url, json=data)
+        response.raise_for_status()
+        logger.info(f"Fish Speech TTS 成功: {format_text}")
 
         return response.content
+
+    @property
+    def max_trim(self) -> float:
+        return cfg.fishSpeechMaxTrim.value / 1000
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self._streaming_supported and cfg.fishSpeechStreamOn.value
+
+    async def stream_speech(
+        self, text: str, rate: float = 1.0
+    ) -> AsyncIterator[tuple[AudioFormat, bytes | memoryview]]:
+        """流式合成，按到达顺序逐块产出 PCM 数据
+
+        以 ``streaming=True`` 请求，Fish Speech 先返回 WAV 文件头，随后分块返回 PCM。
+        服务端明确不支持流式（400/404/405/415/422，或返回的不是 WAV）时退回整段合成，
+        并在本实例后续请求中不再尝试流式；限流、鉴权失败、5xx、网络错误等
+        只让本次请求退回整段合成。
+
+        Args:
+            text: 要转换的文本
+            rate: 不支持调整语速，忽略（由播放器做时间伸缩）
+
+        Yields:
+            tuple[AudioFormat, bytes | memoryview]: 音频格式和 PCM 音频块
+
+        Raises:
+            httpx.HTTPStatusError: HTTP请求失败
+        """
+        if self.supports_streaming:
+            format_text = self._format_text(text)
+            data = self._build_payload(format_text, streaming=True)
+            client = self._get_client()
+            audio_format: AudioFormat | None = None
+            unsupported = False
+            try:
+                async with client.stream("POST", self.api_url, json=data) as response:
+                    if response.is_success:
+                        header = b""
+                        async for chunk in response.aiter_bytes():
+                            if audio_format is not None:
+                                yield audio_format, chunk
+                                continue
+                            header += chunk
+                            try:
+                                parsed = parse_wav_header(header)
+                            except ValueError as e:
+                                logger.warning(f"Fish Speech 流式响应无法解析: {e}")
+                                unsupported = True
+                                break
+                            if parsed is None:
+                                continue
+                            audio_format, offset = parsed
+                            yield audio_format, header[offset:]
+                        if audio_format is not None:
+                            logger.info(f"Fish Speech 流式 TTS 成功: {format_text}")
+                            return
+                        if not unsupported:
+                            logger.warning(
+                                "Fish Speech 流式响应在文件头之前结束，本次退回整段合成"
+                            )
+                    else:
+                        await response.aread()
+                        unsupported = (
+                            response.status_code in self.streaming_unsupported_status
+                        )
+                        logger.warning(
+                            f"Fish Speech 流式请求失败（{response.status_code}），"
+                            "退回整段合成"
+                        )
+            except httpx.TransportError as e:
+                if audio_format is not None:
+                    # 已经产出过音频，无法再整段重来
+                    raise
+                logger.warning(f"Fish Speech 流式请求出错（{e!r}），本次退回整段合成")
+            if unsupported:
+                self._streaming_supported = False
+                logger.warning("Fish Speech 服务端不支持流式，之后直接整段合成")
+
+        async for item in super().stream_speech(text):
+            yield item
@@ -1,20 +1,83 @@
+import asyncio
+import hashlib
+import json
+import os
 import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
 
 import aiohttp
-import httpx
 from loguru import logger
 from tenacity import retry, stop_after_attempt
 
-from core.qconfig import cfg
+from core.audio import AudioFormat, parse_wav_header
+from core.const import (
+    GPT_SOVITS_API_V2_LANGUAGES,
+    GPT_SOVITS_API_V2_SPLIT_METHODS,
+    GPT_SOVITS_TRANSPORT_API_V2,
+    GRADIO_CACHE_PATH,
+)
+from core.qconfig import ConfigGroup, cfg
 
+from .alias import alias_matcher
 from .base import TTSService
 
+# (server_id, file path, size, mtime_ns)
+UploadKey = tuple[str, str, int, int]
+
+
+class GradioServerCache:
+    """
+    Per-server Gradio metadata persisted across app restarts: the
+    api_name -> fn_index map, the config hash it was built from, the server
+    identity and the model weights last applied on that server.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                self._data = {}
+        return self._data
+
+    def get(self, base_url: str) -> Dict[str, Any]:
+        return self._load().get(base_url, {})
+
+    def update(self, base_url: str, **fields: Any) -> None:
+        data = self._load()
+        data.setdefault(base_url, {}).update(fields)
+        try:
+            self.path.write_text(
+                json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8"
+            )
+        except OSError as e:
+            logger.warning(f"Failed to save gradio cache: {e}")
+
+
+gradio_server_cache = GradioServerCache(GRADIO_CACHE_PATH)
+
 
 class GradioClient:
     """
     Minimal Gradio client to talk to GPT-SoVITS WebUI following the behavior
     referenced in gpt-sovits-tts/tts.py and tts_client.py.
+
+    Uploaded reference files are memoized per server instance, so the same
+    reference audio is uploaded once instead of on every prediction.
+
+    The endpoint map is persisted in ``gradio_server_cache``: a new session
+    starts from the cached map and revalidates it against ``/config`` in the
+    background instead of blocking on it. The persisted weights are only
+    trusted once a fresh ``/config`` in this session has confirmed the server
+    identity (``app_id``); config refreshes and weight application are
+    serialised behind ``lock``.
     """
 
     def __init__(self, base_url: str, ssl_verify: bool = False, timeout: int = 300):
@@ -23,6 +86,21 @@ class GradioClient:
         self.timeout = aiohttp.ClientTimeout(total=timeout)
         self._session: Optional[aiohttp.ClientSession] = None
         self._fn_map: Dict[str, int] = {}
+        # Gradio assigns a new app_id on every launch; used to tell server restarts apart
+        self._server_id = ""
+        # Whether /config has been fetched in this session, and whether it
+        # carried an app_id that confirms the persisted server identity
+        self._config_loaded = False
+        self._server_confirmed = False
+        # Weights applied by this session, used when the server has no app_id
+        self._session_weights: Dict[str, str] = {}
+        # Serialises config refreshes and weight application
+        self.lock = asyncio.Lock()
+        # (server_id, path, size, mtime_ns) -> server-side uploaded path
+        self._upload_cache: Dict[UploadKey, str] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Called after a background refresh detects that the server restarted
+        self.on_server_changed: Optional[Callable[[], Awaitable[None]]] = None
 
     async def ensure(self):
         if self._session is None:
@@ -30,9 +108,20 @@ class GradioClient:
             self._session = aiohttp.ClientSession(
                 timeout=self.timeout, connector=connector
             )
-            await self._load_config()
+            cached = gradio_server_cache.get(self.base_url)
+            if cached.get("fn_map"):
+                self._fn_map = {k: int(v) for k, v in cached["fn_map"].items()}
+                self._server_id = str(cached.get("server_id") or self.base_url)
+                self._refresh_task = asyncio.create_task(self._refresh_config())
+            else:
+                await self._load_config()
 
-    async def _load_config(self):
+    async def _load_config(self) -> bool:
+        """Fetch ``/config``, rebuild the endpoint map and persist it
+
+        Returns:
+            True if the server identity changed since it was last seen
+        """
         assert self._session is not None
         url = self.base_url + "config"
         async with self._session.get(url) as resp:
@@ -40,14 +129,87 @@ class GradioClient:
             cfg = await resp.json()
         deps = cfg.get("dependencies") or []
         # Build api_name -> fn_index map
+        fn_map: Dict[str, int] = {}
         for i, dep in enumerate(deps):
             api_name = (dep or {}).get("api_name")
             if api_name:
-                self._fn_map[str(api_name).strip().lstrip("/")] = int(
+                fn_map[str(api_name).strip().lstrip("/")] = int(
                     (dep or {}).get("id", i)
                 )
+        config_hash = hashlib.sha1(
+            json.dumps([cfg.get("version"), sorted(fn_map.items())]).encode()
+        ).hexdigest()
+        # Without an app_id a restart cannot be told apart from the same server
+        server_id = str(cfg.get("app_id") or "")
+
+        cached = gradio_server_cache.get(self.base_url)
+        changed = bool(cached) and (
+            not server_id or cached.get("server_id") != server_id
+        )
+        self._fn_map = fn_map
+        self._server_id = server_id or self.base_url
+        self._config_loaded = True
+        self._server_confirmed = bool(server_id)
+        if server_id and changed:
+            self._session_weights.clear()
+        fields: Dict[str, Any] = {
+            "fn_map": fn_map,
+            "config_hash": config_hash,
+            "server_id": server_id,
+        }
+        if changed or cached.get("config_hash") != config_hash:
+            # Restarted, upgraded or unidentifiable server: loaded weights are unknown
+            fields["weights"] = {}
+        gradio_server_cache.update(self.base_url, **fields)
+        return changed
+
+    async def _refresh_config(self):
+        """Revalidate the cached endpoint map in the background"""
+        try:
+            async with self.lock:
+                if self._config_loaded:
+                    # Already revalidated by confirm_server()
+                    return
+                if await self._load_config() and self.on_server_changed is not None:
+                    logger.info("Gradio server restarted, reapplying state")
+                    await self.on_server_changed()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to refresh gradio config: {e}")
+
+    async def confirm_server(self) -> None:
+        """Fetch ``/config`` unless this session already confirmed the server
+
+        Must be called with ``lock`` held.
+        """
+        await self.ensure()
+        if not self._config_loaded:
+            await self._load_config()
+
+    @property
+    def applied_weights(self) -> Dict[str, str]:
+        """Weights last applied on this server (kind -> value)
+
+        The persisted record is only used once a fresh ``/config`` confirmed
+        the server's ``app_id``; otherwise only weights applied by this
+        session count, so a restarted server never inherits the weights
+        recorded for its predecessor.
+        """
+        if not self._server_confirmed:
+            return dict(self._session_weights)
+        return dict(gradio_server_cache.get(self.base_url).get("weights") or {})
+
+    def record_weights(self, kind: str, value: str) -> None:
+        self._session_weights[kind] = value
+        weights = dict(gradio_server_cache.get(self.base_url).get("weights") or {})
+        weights[kind] = value
+        gradio_server_cache.update(self.base_url, weights=weights)
 
     async def close(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
         if self._session is not None:
             s = self._session
             self._session = None
@@ -56,12 +218,22 @@ class GradioClient:
             except Exception:
                 pass
 
-    async def _upload_file(self, file_path: str) -> str:
+    async def _upload_file(self, file_path: str) -> tuple[str, UploadKey]:
+        """Upload a local file, reusing the server path of a previous upload
+
+        Returns:
+            (server-side path, cache key)
+        """
         assert self._session is not None
+        stat = await asyncio.to_thread(os.stat, file_path)
+        key: UploadKey = (self._server_id, file_path, stat.st_size, stat.st_mtime_ns)
+        uploaded = self._upload_cache.get(key)
+        if uploaded is not None:
+            return uploaded, key
+
         url = self.base_url + "upload"
         data = aiohttp.FormData()
-        with open(file_path, "rb") as f:
-            file_content = f.read()
+        file_content = await asyncio.to_thread(Path(file_path).read_bytes)
         data.add_field(
             "files",
             file_content,
@@ -72,10 +244,21 @@ class GradioClient:
             resp.raise_for_status()
             j = await resp.json()
             # returns list of uploaded paths
-            return j[0]
+            uploaded = j[0]
+        self._upload_cache[key] = uploaded
+        logger.debug(f"Uploaded {file_path} -> {uploaded}")
+        return uploaded, key
+
+    async def _process_inputs(
+        self, args: List[Any]
+    ) -> tuple[List[Any], List[UploadKey]]:
+        """Upload local files referenced by the arguments
 
-    async def _process_inputs(self, args: List[Any]) -> List[Any]:
+        Returns:
+            (processed arguments, cache keys of the uploads used)
+        """
         processed: List[Any] = []
+        upload_keys: List[UploadKey] = []
         for a in args:
             if (
                 isinstance(a, dict)
@@ -86,7 +269,8 @@ class GradioClient:
                     str(p).startswith("http://") or str(p).startswith("https://")
                 ):
                     # local path -> upload
-                    uploaded = await self._upload_file(p)
+                    uploaded, key = await self._upload_file(p)
+                    upload_keys.append(key)
                     processed.append(
                         {
                             "path": uploaded,
@@ -98,17 +282,16 @@ class GradioClient:
                     processed.append(a)
             else:
                 processed.append(a)
-        return processed
+        return processed, upload_keys
 
-    async def predict(self, api_name: str, *args: Any) -> Any:
-        await self.ensure()
+    async def _post_predict(self, api_name: str, data_args: List[Any]) -> Any:
         assert self._session is not None
         fn = self._fn_map.get(api_name.strip().lstrip("/"))
         if fn is None:
             raise RuntimeError(f"API '{api_name}' not found in gradio config")
         url = self.base_url + "api/predict/"
         data = {
-            "data": await self._process_inputs(list(args)),
+            "data": data_args,
             "fn_index": fn,
             "session_hash": str(int(time.time() * 1000)),
         }
@@ -121,29 +304,154 @@ class GradioClient:
                 raise RuntimeError(f"Gradio API error: {j.get('error')}")
             return j.get("data")
 
+    async def predict(self, api_name: str, *args: Any) -> Any:
+        await self.ensure()
+        if api_name.strip().lstrip("/") not in self._fn_map:
+            # The cached map may be stale, fetch the current one
+            await self._load_config()
+        data_args, upload_keys = await self._process_inputs(list(args))
+        try:
+            return await self._post_predict(api_name, data_args)
+        except RuntimeError:
+            if not upload_keys:
+                raise
+            # The server may have restarted or purged its upload dir: drop the
+            # cached paths, refresh the server identity and upload once more
+            logger.warning("Gradio predict failed with cached uploads, re-uploading")
+            for key in upload_keys:
+                self._upload_cache.pop(key, None)
+            async with self.lock:
+                if await self._load_config() and self.on_server_changed is not None:
+                    await self.on_server_changed()
+            data_args, _ = await self._process_inputs(list(args))
+            return await self._post_predict(api_name, data_args)
+
 
 class GPTSovitsService(TTSService):
-    """GPTSovits TTS适配器"""
+    """GPTSovits TTS适配器
+
+    支持两种传输方式（``cfg.gptSovitsTransport``）：
+
+    - ``gradio``: 调用 WebUI 的 Gradio 接口，服务端先把音频写成临时文件，
+      客户端再下载一次
+    - ``api_v2``: 调用 GPT-SoVITS 自带的 ``api_v2.py`` REST 接口，一次请求直接返回
+      音频，并支持流式返回
+    """
+
+    supports_rate = True
 
     def __init__(self) -> None:
-        self.client = GradioClient(cfg.gptSovitsApiUrl.value)
+        super().__init__(cfg.gptSovitsApiUrl.value)
+        self.client = GradioClient(self.api_url)
+        self.api_v2_url = cfg.gptSovitsApiV2Url.value.rstrip("/")
+        self._defaults = self._create_snapshot(
+            ConfigGroup.GPT_SOVITS_SERVICE, self._build_defaults
+        )
 
-    async def close(self):
+    @property
+    def use_api_v2(self) -> bool:
+        """是否使用 api_v2 REST 接口"""
+        return cfg.gptSovitsTransport.value == GPT_SOVITS_TRANSPORT_API_V2
+
+    async def close(self) -> None:
         await self.client.close()
+        await super().close()
 
     async def init(self):
+        if self.use_api_v2:
+            await self._init_api_v2()
+            return
+        self.client.on_server_changed = self._apply_gradio_weights_locked
         await self.client.ensure()
-        result = await self.client.predict(
-            "/change_sovits_weights",
-            cfg.gptSovitsSovitsModel.value,
-            cfg.gptSovitsTextLang.value,
-            cfg.gptSovitsTextLang.value,
-        )
-        logger.info(f"Changed SoVITS weights: {result}")
-        result = await self.client.predict(
-            "/change_gpt_weights", cfg.gptSovitsGptModel.value
+        await self._apply_gradio_weights()
+
+    async def warm_up(self) -> None:
+        """连接服务端并加载配置的模型权重"""
+        await self.init()
+
+    async def _apply_gradio_weights(self) -> None:
+        """切换 WebUI 模型权重，服务端已加载相同权重时跳过
+
+        与后台的配置刷新共用 ``client.lock``，并先确认服务端身份：
+        只有本次会话获取的 ``/config`` 证实还是同一个服务端实例时，才信任持久化的权重记录。
+        """
+        async with self.client.lock:
+            await self.client.confirm_server()
+            await self._apply_gradio_weights_locked()
+
+    async def _apply_gradio_weights_locked(self) -> None:
+        """切换模型权重（调用方已持有 ``client.lock``）"""
+        applied = self.client.applied_weights
+        sovits_model = cfg.gptSovitsSovitsModel.value
+        text_lang = cfg.gptSovitsTextLang.value
+        sovits_key = f"{sovits_model}|{text_lang}"
+        if applied.get("sovits") != sovits_key:
+            result = await self.client.predict(
+                "/change_sovits_weights", sovits_model, text_lang, text_lang
+            )
+            self.client.record_weights("sovits", sovits_key)
+            logger.info(f"Changed SoVITS weights: {result}")
+        else:
+            logger.debug(f"SoVITS 权重已加载，跳过切换: {sovits_model}")
+
+        gpt_model = cfg.gptSovitsGptModel.value
+        if applied.get("gpt") != gpt_model:
+            result = await self.client.predict("/change_gpt_weights", gpt_model)
+            self.client.record_weights("gpt", gpt_model)
+            logger.info(f"Changed GPT weights: {result}")
+        else:
+            logger.debug(f"GPT 权重已加载，跳过切换: {gpt_model}")
+
+    async def _init_api_v2(self) -> None:
+        """通过 api_v2 切换模型权重，未配置的权重保持服务端当前值"""
+        client = self._get_client()
+        for endpoint, weights_path in (
+            ("set_sovits_weights", cfg.gptSovitsSovitsModel.value),
+            ("set_gpt_weights", cfg.gptSovitsGptModel.value),
+        ):
+            if not weights_path:
+                continue
+            response = await client.get(
+                f"{self.api_v2_url}/{endpoint}",
+                params={"weights_path": weights_path},
+            )
+            response.raise_for_status()
+            logger.info(f"api_v2 {endpoint}: {weights_path}")
+
+    def _build_defaults(self) -> MappingProxyType:
+        """读取合成参数的配置值，作为快照在配置变更前复用"""
+        return MappingProxyType(
+            {
+                "text_lang": cfg.gptSovitsTextLang.value,
+                "ref_audio_path": cfg.gptSovitsRefAudioPath.value,
+                "ref_text": cfg.gptSovitsRefText.value,
+                "ref_text_lang": cfg.gptSovitsRefTextLang.value,
+                "top_k": cfg.gptSovitsTopK.value,
+                "top_p": cfg.gptSovitsTopP.value,
+                "temperature": cfg.gptSovitsTemperature.value,
+                "text_split_method": cfg.gptSovitsTextSplitMethod.value,
+                "speed_factor": cfg.gptSovitsSpeedFactor.value,
+                "ref_text_free": cfg.gptSovitsRefTextFree.value,
+                "sample_steps": cfg.gptSovitsSampleSteps.value,
+                "super_sampling": cfg.gptSovitsSuperSampling.value,
+                "pause_seconds": cfg.gptSovitsPauseSeconds.value,
+            }
         )
-        logger.info(f"Changed GPT weights: {result}")
+
+    def _rate_overrides(self, rate: float) -> dict[str, Any]:
+        """语速倍率乘到 ``speed_factor`` 上，不超出配置允许的范围"""
+        if rate == 1:
+            return {}
+        low, high = cfg.gptSovitsSpeedFactor.range
+        speed_factor = self._defaults.value["speed_factor"] * rate
+        return {"speed_factor": min(high, max(low, speed_factor))}
+
+    def _resolve_params(self, **overrides: Any) -> dict[str, Any]:
+        """合并调用参数与配置快照，参数为 None 时使用配置值"""
+        return {
+            key: value if overrides.get(key) is None else overrides[key]
+            for key, value in self._defaults.value.items()
+        }
 
     @retry(stop=stop_after_attempt(3))
     async def text_to_speech(
@@ -185,34 +493,34 @@ class GPTSovitsService(TTSService):
         Returns:
             bytes: 音频数据（WAV格式）
         """
-        # 从配置中读取默认值（确保每次调用都使用最新配置）
-        if text_lang is None:
-            text_lang = cfg.gptSovitsTextLang.value
-        if ref_audio_path is None:
-            ref_audio_path = cfg.gptSovitsRefAudioPath.value
-        if ref_text is None:
-            ref_text = cfg.gptSovitsRefText.value
-        if ref_text_lang is None:
-            ref_text_lang = cfg.gptSovitsRefTextLang.value
-        if top_k is None:
-            top_k = cfg.gptSovitsTopK.value
-        if top_p is None:
-            top_p = cfg.gptSovitsTopP.value
-        if temperature is None:
-            temperature = cfg.gptSovitsTemperature.value
-        if text_split_method is None:
-            text_split_method = cfg.gptSovitsTextSplitMethod.value
-        if speed_factor is None:
-            speed_factor = cfg.gptSovitsSpeedFactor.value
-        if ref_text_free is None:
-            ref_text_free = cfg.gptSovitsRefTextFree.value
-        if sample_steps is None:
-            sample_steps = cfg.gptSovitsSampleSteps.value
-        if super_sampling is None:
-            super_sampling = cfg.gptSovitsSuperSampling.value
-        if pause_seconds is None:
-            pause_seconds = cfg.gptSovitsPauseSeconds.value
+        params = self._resolve_params(
+            text_lang=text_lang,
+            ref_audio_path=ref_audio_path,
+            ref_text=ref_text,
+            ref_text_lang=ref_text_lang,
+            top_k=top_k,
+            top_p=top_p,
+            temperature=temperature,
+            text_split_method=text_split_method,
+            speed_factor=speed_factor,
+            ref_text_free=ref_text_free,
+            sample_steps=sample_steps,
+            super_sampling=super_sampling,
+            pause_seconds=pause_seconds,
+        )
+        text = alias_matcher.substitute(text)
+        if self.use_api_v2:
+            response = await self._get_client().post(
+                f"{self.api_v2_url}/tts",
+                json=self._build_api_v2_payload(text, params, streaming=False),
+            )
+            response.raise_for_status()
+            return response.content
+        return await self._text_to_speech_gradio(text, params)
 
+    async def _text_to_speech_gradio(self, text: str, params: dict[str, Any]) -> bytes:
+        """通过 Gradio 接口合成：先拿到服务端文件地址，再下载音频"""
+        ref_audio_path = params["ref_audio_path"]
         ref_audio_dict = {
             "path": ref_audio_path,
             "orig_name": ref_audio_path.split("/")[-1],
@@ -223,26 +531,106 @@ class GPTSovitsService(TTSService):
         data = await self.client.predict(
             "/get_tts_wav",
             ref_audio_dict,
-            ref_text,
-            ref_text_lang,
+            params["ref_text"],
+            params["ref_text_lang"],
             text,
-            text_lang,
-            text_split_method,
-            top_k,
-            top_p,
-            temperature,
-            ref_text_free,
-            speed_factor,
+            params["text_lang"],
+            params["text_split_method"],
+            params["top_k"],
+            params["top_p"],
+            params["temperature"],
+            params["ref_text_free"],
+            params["speed_factor"],
             is_freeze,
             inp_refs,
-            sample_steps,
-            super_sampling,
-            pause_seconds,
+            params["sample_steps"],
+            params["super_sampling"],
+            params["pause_seconds"],
         )
 
-        # 读取返回的音频文件
+        # 读取返回的音频文件（复用长连接，避免每次下载都重新建连）
         audio_path = data[0].get("url")
-        async with httpx.AsyncClient() as client:
-            response = await client.get(audio_path)
+        response = await self._get_client().get(audio_path)
+        response.raise_for_status()
+        return response.content
+
+    @staticmethod
+    def _build_api_v2_payload(
+        text: str, params: dict[str, Any], streaming: bool
+    ) -> dict[str, Any]:
+        """构造 api_v2 ``/tts`` 请求体
+
+        api_v2 使用语言代码和 ``cut0``~``cut5`` 表示切分方式，这里从 WebUI 的选项映射过去；
+        ``ref_audio_path`` 是服务端可访问的路径，无需上传。
+        """
+        return {
+            "text": text,
+            "text_lang": GPT_SOVITS_API_V2_LANGUAGES[params["text_lang"]],
+            "ref_audio_path": params["ref_audio_path"],
+            "prompt_text": "" if params["ref_text_free"] else params["ref_text"],
+            "prompt_lang": GPT_SOVITS_API_V2_LANGUAGES[params["ref_text_lang"]],
+            "top_k": params["top_k"],
+            "top_p": params["top_p"],
+            "temperature": params["temperature"],
+            "text_split_method": GPT_SOVITS_API_V2_SPLIT_METHODS[
+                params["text_split_method"]
+            ],
+            "speed_factor": params["speed_factor"],
+            "fragment_interval": params["pause_seconds"],
+            "sample_steps": params["sample_steps"],
+            "super_sampling": params["super_sampling"],
+            "media_type": "wav",
+            "streaming_mode": streaming,
+        }
+
+    @property
+    def max_trim(self) -> float:
+        return cfg.gptSovitsMaxTrim.value / 1000
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.use_api_v2 and cfg.gptSovitsStreamOn.value
+
+    async def stream_speech(
+        self, text: str, rate: float = 1.0
+    ) -> AsyncIterator[tuple[AudioFormat, bytes | memoryview]]:
+        """流式合成，按到达顺序逐块产出 PCM 数据
+
+        仅 api_v2 支持流式：服务端先返回 WAV 文件头，随后分段返回 PCM。
+        Gradio 传输方式或关闭流式时退化为整段合成后一次性产出。
+
+        Args:
+            text: 要转换的文本
+            rate: 相对配置语速的倍率
+
+        Yields:
+            tuple[AudioFormat, bytes | memoryview]: 音频格式和 PCM 音频块
+        """
+        if not self.supports_streaming:
+            async for item in super().stream_speech(text, rate):
+                yield item
+            return
+
+        text = alias_matcher.substitute(text)
+        params = self._resolve_params(**self._rate_overrides(rate))
+        payload = self._build_api_v2_payload(text, params, streaming=True)
+        client = self._get_client()
+        async with client.stream(
+            "POST", f"{self.api_v2_url}/tts", json=payload
+        ) as response:
+            if not response.is_success:
+                await response.aread()
             response.raise_for_status()
-            return response.content
+            header = b""
+            audio_format: AudioFormat | None = None
+            async for chunk in response.aiter_bytes():
+                if audio_format is not None:
+                    yield audio_format, chunk
+                    continue
+                header += chunk
+                parsed = parse_wav_header(header)
+                if parsed is None:
+                    continue
+                audio_format, offset = parsed
+                yield audio_format, header[offset:]
+        logger.info(f"GPT-SoVITS 流式 TTS 成功: {text}")
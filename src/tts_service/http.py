@@ -0,0 +1,32 @@
+"""TTS 后端共享的 HTTP 连接池"""
+
+from importlib.util import find_spec
+
+import httpx
+
+# 每个后端一个长连接池：本地推理服务一般是单实例，不需要太多并发连接
+HTTP_LIMITS = httpx.Limits(
+    max_connections=8,
+    max_keepalive_connections=4,
+    keepalive_expiry=60.0,
+)
+
+# HTTP/2 依赖 h2（随 httpx[http2] 安装），从源码运行且缺少 h2 时退回 HTTP/1.1
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+
+def create_http_client(timeout: float, http2: bool = False) -> httpx.AsyncClient:
+    """创建带连接池和 keep-alive 的 HTTP 客户端
+
+    Args:
+        timeout: 请求超时时间（秒）
+        http2: 是否尝试启用 HTTP/2（仅对 HTTPS 远端有意义）
+
+    Returns:
+        httpx.AsyncClient: 长连接客户端，由调用方负责关闭
+    """
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=HTTP_LIMITS,
+        http2=http2 and HTTP2_AVAILABLE,
+    )
@@ -1,4 +1,9 @@
 import asyncio
+import binascii
+import json
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -6,7 +11,9 @@ import httpx
 from loguru import logger
 from tenacity import retry, retry_if_exception_type, stop_after_attempt
 
-from core.qconfig import cfg
+from core.audio import AudioClip, AudioFormat
+from core.const import MINIMAX_OUTPUT_HEX, MINIMAX_OUTPUT_URL
+from core.qconfig import ConfigGroup, cfg
 from models.minimax import (
     AudioSetting,
     BaseResp,
@@ -14,37 +21,117 @@ from models.minimax import (
     FileUploadResponse,
     MinimaxAPIError,
     MinimaxTTSRequest,
-    MinimaxTTSResponse,
     VoiceCloneRequest,
     VoiceCloneResponse,
     VoiceListResponse,
     VoiceSetting,
 )
 
+from .alias import alias_matcher
 from .base import TTSService
 
 
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+@dataclass(frozen=True, slots=True)
+class MinimaxRequestTemplate:
+    """MiniMax 请求模板：预先序列化的请求体（不含文本）和请求头"""
+
+    headers: dict[str, str]
+    # 请求方式 -> 缺少结尾 "}" 的 JSON 请求体
+    bodies: dict[str, bytes]
+    # 非流式请求的音频返回方式（hex/url）
+    output_format: str
+
+
+# 响应中 audio 字段值的起始位置，hex 字符串不含转义，到下一个引号为止
+_AUDIO_FIELD = re.compile(rb'"audio"\s*:\s*"')
+
+# 每次解码的 hex 字符数（偶数）。binascii.unhexlify 解码期间一直持有 GIL，
+# 并不能与事件循环并行；分块只是让解码线程在块与块之间有机会把 GIL 交还给事件循环，
+# 单次最多卡住事件循环一个分块的解码时间
+_HEX_CHUNK = 1 << 20
+
+
+def split_audio_field(content: bytes) -> tuple[dict[str, Any], memoryview]:
+    """从响应体中切出 audio 字段
+
+    几 MB 的 hex 字符串不经过 JSON 解析和 pydantic 校验，
+    只有去掉 audio 值之后剩下的几百字节按 JSON 解析。
+
+    Args:
+        content: 响应体
+
+    Returns:
+        (其余字段, audio 字段的原始字节视图)，没有 audio 字段时视图为空
+    """
+    match = _AUDIO_FIELD.search(content)
+    if match is None:
+        return (json.loads(content) if content else {}), memoryview(b"")
+    start = match.end()
+    end = content.index(b'"', start)
+    result = json.loads(content[:start] + content[end:])
+    return result, memoryview(content)[start:end]
+
+
+def decode_hex_audio(data: bytes | memoryview) -> bytearray:
+    """把 hex 编码的音频分块解码到预分配的缓冲区
+
+    每块解码期间持有 GIL，放到工作线程执行时事件循环只能在块与块之间运行。
+
+    Raises:
+        binascii.Error: 不是合法的 hex 字符串
+    """
+    if len(data) % 2:
+        raise binascii.Error("Odd-length hex audio")
+    out = bytearray(len(data) // 2)
+    view = memoryview(out)
+    for start in range(0, len(data), _HEX_CHUNK):
+        chunk = data[start : start + _HEX_CHUNK]
+        view[start // 2 : (start + len(chunk)) // 2] = binascii.unhexlify(chunk)
+    return out
+
+
 class MinimaxService(TTSService):
     """Minimax TTS适配器"""
 
+    # MiniMax 为远端 HTTPS 服务，允许时使用 HTTP/2 多路复用
+    http_timeout = 60.0
+    http2 = True
+    supports_rate = True
+
+    # 请求 PCM 时的输出格式（与请求中的 audio_setting 保持一致）
+    stream_format = AudioFormat(sample_rate=32000, channels=1, sample_width=2)
+
+    # 请求方式 -> (音频格式, 是否流式)
+    # wav 供需要完整文件的调用方（试听），pcm 供播报直接使用，stream 为流式 PCM
+    _REQUEST_MODES = {
+        "wav": ("wav", False),
+        "pcm": ("pcm", False),
+        "stream": ("pcm", True),
+    }
+
     def __init__(self) -> None:
         """初始化Minimax适配器"""
-        self.api_url = "https://api.minimax.io/v1/t2a_v2"
-        self._client: httpx.AsyncClient | None = None
-
-    def _get_client(self) -> httpx.AsyncClient:
-        """获取或创建 HTTP 客户端"""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                timeout=60.0,
-            )
-        return self._client
+        super().__init__("https://api.minimax.io/v1/t2a_v2")
+        self._template = self._create_snapshot(
+            ConfigGroup.MINIMAX_SERVICE, self._build_template
+        )
 
-    async def close(self) -> None:
-        """关闭 HTTP 客户端"""
-        if self._client is not None and not self._client.is_closed:
-            await self._client.aclose()
-            self._client = None
+    @staticmethod
+    def _check_base_resp(result: dict[str, Any]) -> None:
+        """检查 MiniMax 业务错误码
+
+        Raises:
+            MinimaxAPIError: MiniMax 业务错误码非 0
+        """
+        base_resp_data = result.get("base_resp")
+        if base_resp_data:
+            base_resp = BaseResp.model_validate(base_resp_data)
+            if base_resp.status_code != 0:
+                raise MinimaxAPIError(base_resp.status_code, base_resp.status_msg)
 
     def _parse_response(self, response: httpx.Response) -> dict[str, Any]:
         """统一处理 MiniMax API 响应
@@ -66,13 +153,129 @@ class MinimaxService(TTSService):
         if not response.content:
             return {}
         result = response.json()
-        base_resp_data = result.get("base_resp")
-        if base_resp_data:
-            base_resp = BaseResp.model_validate(base_resp_data)
-            if base_resp.status_code != 0:
-                raise MinimaxAPIError(base_resp.status_code, base_resp.status_msg)
+        self._check_base_resp(result)
         return result
 
+    @classmethod
+    def _read_audio(cls, content: bytes, hex_encoded: bool) -> bytes | str:
+        """从非流式响应中取出音频（在工作线程中调用）
+
+        Args:
+            content: 响应体
+            hex_encoded: audio 字段为 hex 编码的音频；否则为下载地址
+
+        Raises:
+            MinimaxAPIError: MiniMax 业务错误码非 0
+            ValueError: 响应中没有音频
+        """
+        result, audio = split_audio_field(content)
+        cls._check_base_resp(result)
+        if not audio:
+            raise ValueError(f"MiniMax 响应中没有音频: {result}")
+        if hex_encoded:
+            return decode_hex_audio(audio)
+        # 下载地址可能带 JSON 转义（如 \u0026），按 JSON 字符串还原
+        return json.loads(b'"' + audio.tobytes() + b'"')
+
+    def _build_template(
+        self,
+        api_key: str | None = None,
+        voice_id: str | None = None,
+        model: str | None = None,
+        speed: float | None = None,
+        vol: float | None = None,
+        pitch: int | None = None,
+        output_format: str | None = None,
+    ) -> MinimaxRequestTemplate:
+        """构造请求模板，参数为 None 时从配置读取
+
+        请求体按 pydantic 模型校验一次后序列化成 JSON 前缀，之后每次请求只需拼接文本。
+
+        Raises:
+            ValueError: API Key 为空
+        """
+        if api_key is None:
+            api_key = cfg.minimaxApiKey.value
+        if voice_id is None:
+            voice_id = cfg.minimaxVoiceId.value
+        if model is None:
+            model = cfg.minimaxModel.value
+        if speed is None:
+            speed = cfg.minimaxSpeed.value
+        if vol is None:
+            vol = cfg.minimaxVol.value
+        if pitch is None:
+            pitch = cfg.minimaxPitch.value
+        if output_format is None:
+            output_format = cfg.minimaxOutputFormat.value
+        if not api_key:
+            raise ValueError("API Key is required")
+        api_key = api_key.strip()  # 防呆设计，真的有人会加上空格或者回车
+
+        bodies = {}
+        for mode, (audio_format, stream) in self._REQUEST_MODES.items():
+            request = MinimaxTTSRequest(
+                model=model,
+                text="",
+                stream=stream,
+                # 流式响应只支持 hex
+                output_format=MINIMAX_OUTPUT_HEX if stream else output_format,
+                voice_setting=VoiceSetting(
+                    voice_id=voice_id,
+                    speed=speed,
+                    vol=vol,
+                    pitch=pitch,
+                ),
+                audio_setting=AudioSetting(
+                    format=audio_format,
+                    sample_rate=self.stream_format.sample_rate,
+                    bitrate=128000,
+                    channel=self.stream_format.channels,
+                ),
+            )
+            body = request.model_dump(exclude={"text"}, exclude_none=True)
+            # 去掉末尾的 "}"，留给 _build_request 拼接文本
+            bodies[mode] = _dumps(body)[:-1]
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        return MinimaxRequestTemplate(
+            headers=headers, bodies=bodies, output_format=output_format
+        )
+
+    def _rate_overrides(self, rate: float) -> dict[str, Any]:
+        """语速倍率乘到 ``speed`` 上，不超出 MiniMax 允许的范围"""
+        if rate == 1:
+            return {}
+        low, high = cfg.minimaxSpeed.range
+        return {"speed": min(high, max(low, cfg.minimaxSpeed.value * rate))}
+
+    def _build_request(
+        self, text: str, mode: str, **overrides: Any
+    ) -> tuple[bytes, MinimaxRequestTemplate]:
+        """构造 TTS 请求体，同时返回所用的模板（请求头、音频返回方式）
+
+        没有显式参数时直接使用配置快照中的模板，只注入文本和命中的别名。
+
+        Args:
+            text: 要转换的文本
+            mode: 请求方式，见 ``_REQUEST_MODES``
+            **overrides: 覆盖配置的参数，见 ``_build_template``
+        """
+        if any(v is not None for v in overrides.values()):
+            template = self._build_template(**overrides)
+        else:
+            template = self._template.value
+        parts = [template.bodies[mode], b',"text":', _dumps(text)]
+        # 只发送文本中实际出现的别名，词典再大请求体也保持很小
+        aliases = alias_matcher.matched(text)
+        if aliases:
+            tone = [f"{k}/{v}" for k, v in aliases.items()]
+            parts += [b',"pronunciation_dict":', _dumps({"tone": tone})]
+        parts.append(b"}")
+        return b"".join(parts), template
+
     @retry(
         stop=stop_after_attempt(3),
         retry=retry_if_exception_type(httpx.ConnectError),
@@ -107,48 +310,36 @@ class MinimaxService(TTSService):
             httpx.HTTPStatusError: HTTP请求失败
             MinimaxAPIError: MiniMax 业务错误（鉴权失败、限流、非法字符等）
         """
-        # 从配置中读取默认值（确保每次调用都使用最新配置）
-        if api_key is None:
-            api_key = cfg.minimaxApiKey.value
-        if voice_id is None:
-            voice_id = cfg.minimaxVoiceId.value
-        if model is None:
-            model = cfg.minimaxModel.value
-        if speed is None:
-            speed = cfg.minimaxSpeed.value
-        if vol is None:
-            vol = cfg.minimaxVol.value
-        if pitch is None:
-            pitch = cfg.minimaxPitch.value
-        if not api_key:
-            raise ValueError("API Key is required")
-        api_key = api_key.strip()  # 防呆设计，真的有人会加上空格或者回车
-        alias_texts = []
-        if cfg.aliasDict.value:
-            for k, v in cfg.aliasDict.value.items():
-                alias_texts.append(f"{k}/{v}")
-
-        request = MinimaxTTSRequest(
+        return await self._request_audio(
+            text,
+            mode="wav",
+            api_key=api_key,
+            voice_id=voice_id,
             model=model,
-            text=text,
-            voice_setting=VoiceSetting(
-                voice_id=voice_id,
-                speed=speed,
-                vol=vol,
-                pitch=pitch,
-            ),
-            pronunciation_dict={"tone": alias_texts},
-            audio_setting=AudioSetting(
-                format="wav",  # 使用 WAV 格式，避免需要 ffmpeg 解码
-                sample_rate=32000,
-                bitrate=128000,
-                channel=1,
-            ),
+            speed=speed,
+            vol=vol,
+            pitch=pitch,
         )
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+
+    @retry(
+        stop=stop_after_attempt(3),
+        retry=retry_if_exception_type(httpx.ConnectError),
+        reraise=True,
+    )
+    async def synthesize(self, text: str, rate: float = 1.0) -> AudioClip:
+        """直接请求裸 PCM，省去 WAV 封装和解析"""
+        audio = await self._request_audio(text, "pcm", **self._rate_overrides(rate))
+        return AudioClip(self.stream_format, audio)
+
+    async def _request_audio(self, text: str, mode: str, **overrides: Any) -> bytes:
+        """发送非流式合成请求并取回音频
+
+        Args:
+            text: 要转换的文本
+            mode: 请求方式，见 ``_REQUEST_MODES``
+            **overrides: 覆盖配置的参数，见 ``_build_template``
+        """
+        body, template = self._build_request(text, mode, **overrides)
 
         logger.debug(f"Minimax TTS 请求开始: {text[:50]}...")
 
@@ -156,20 +347,92 @@ class MinimaxService(TTSService):
         logger.debug(f"发送 POST 请求到: {self.api_url}")
 
         response = await client.post(
-            self.api_url, json=request.model_dump(), headers=headers
+            self.api_url, content=body, headers=template.headers
         )
         logger.debug(f"收到响应，状态码: {response.status_code}")
+        response.raise_for_status()
 
-        result = self._parse_response(response)
-        tts_resp = MinimaxTTSResponse.model_validate(result)
-
-        audio_bytes = bytes.fromhex(tts_resp.data.audio)
+        is_url = template.output_format == MINIMAX_OUTPUT_URL
+        # 解析和 hex 解码放到工作线程，长音频不会卡住界面和其他协程
+        audio = await asyncio.to_thread(self._read_audio, response.content, not is_url)
+        if is_url:
+            audio_response = await client.get(audio)
+            audio_response.raise_for_status()
+            audio_bytes = audio_response.content
+        else:
+            audio_bytes = audio
         logger.info(
             f"Minimax TTS 成功: {text[:50]}... (音频大小: {len(audio_bytes)} 字节)"
         )
 
         return audio_bytes
 
+    @property
+    def max_trim(self) -> float:
+        return cfg.minimaxMaxTrim.value / 1000
+
+    @property
+    def supports_streaming(self) -> bool:
+        return cfg.minimaxStreamOn.value
+
+    async def stream_speech(
+        self, text: str, rate: float = 1.0
+    ) -> AsyncIterator[tuple[AudioFormat, bytes | memoryview]]:
+        """流式合成，按到达顺序逐块产出 PCM 数据
+
+        请求 ``stream=True`` 且 ``format="pcm"``，MiniMax 以 SSE 形式返回
+        ``data: {...}`` 事件，每个事件携带一段 hex 编码的音频。
+        最后一个事件（``status == 2``）是完整音频的汇总，需跳过以免重复播放。
+
+        Args:
+            text: 要转换的文本
+            rate: 相对配置语速的倍率
+
+        Yields:
+            tuple[AudioFormat, bytes | memoryview]: 音频格式和 16-bit PCM 音频块
+
+        Raises:
+            httpx.HTTPStatusError: HTTP请求失败
+            MinimaxAPIError: MiniMax 业务错误（鉴权失败、限流、非法字符等）
+        """
+        if not self.supports_streaming:
+            async for item in super().stream_speech(text, rate):
+                yield item
+            return
+
+        body, template = self._build_request(
+            text, mode="stream", **self._rate_overrides(rate)
+        )
+        client = self._get_client()
+        logger.debug(f"Minimax 流式 TTS 请求开始: {text[:50]}...")
+
+        total = 0
+        async with client.stream(
+            "POST", self.api_url, content=body, headers=template.headers
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                line = line.strip()
+                if not line:
+                    continue
+                if not line.startswith("data:"):
+                    # 非 SSE 响应，通常是业务错误，整体按 JSON 解析
+                    if line.startswith("{"):
+                        self._check_base_resp(json.loads(line))
+                    continue
+                event = json.loads(line[5:])
+                self._check_base_resp(event)
+                data = event.get("data") or {}
+                if data.get("status") == 2:
+                    break
+                audio_hex = data.get("audio")
+                if audio_hex:
+                    chunk = bytes.fromhex(audio_hex)
+                    total += len(chunk)
+                    yield self.stream_format, chunk
+
+        logger.info(f"Minimax 流式 TTS 成功: {text[:50]}... (音频大小: {total} 字节)")
+
     async def get_voice_list(self, api_key: str | None = None) -> VoiceListResponse:
         """获取音色列表
 
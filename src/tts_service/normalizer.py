@@ -0,0 +1,116 @@
+"""播报文本规范化
+
+在合成前压缩弹幕里常见的无意义内容，减少 TTS 调用量和播报时长：
+
+- 连续重复的字符或短语（如“哈哈哈哈哈哈”“awsl awsl awsl”）压缩到上限次数
+- 表情代码（如 ``[dog]``）去除或只读出名称
+- 链接替换为“链接”
+- 过长的刷屏文本在标点处截断
+"""
+
+import re
+from collections.abc import Iterable
+
+from core.qconfig import EmoticonMode, cfg
+
+# 链接
+_URL_PATTERN = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+# 单字符重复，如 “哈哈哈哈哈”。数字不压缩，“10000” 这类金额、数量必须原样读出
+_CHAR_REPEAT_PATTERN = re.compile(r"(\D)\1+")
+# 2~4 字短语重复，如 “awslawslawsl”“好耶好耶好耶好耶”，同样不含数字
+_PHRASE_REPEAT_PATTERN = re.compile(r"(\D{2,4}?)\1+")
+# B站表情代码，如 “[dog]”“[热词系列_知识增加]”
+_EMOTICON_PATTERN = re.compile(r"\[([^\[\]]{1,20})\]")
+# 连续空白
+_SPACE_PATTERN = re.compile(r"\s+")
+# 截断时优先停在这些标点之后
+_BREAK_CHARS = "，。！？；、,.!?; "
+# 截断后缀，TTS 会读成一个停顿
+_TRUNCATE_SUFFIX = "…"
+
+
+class TextNormalizer:
+    """播报文本规范化器
+
+    每次调用实时读取配置，配置项只有几个，不需要缓存。
+    """
+
+    def normalize_message(
+        self,
+        message: str,
+        emoticons: Iterable[str] = (),
+        is_image: bool = False,
+    ) -> str:
+        """规范化一条用户消息（弹幕、醒目留言内容）
+
+        Args:
+            message: 原始消息
+            emoticons: 消息中出现的表情代码（``DanmuMessage.emotion`` 的键）
+            is_image: 是否为图片表情弹幕（``DanmuMessage.pic_emoticon`` 非空）
+
+        Returns:
+            str: 规范化后的消息；返回空字符串表示不需要播报
+        """
+        if not cfg.normalizeOn.value:
+            return message
+        if is_image and cfg.normalizeSkipImageOn.value:
+            return ""
+
+        text = self._replace_emoticons(message, emoticons)
+        text = _URL_PATTERN.sub("链接", text)
+        text = self.compress_repeats(text, cfg.normalizeMaxRepeat.value)
+        text = _SPACE_PATTERN.sub(" ", text).strip()
+        return self.truncate(text, cfg.normalizeMaxLength.value)
+
+    @staticmethod
+    def _replace_emoticons(message: str, emoticons: Iterable[str]) -> str:
+        """去除表情代码，或只保留表情名称"""
+        if cfg.normalizeEmoticonMode.value == EmoticonMode.NAME:
+            replace = r"\1"
+        else:
+            replace = ""
+        text = message
+        for code in emoticons:
+            # 表情键就是弹幕里的原文，如 “[dog]”
+            text = text.replace(code, _EMOTICON_PATTERN.sub(replace, code))
+        # 未随消息下发的表情代码（如热词表情）按同样规则处理
+        return _EMOTICON_PATTERN.sub(replace, text)
+
+    @staticmethod
+    def compress_repeats(text: str, max_repeat: int) -> str:
+        """把连续重复超过 ``max_repeat`` 次的字符或短语压缩到 ``max_repeat`` 次
+
+        含数字的重复不压缩，金额、数量原样保留。
+        """
+        max_repeat = max(1, int(max_repeat))
+
+        def compress(m: re.Match[str]) -> str:
+            unit = m.group(1)
+            return unit * min(len(m.group(0)) // len(unit), max_repeat)
+
+        text = _CHAR_REPEAT_PATTERN.sub(compress, text)
+        return _PHRASE_REPEAT_PATTERN.sub(compress, text)
+
+    @staticmethod
+    def truncate(text: str, max_length: int) -> str:
+        """超过 ``max_length`` 时截断，尽量停在标点处"""
+        max_length = int(max_length)
+        if len(text) <= max_length:
+            return text
+        head = text[:max_length]
+        # 只在后 30% 的范围内找标点，避免截得太短
+        floor = int(max_length * 0.7)
+        for i in range(len(head) - 1, floor - 1, -1):
+            if head[i] in _BREAK_CHARS:
+                head = head[:i]
+                break
+        return head.rstrip(_BREAK_CHARS) + _TRUNCATE_SUFFIX
+
+    @staticmethod
+    def cache_key(text: str) -> str:
+        """播报文本对应的缓存键：合并空白，使只差空格的文本共享音频"""
+        return _SPACE_PATTERN.sub(" ", text).strip()
+
+
+# 全局文本规范化器
+text_normalizer = TextNormalizer()
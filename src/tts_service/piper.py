@@ -1,17 +1,52 @@
-import httpx
+from typing import Any
+
 from loguru import logger
 
-from core.qconfig import cfg
+from core.qconfig import ConfigGroup, cfg
 
+from .alias import alias_matcher
 from .base import TTSService
 
 
 class PiperService(TTSService):
     """Piper TTS 适配器"""
 
+    supports_rate = True
+
     def __init__(self) -> None:
         """初始化 Piper 适配器"""
-        self.api_url = cfg.piperApiUrl.value
+        super().__init__(cfg.piperApiUrl.value)
+        self._params = self._create_snapshot(
+            ConfigGroup.PIPER_SERVICE, self._build_params
+        )
+
+    @staticmethod
+    def _filter_params(params: dict[str, Any]) -> dict[str, Any]:
+        """过滤值为 None 或为空的参数"""
+        return {k: v for k, v in params.items() if v}
+
+    def _build_params(self) -> dict[str, Any]:
+        """读取配置中的请求参数（不含文本），作为快照在配置变更前复用"""
+        return self._filter_params(
+            {
+                "voice": cfg.piperVoice.value,
+                "speaker": cfg.piperSpeaker.value,
+                "speaker_id": cfg.piperSpeakerId.value,
+                "length_scale": cfg.piperLengthScale.value,
+                "noise_scale": cfg.piperNoiseScale.value,
+                "noise_w_scale": cfg.piperNoiseWScale.value,
+            }
+        )
+
+    @property
+    def max_trim(self) -> float:
+        return cfg.piperMaxTrim.value / 1000
+
+    def _rate_overrides(self, rate: float) -> dict[str, Any]:
+        """``length_scale`` 是时长倍数，语速加快时相应缩短"""
+        if rate == 1:
+            return {}
+        return {"length_scale": (cfg.piperLengthScale.value or 1.0) / rate}
 
     async def text_to_speech(
         self,
@@ -41,36 +76,29 @@ class PiperService(TTSService):
         Raises:
             httpx.HTTPStatusError: HTTP请求失败
         """
-        if voice is None:
-            voice = cfg.piperVoice.value
-        if speaker is None:
-            speaker = cfg.piperSpeaker.value
-        if speaker_id is None:
-            speaker_id = cfg.piperSpeakerId.value
-        if length_scale is None:
-            length_scale = cfg.piperLengthScale.value
-        if noise_scale is None:
-            noise_scale = cfg.piperNoiseScale.value
-        if noise_w_scale is None:
-            noise_w_scale = cfg.piperNoiseWScale.value
-
-        # 准备请求数据, 过滤值为 None 或为空 的参数
-        data = {
-            k: v for k, v in {
-                "text": text,
-                "voice": voice,
-                "speaker": speaker,
-                "speaker_id": speaker_id,
-                "length_scale": length_scale,
-                "noise_scale": noise_scale,
-                "noise_w_scale": noise_w_scale
-            }.items() if v 
+        overrides = {
+            "voice": voice,
+            "speaker": speaker,
+            "speaker_id": speaker_id,
+            "length_scale": length_scale,
+            "noise_scale": noise_scale,
+            "noise_w_scale": noise_w_scale,
         }
+        if any(v is not None for v in overrides.values()):
+            params = self._filter_params(
+                {
+                    k: self._params.value.get(k) if v is None else v
+                    for k, v in overrides.items()
+                }
+            )
+        else:
+            params = self._params.value
+        data = {"text": alias_matcher.substitute(text), **params}
 
-        async with httpx.AsyncClient() as client:
-            logger.debug(f"Piper 请求 data 为: {data}")
-            response = await client.post(self.api_url, json=data, timeout=300)
-            response.raise_for_status()
-            logger.info(f"Piper TTS 成功: {text}")
+        client = self._get_client()
+        logger.debug(f"Piper 请求 data 为: {data}")
+        response = await client.post(self.api_url, json=data)
+        response.raise_for_status()
+        logger.info(f"Piper TTS 成功: {text}")
 
         return response.content
@@ -0,0 +1,54 @@
+"""按播放积压调整语速
+
+弹幕多到播不完时，宁可说快一点也不要让播报越积越多。每次播报前查询目标声道
+待播放的时长：低于 ``cfg.playerRateBacklogLow`` 秒时使用设定语速，超过后线性加快，
+达到 ``cfg.playerRateBacklogHigh`` 秒时使用最大倍率 ``cfg.playerRateMax``。
+
+倍率优先通过后端的语速参数实现（``TTSService.supports_rate``），其余后端由播放器做
+时间伸缩。积压和倍率记录到 ``metrics``（``player.backlog``、``tts.rate``）。
+"""
+
+from loguru import logger
+
+from core.metrics import metrics
+from core.mixer import Channel
+from core.player import audio_player
+from core.qconfig import cfg
+
+
+class RateController:
+    """语速控制器
+
+    Attributes:
+        rate: 最近一次计算出的语速倍率
+        backlog: 最近一次查询到的积压时长（秒）
+    """
+
+    def __init__(self) -> None:
+        self.rate = 1.0
+        self.backlog = 0.0
+
+    @staticmethod
+    def rate_for(backlog: float) -> float:
+        """根据积压时长计算语速倍率（保留两位小数）"""
+        if not cfg.playerAdaptiveRateOn.value:
+            return 1.0
+        low = cfg.playerRateBacklogLow.value
+        high = max(cfg.playerRateBacklogHigh.value, low + 1)
+        ratio = min(1.0, max(0.0, (backlog - low) / (high - low)))
+        return round(1 + (cfg.playerRateMax.value - 1) * ratio, 2)
+
+    def update(self, channel: Channel) -> float:
+        """查询声道积压并返回本次播报使用的语速倍率"""
+        backlog = audio_player.pending_seconds(channel)
+        rate = self.rate_for(backlog)
+        metrics.observe("player.backlog", backlog)
+        metrics.observe("tts.rate", rate)
+        if rate != self.rate:
+            logger.info(f"播报积压 {backlog:.1f}s，语速倍率调整为 {rate:.2f}")
+        self.rate = rate
+        self.backlog = backlog
+        return rate
+
+
+rate_controller = RateController()
@@ -0,0 +1,185 @@
+"""TTS 服务注册表
+
+持有当前使用的 TTS 服务，并在相关配置变化时热切换：
+后台创建并预热新服务，就绪后一次性替换；旧服务等正在进行的合成结束后再关闭，
+切换期间的播报继续由旧服务完成，不会丢失。
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from functools import partial
+
+from loguru import logger
+from qfluentwidgets import ConfigItem
+
+from core.qconfig import cfg
+from models.service import ServiceType
+
+from .base import TTSService
+from .fish_speech import FishSpeechService
+from .gpt_sovits import GPTSovitsService
+from .minimax import MinimaxService
+from .piper import PiperService
+
+_FACTORIES: dict[ServiceType, Callable[[], TTSService]] = {
+    ServiceType.FISH_SPEECH: FishSpeechService,
+    ServiceType.GPT_SOVITS: GPTSovitsService,
+    ServiceType.MINIMAX: MinimaxService,
+    ServiceType.PIPER: PiperService,
+}
+
+# 变化后需要重建服务的配置项（其余配置通过 ConfigSnapshot 在服务内部生效）
+_REBUILD_ITEMS: dict[ServiceType, tuple[ConfigItem, ...]] = {
+    ServiceType.FISH_SPEECH: (cfg.fishSpeechApiUrl,),
+    ServiceType.GPT_SOVITS: (
+        cfg.gptSovitsApiUrl,
+        cfg.gptSovitsApiV2Url,
+        cfg.gptSovitsTransport,
+        cfg.gptSovitsGptModel,
+        cfg.gptSovitsSovitsModel,
+    ),
+    ServiceType.MINIMAX: (),
+    ServiceType.PIPER: (cfg.piperApiUrl,),
+}
+
+
+class TTSServiceRegistry:
+    """可热切换的 TTS 服务注册表
+
+    Attributes:
+        switch_delay: 配置变化后等待的秒数，地址输入框每输入一个字符都会触发一次变化，
+            等输入停下来再切换
+    """
+
+    switch_delay = 0.8
+
+    def __init__(self) -> None:
+        self._service: TTSService | None = None
+        self._lock = asyncio.Lock()
+        self._in_flight: dict[TTSService, int] = {}
+        self._retired: set[TTSService] = set()
+        self._switch_task: asyncio.Task | None = None
+
+        cfg.activeTTS.valueChanged.connect(partial(self._on_config_changed, None))
+        for service_type, items in _REBUILD_ITEMS.items():
+            for item in items:
+                item.valueChanged.connect(
+                    partial(self._on_config_changed, service_type)
+                )
+
+    @staticmethod
+    def _create() -> TTSService:
+        """按当前配置创建 TTS 服务"""
+        model_type = cfg.activeTTS.value
+        factory = _FACTORIES.get(model_type)
+        if factory is None:
+            raise ValueError(f"Invalid TTS service: {model_type}")
+        return factory()
+
+    @staticmethod
+    async def _warm_up(service: TTSService) -> None:
+        """预热服务，失败只记录日志：配置是用户选的，仍然切换过去"""
+        try:
+            await service.warm_up()
+        except Exception as e:
+            logger.warning(f"TTS 服务预热失败: {type(service).__name__}: {e}")
+        else:
+            logger.info(f"TTS 服务已就绪: {type(service).__name__}")
+
+    def get(self) -> TTSService:
+        """获取当前 TTS 服务（不预热）"""
+        if self._service is None:
+            self._service = self._create()
+        return self._service
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[TTSService]:
+        """在一次合成期间持有当前服务，期间发生切换也不会关闭它
+
+        首次使用时创建并预热服务。
+        """
+        if self._service is None:
+            async with self._lock:
+                if self._service is None:
+                    service = self._create()
+                    await self._warm_up(service)
+                    self._service = service
+        service = self._service
+        self._in_flight[service] = self._in_flight.get(service, 0) + 1
+        try:
+            yield service
+        finally:
+            self._in_flight[service] -= 1
+            if not self._in_flight[service]:
+                del self._in_flight[service]
+                if service in self._retired:
+                    self._retired.discard(service)
+                    await self._close(service)
+
+    def _on_config_changed(self, service_type: ServiceType | None, *_) -> None:
+        if service_type is not None and service_type != cfg.activeTTS.value:
+            return
+        if self._service is None:
+            # 还没有创建过服务，下次使用时自然按新配置创建
+            return
+        if self._switch_task is not None:
+            self._switch_task.cancel()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 事件循环未运行时无法后台预热，退回到下次使用时再创建
+            self._switch_task = None
+            self._retire_nowait(self._service)
+            self._service = None
+            return
+        self._switch_task = loop.create_task(self._switch())
+
+    async def _switch(self) -> None:
+        """等配置稳定后创建并预热新服务，再替换当前服务"""
+        await asyncio.sleep(self.switch_delay)
+        try:
+            service = self._create()
+        except ValueError as e:
+            logger.error(f"TTS 服务切换失败: {e}")
+            return
+        try:
+            await self._warm_up(service)
+        except asyncio.CancelledError:
+            # 预热期间配置又变了，丢弃这个服务
+            await self._close(service)
+            raise
+        old, self._service = self._service, service
+        self._switch_task = None
+        logger.info(f"TTS 服务已切换到 {type(service).__name__}")
+        if old is not None:
+            if self._in_flight.get(old):
+                self._retired.add(old)
+            else:
+                await self._close(old)
+
+    def _retire_nowait(self, service: TTSService | None) -> None:
+        """标记旧服务待关闭，由最后一个使用者或 close() 关闭"""
+        if service is not None:
+            self._retired.add(service)
+
+    @staticmethod
+    async def _close(service: TTSService) -> None:
+        try:
+            await service.close()
+        except Exception as e:
+            logger.warning(f"关闭 TTS 服务失败: {type(service).__name__}: {e}")
+
+    async def close(self) -> None:
+        """关闭所有服务，释放连接池（应用退出时调用）"""
+        if self._switch_task is not None:
+            self._switch_task.cancel()
+            self._switch_task = None
+        services = self._retired | ({self._service} if self._service else set())
+        self._service = None
+        self._retired.clear()
+        for service in services:
+            await self._close(service)
+
+
+tts_registry = TTSServiceRegistry()
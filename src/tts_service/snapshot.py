@@ -0,0 +1,53 @@
+"""TTS 配置快照
+
+合成热路径上不再逐项读取 ``cfg.*.value``：后端把用到的配置整理成一个不可变对象，
+只有相关 ``ConfigItem`` 发出 ``valueChanged`` 后才在下一次使用时重建。
+"""
+
+from collections.abc import Callable, Iterable
+from typing import Generic, TypeVar
+
+from qfluentwidgets import ConfigItem
+
+T = TypeVar("T")
+
+
+class ConfigSnapshot(Generic[T]):
+    """按需重建的配置快照
+
+    Attributes:
+        version: 快照版本号，相关配置每变化一次加一
+    """
+
+    def __init__(self, items: Iterable[ConfigItem], build: Callable[[], T]) -> None:
+        """
+        Args:
+            items: 快照依赖的配置项
+            build: 根据当前配置构建快照的函数
+        """
+        self._items = list(items)
+        self._build = build
+        self._value: T | None = None
+        self.version = 0
+        for item in self._items:
+            item.valueChanged.connect(self._invalidate)
+
+    def _invalidate(self, *_: object) -> None:
+        self._value = None
+        self.version += 1
+
+    @property
+    def value(self) -> T:
+        """当前快照，失效后首次访问时重建"""
+        if self._value is None:
+            self._value = self._build()
+        return self._value
+
+    def disconnect(self) -> None:
+        """断开与配置项的连接（服务关闭时调用）"""
+        for item in self._items:
+            try:
+                item.valueChanged.disconnect(self._invalidate)
+            except (RuntimeError, TypeError):
+                pass
+        self._items.clear()
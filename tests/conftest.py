@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 与 src 下的入口一致，以 core、tts_service 等顶层包导入
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
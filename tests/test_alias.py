@@ -0,0 +1,84 @@
+"""别名匹配测试"""
+
+import pytest
+
+from tts_service.alias import AliasMatcher
+
+
+class _Signal:
+    def __init__(self) -> None:
+        self._slots = []
+
+    def connect(self, slot) -> None:
+        self._slots.append(slot)
+
+    def emit(self, *args) -> None:
+        for slot in self._slots:
+            slot(*args)
+
+
+class _ConfigItem:
+    """只实现 ``AliasMatcher`` 用到的 ``value`` 和 ``valueChanged``"""
+
+    def __init__(self, value: dict[str, str]) -> None:
+        self.value = value
+        self.valueChanged = _Signal()
+
+    def set(self, value: dict[str, str]) -> None:
+        self.value = value
+        self.valueChanged.emit(value)
+
+
+@pytest.fixture
+def item() -> _ConfigItem:
+    return _ConfigItem({"Merlin": "么林", "Mer": "么", "kinoko": "蘑菇"})
+
+
+def test_substitute(item):
+    matcher = AliasMatcher(item)
+    assert matcher.substitute("kinoko 和 Merlin") == "蘑菇 和 么林"
+
+
+def test_longest_alias_wins(item):
+    matcher = AliasMatcher(item)
+    assert matcher.substitute("Merlin Mer Merl") == "么林 么 么l"
+
+
+def test_replacement_not_substituted_again():
+    matcher = AliasMatcher(_ConfigItem({"a": "b", "b": "c"}))
+    assert matcher.substitute("ab") == "bc"
+
+
+def test_special_characters_escaped():
+    matcher = AliasMatcher(_ConfigItem({"C++": "C 加加", "a.b": "点"}))
+    assert matcher.substitute("C++ axb a.b") == "C 加加 axb 点"
+
+
+def test_matched_returns_only_present_aliases(item):
+    matcher = AliasMatcher(item)
+    assert matcher.matched("Merlin 来了，Merlin 又来了") == {"Merlin": "么林"}
+    assert matcher.matched("没有别名") == {}
+
+
+def test_empty_dict():
+    matcher = AliasMatcher(_ConfigItem({}))
+    assert matcher.substitute("Merlin") == "Merlin"
+    assert matcher.matched("Merlin") == {}
+
+
+def test_recompile_on_change(item):
+    matcher = AliasMatcher(item)
+    assert matcher.substitute("kinoko") == "蘑菇"
+    item.set({"kinoko": "小蘑菇", "新": "心"})
+    assert matcher.substitute("kinoko 新") == "小蘑菇 心"
+    assert matcher.substitute("Merlin") == "Merlin"
+
+
+def test_not_recompiled_without_change(item):
+    matcher = AliasMatcher(item)
+    matcher.substitute("Merlin")
+    pattern = matcher._pattern
+    # 直接修改值而不发出 valueChanged：沿用已编译的正则
+    item.value = {}
+    assert matcher.substitute("Merlin") == "么林"
+    assert matcher._pattern is pattern
@@ -0,0 +1,110 @@
+"""播报记录测试：按用户、事件清除与拒绝名单"""
+
+import asyncio
+
+import pytest
+
+from core import announcement as announcement_module
+from core.announcement import Announcement, AnnouncementRegistry
+
+
+@pytest.fixture
+def registry() -> AnnouncementRegistry:
+    return AnnouncementRegistry()
+
+
+def _add(registry: AnnouncementRegistry, *args, **kwargs) -> Announcement:
+    item = Announcement(*args, **kwargs)
+    registry.add(item)
+    return item
+
+
+def test_purge_user(registry):
+    first = _add(registry, "a", "DANMU_MSG", user_mid=1)
+    second = _add(registry, "b", "SEND_GIFT", user_mid=1)
+    other = _add(registry, "c", "DANMU_MSG", user_mid=2)
+    anonymous = _add(registry, "d")
+    assert registry.purge_user(1) == 2
+    assert first.cancelled and second.cancelled
+    assert not other.cancelled and not anonymous.cancelled
+    # 已取消的不重复计数
+    assert registry.purge_user(1) == 0
+
+
+def test_flush_event(registry):
+    danmu = _add(registry, "a", "DANMU_MSG", user_mid=1)
+    gift = _add(registry, "b", "SEND_GIFT", user_mid=1)
+    assert registry.flush("DANMU_MSG") == 1
+    assert danmu.cancelled and not gift.cancelled
+    assert registry.flush("INTERACT_WORD") == 0
+
+
+def test_flush_all(registry):
+    items = [_add(registry, "a", "DANMU_MSG"), _add(registry, "b")]
+    assert registry.flush() == 2
+    assert all(item.cancelled for item in items)
+
+
+def test_remove_is_idempotent(registry):
+    item = _add(registry, "a", "DANMU_MSG", user_mid=1)
+    registry.remove(item)
+    registry.remove(item)
+    assert len(registry) == 0
+    assert registry.get(item.id) is None
+    assert registry.purge_user(1) == 0
+    assert registry.flush("DANMU_MSG") == 0
+    assert not registry._by_user and not registry._by_event
+
+
+def test_cancel_by_id(registry):
+    item = _add(registry, "a")
+    assert registry.cancel(item.id)
+    assert item.cancelled
+    assert not registry.cancel(item.id + 1000)
+
+
+def test_cancel_stops_synthesis(registry):
+    async def run():
+        item = _add(registry, "a", user_mid=1)
+        item.task = asyncio.create_task(asyncio.sleep(10))
+        registry.purge_user(1)
+        with pytest.raises(asyncio.CancelledError):
+            await item.task
+
+    asyncio.run(run())
+
+
+def test_block_user_expires(registry, monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(announcement_module.time, "monotonic", lambda: now)
+    item = _add(registry, "a", user_mid=1)
+    assert registry.block_user(1, 60) == 1
+    assert item.cancelled
+    assert registry.is_blocked(1)
+    assert not registry.is_blocked(2)
+    assert not registry.is_blocked(None)
+    now = 161.0
+    assert not registry.is_blocked(1)
+
+
+def test_block_user_prunes_expired(registry, monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(announcement_module.time, "monotonic", lambda: now)
+    registry.block_user(1, 10)
+    now = 200.0
+    registry.block_user(2, 10)
+    assert set(registry._denied) == {2}
+
+
+def test_unblock_user(registry):
+    registry.block_user(1, 60)
+    assert registry.unblock_user(1)
+    assert not registry.is_blocked(1)
+    assert not registry.unblock_user(1)
+
+
+def test_block_user_without_duration_only_purges(registry):
+    item = _add(registry, "a", user_mid=1)
+    assert registry.block_user(1, 0) == 1
+    assert item.cancelled
+    assert not registry.is_blocked(1)
@@ -0,0 +1,97 @@
+"""音频数据结构测试：WAV 文件头解析、分块 PCM 流按帧对齐重组"""
+
+import struct
+
+import pytest
+
+from core.audio import AudioClip, AudioFormat, PcmStream, parse_wav_header, pcm_to_wav
+
+FORMAT = AudioFormat(1000, 2, 2)
+
+
+def _drain(stream: PcmStream) -> list[bytes]:
+    chunks = []
+    while (chunk := stream.read_nowait()) is not None:
+        chunks.append(bytes(chunk))
+    return chunks
+
+
+def test_feed_reassembles_unaligned_chunks():
+    pcm = bytes(range(256)) * 4
+    stream = PcmStream(FORMAT)
+    # memoryview 与 bytes 交替，长度不按帧对齐
+    sizes = [3, 5, 1, 7, 2, 6, 9]
+    offset = 0
+    for i, size in enumerate(sizes * 20):
+        if offset >= len(pcm):
+            break
+        part = pcm[offset : offset + size]
+        stream.feed(memoryview(part) if i % 2 == 0 else part)
+        offset += size
+    stream.feed(memoryview(pcm)[offset:])
+    stream.close()
+    chunks = _drain(stream)
+    assert all(len(chunk) % FORMAT.frame_size == 0 for chunk in chunks)
+    assert b"".join(chunks) == pcm
+
+
+def test_feed_drops_trailing_partial_frame():
+    stream = PcmStream(FORMAT)
+    stream.feed(memoryview(b"\x01\x02\x03"))
+    stream.feed(memoryview(b"\x04\x05\x06"))
+    stream.close()
+    assert _drain(stream) == [b"\x01\x02\x03\x04"]
+    assert stream.buffered == 0
+
+
+def test_feed_without_format_passes_through():
+    stream = PcmStream()
+    stream.feed(memoryview(b"\x01\x02\x03"))
+    stream.close()
+    assert _drain(stream) == [b"\x01\x02\x03"]
+
+
+def _chunk(chunk_id: bytes, body: bytes) -> bytes:
+    padding = b"\x00" if len(body) % 2 else b""
+    return chunk_id + struct.pack("<I", len(body)) + body + padding
+
+
+def test_wav_header_offset():
+    pcm = bytes(range(8))
+    wav = pcm_to_wav(FORMAT, pcm)
+    assert parse_wav_header(wav) == (FORMAT, 44)
+    clip = AudioClip.from_wav(wav)
+    assert clip.format == FORMAT
+    assert bytes(clip.data) == pcm
+
+
+def test_wav_header_skips_extra_chunks():
+    wav = pcm_to_wav(FORMAT, bytes(8))
+    # 在 fmt 与 data 之间插入奇数长度的 LIST 块，需按 2 字节对齐跳过
+    extra = _chunk(b"LIST", b"INFOabc")
+    wav = wav[:36] + extra + wav[36:]
+    assert parse_wav_header(wav) == (FORMAT, 44 + len(extra))
+
+
+def test_wav_header_incomplete():
+    wav = pcm_to_wav(FORMAT, bytes(8))
+    assert parse_wav_header(wav[:8]) is None
+    assert parse_wav_header(wav[:30]) is None
+    # 到 data 块头为止即可解析，不需要 PCM 数据
+    assert parse_wav_header(wav[:44]) == (FORMAT, 44)
+
+
+def test_wav_streaming_length_field():
+    pcm = bytes(range(12))
+    wav = bytearray(pcm_to_wav(FORMAT, pcm))
+    struct.pack_into("<I", wav, 40, 0xFFFFFFFF)
+    assert bytes(AudioClip.from_wav(bytes(wav)).data) == pcm
+
+
+def test_wav_rejects_non_pcm():
+    wav = bytearray(pcm_to_wav(FORMAT, bytes(8)))
+    struct.pack_into("<H", wav, 20, 3)
+    with pytest.raises(ValueError):
+        parse_wav_header(bytes(wav))
+    with pytest.raises(ValueError):
+        parse_wav_header(b"RIFF\x00\x00\x00\x00AVI ")
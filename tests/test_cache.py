@@ -0,0 +1,59 @@
+"""播报音频缓存测试：按字节数淘汰"""
+
+from core.audio import AudioClip, AudioFormat
+from tts_service.cache import AudioCache
+
+FORMAT = AudioFormat(1000, 1, 2)
+
+
+def _clip(nbytes: int) -> AudioClip:
+    return AudioClip(FORMAT, bytes(nbytes))
+
+
+def test_evicts_least_recently_used_by_nbytes():
+    cache = AudioCache(100)
+    cache.put("a", _clip(40))
+    cache.put("b", _clip(40))
+    assert cache.get("a") is not None
+    cache.put("c", _clip(40))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache._size == 80
+
+
+def test_large_clip_evicts_several_entries():
+    cache = AudioCache(100)
+    for key in "abcd":
+        cache.put(key, _clip(20))
+    cache.put("e", _clip(70))
+    assert [key for key in "abcde" if cache.get(key) is not None] == ["d", "e"]
+    assert cache._size == 90
+
+
+def test_replacing_key_updates_size():
+    cache = AudioCache(100)
+    cache.put("a", _clip(60))
+    cache.put("a", _clip(30))
+    cache.put("b", _clip(60))
+    assert cache.get("a") is not None
+    assert cache._size == 90
+
+
+def test_oversized_clip_not_cached():
+    cache = AudioCache(100)
+    cache.put("a", _clip(50))
+    cache.put("b", _clip(101))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+def test_clear_and_hit_counters():
+    cache = AudioCache(100)
+    cache.put("a", _clip(10))
+    cache.get("a")
+    cache.get("b")
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache._size == 0
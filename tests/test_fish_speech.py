@@ -0,0 +1,69 @@
+"""Fish Speech 测试：流式请求失败时的退回策略"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from core.audio import AudioFormat, pcm_to_wav
+from core.qconfig import cfg
+from tts_service.fish_speech import FishSpeechService
+
+FORMAT = AudioFormat(44100, 1, 2)
+PCM = bytes(range(100)) * 4
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(cfg.fishSpeechStreamOn, "value", True)
+    monkeypatch.setattr(cfg.aliasDict, "value", {})
+    return FishSpeechService()
+
+
+def _stream(service: FishSpeechService, response: httpx.Response) -> list:
+    """流式请求返回 ``response``，整段合成返回完整 WAV"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if json.loads(request.content)["streaming"]:
+            return response
+        return httpx.Response(200, content=pcm_to_wav(FORMAT, PCM))
+
+    async def run():
+        service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return [item async for item in service.stream_speech("你好")]
+        finally:
+            await service.close()
+
+    return asyncio.run(run())
+
+
+def _pcm(items: list) -> bytes:
+    return b"".join(bytes(data) for _, data in items)
+
+
+@pytest.mark.parametrize("status", [400, 404, 405, 415, 422])
+def test_unsupported_status_disables_streaming(service, status):
+    assert _pcm(_stream(service, httpx.Response(status))) == PCM
+    assert not service.supports_streaming
+
+
+@pytest.mark.parametrize("status", [401, 403, 429, 500, 503])
+def test_transient_status_falls_back_once(service, status):
+    assert _pcm(_stream(service, httpx.Response(status))) == PCM
+    assert service.supports_streaming
+
+
+def test_non_wav_body_disables_streaming(service):
+    response = httpx.Response(200, content=b"RIFF\x00\x00\x00\x00MP3 not a wave")
+    assert _pcm(_stream(service, response)) == PCM
+    assert not service.supports_streaming
+
+
+def test_streaming_response(service):
+    response = httpx.Response(200, content=pcm_to_wav(FORMAT, PCM))
+    items = _stream(service, response)
+    assert items[0][0] == FORMAT
+    assert _pcm(items) == PCM
+    assert service.supports_streaming
@@ -0,0 +1,73 @@
+"""礼物合并测试：清除被禁言用户的礼物组"""
+
+import asyncio
+
+import pytest
+
+from bilibili.gift_merger import GiftMerger
+from core.announcement import announcements
+from core.qconfig import cfg
+from models.bilibili import GiftMessage
+
+
+@pytest.fixture
+def merger(monkeypatch) -> GiftMerger:
+    monkeypatch.setattr(cfg.giftMergeOn, "value", True)
+    return GiftMerger()
+
+
+def _gift(user_mid: int, user_name: str, gift_name: str, gift_num: int = 1):
+    return GiftMessage(
+        user_mid=user_mid, user_name=user_name, gift_name=gift_name, gift_num=gift_num
+    )
+
+
+def _add(merger: GiftMerger, *gifts: GiftMessage) -> None:
+    async def run():
+        for gift in gifts:
+            await merger.add_gift(gift)
+
+    asyncio.run(run())
+
+
+def test_remove_user(merger):
+    _add(
+        merger,
+        _gift(1, "a", "辣条"),
+        _gift(1, "a", "辣条", 9),
+        _gift(1, "a", "小心心"),
+        _gift(2, "b", "辣条"),
+    )
+    assert merger.user_gift_groups[("a", "辣条")].total_num == 10
+    assert merger.remove_user(1) == 2
+    assert list(merger.user_gift_groups) == [("b", "辣条")]
+    assert merger.remove_user(1) == 0
+    assert merger.remove_user(2) == 1
+    assert not merger.user_gift_groups
+
+
+def test_flushed_group_leaves_user_index(merger, monkeypatch):
+    spoken = []
+
+    async def process_single_gift(gift):
+        spoken.append(gift.gift_name)
+
+    monkeypatch.setattr(merger, "_process_single_gift", process_single_gift)
+    _add(merger, _gift(1, "a", "辣条"), _gift(1, "a", "小心心"))
+    asyncio.run(merger._process_user_gift_group(("a", "辣条")))
+    assert spoken == ["辣条"]
+    assert merger.remove_user(1) == 1
+    assert not merger.user_gift_groups
+
+    _add(merger, _gift(2, "b", "辣条"))
+    asyncio.run(merger.clear_all())
+    assert merger.remove_user(2) == 0
+
+
+def test_blocked_user_gifts_ignored(merger):
+    announcements.block_user(3, 60)
+    try:
+        _add(merger, _gift(3, "c", "辣条"), _gift(2, "b", "辣条"))
+    finally:
+        announcements.unblock_user(3)
+    assert list(merger.user_gift_groups) == [("b", "辣条")]
@@ -0,0 +1,188 @@
+"""GPT-SoVITS 测试：api_v2 请求体映射、流式 WAV 头解析与 Gradio 权重记录"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from core.audio import AudioFormat, pcm_to_wav
+from core.const import GPT_SOVITS_TRANSPORT_API_V2
+from core.qconfig import cfg
+from tts_service import gpt_sovits
+from tts_service.gpt_sovits import GPTSovitsService, GradioClient
+
+PCM = bytes(range(256)) * 8
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(cfg.gptSovitsTransport, "value", GPT_SOVITS_TRANSPORT_API_V2)
+    monkeypatch.setattr(cfg.gptSovitsStreamOn, "value", True)
+    monkeypatch.setattr(cfg.aliasDict, "value", {})
+    service = GPTSovitsService()
+    yield service
+    asyncio.run(service.close())
+
+
+def test_api_v2_payload_mapping(service, monkeypatch):
+    monkeypatch.setattr(cfg.gptSovitsTextLang, "value", "Japanese")
+    monkeypatch.setattr(cfg.gptSovitsTextSplitMethod, "value", "凑四句一切")
+    params = service._resolve_params()
+    payload = service._build_api_v2_payload("你好", params, streaming=True)
+    assert payload["text_lang"] == "ja"
+    assert payload["prompt_lang"] == "auto"
+    assert payload["text_split_method"] == "cut1"
+    assert payload["streaming_mode"] is True
+    assert payload["media_type"] == "wav"
+
+    params["ref_text_free"] = True
+    params["ref_text"] = "参考文本"
+    payload = service._build_api_v2_payload("你好", params, streaming=False)
+    assert payload["prompt_text"] == ""
+    assert payload["streaming_mode"] is False
+
+
+def test_api_v2_stream_strips_split_header(service):
+    wav = pcm_to_wav(AudioFormat(32000, 1, 2), PCM)
+    # 文件头被拆到多个块中，且第一段 PCM 与文件头在同一块
+    chunks = [wav[:7], wav[7:30], wav[30:50], wav[50:777], wav[777:]]
+    requests = []
+
+    async def body():
+        for chunk in chunks:
+            yield chunk
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=body())
+
+    async def run():
+        service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return [item async for item in service.stream_speech("你好")]
+
+    items = asyncio.run(run())
+    assert {audio_format for audio_format, _ in items} == {AudioFormat(32000, 1, 2)}
+    assert b"".join(bytes(data) for _, data in items) == PCM
+    assert requests[0].url.path == "/tts"
+    assert json.loads(requests[0].content)["streaming_mode"] is True
+
+
+class _Response:
+    def __init__(self, data: dict):
+        self._data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self) -> None:
+        pass
+
+    async def json(self) -> dict:
+        return self._data
+
+
+class _Session:
+    """只响应 ``/config`` 的假 aiohttp 会话"""
+
+    def __init__(self, app_id: str | None):
+        self.config = {
+            "version": "4.0",
+            "dependencies": [
+                {"api_name": "change_sovits_weights", "id": 1},
+                {"api_name": "change_gpt_weights", "id": 2},
+            ],
+        }
+        if app_id:
+            self.config["app_id"] = app_id
+
+    def get(self, url: str) -> _Response:
+        assert url.endswith("/config")
+        return _Response(self.config)
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def server_cache(tmp_path, monkeypatch):
+    server_cache = gpt_sovits.GradioServerCache(tmp_path / "gradio.json")
+    monkeypatch.setattr(gpt_sovits, "gradio_server_cache", server_cache)
+    return server_cache
+
+
+def _client(app_id: str | None) -> GradioClient:
+    client = GradioClient("http://127.0.0.1:9872")
+    client._session = _Session(app_id)
+    return client
+
+
+def test_gradio_weights_trusted_for_same_server(server_cache):
+    async def run():
+        client = _client("app-1")
+        await client.confirm_server()
+        client.record_weights("gpt", "a.ckpt")
+
+        # 同一服务端实例（app_id 不变）：持久化的权重记录可信
+        restarted = _client("app-1")
+        assert restarted.applied_weights == {}
+        await restarted.confirm_server()
+        assert restarted.applied_weights == {"gpt": "a.ckpt"}
+
+        # 服务端重启后 app_id 改变：旧记录作废
+        restarted = _client("app-2")
+        await restarted.confirm_server()
+        assert restarted.applied_weights == {}
+        assert server_cache.get(restarted.base_url)["weights"] == {}
+
+    asyncio.run(run())
+
+
+def test_gradio_weights_without_app_id_use_session(server_cache):
+    async def run():
+        client = _client(None)
+        await client.confirm_server()
+        client.record_weights("gpt", "a.ckpt")
+        assert client.applied_weights == {"gpt": "a.ckpt"}
+
+        # 无法识别服务端身份：不继承其他会话记录的权重
+        other = _client(None)
+        await other.confirm_server()
+        assert other.applied_weights == {}
+
+    asyncio.run(run())
+
+
+def test_gradio_weight_switch_skipped_when_loaded(server_cache, monkeypatch):
+    monkeypatch.setattr(cfg.gptSovitsTransport, "value", "gradio")
+    monkeypatch.setattr(cfg.gptSovitsGptModel, "value", "a.ckpt")
+    monkeypatch.setattr(cfg.gptSovitsSovitsModel, "value", "a.pth")
+    calls = []
+
+    async def predict(api_name, *args):
+        calls.append(api_name)
+
+    async def run():
+        service = GPTSovitsService()
+        service.client = _client("app-1")
+        service.client.predict = predict
+        await service._apply_gradio_weights()
+        await service._apply_gradio_weights()
+        assert calls == ["/change_sovits_weights", "/change_gpt_weights"]
+
+        # 新会话连到同一服务端实例，也不重复切换
+        service.client = _client("app-1")
+        service.client.predict = predict
+        await service._apply_gradio_weights()
+        assert len(calls) == 2
+
+        # 修改配置后只切换变化的权重
+        monkeypatch.setattr(cfg.gptSovitsGptModel, "value", "b.ckpt")
+        await service._apply_gradio_weights()
+        assert calls[2:] == ["/change_gpt_weights"]
+        await service.close()
+
+    asyncio.run(run())
@@ -0,0 +1,157 @@
+"""天选时刻过滤测试：用实际的 ANCHOR_LOT_START / ANCHOR_LOT_AWARD 消息"""
+
+import pytest
+
+from bilibili import lottery as lottery_module
+from bilibili.lottery import LotteryFilter
+from models.bilibili import AnchorLotAward, AnchorLotStart, DanmuMessage
+
+LOT_ID = 5861943
+KEYWORD = "我要抽鼠标"
+
+# bilibili_api 的事件：外层为房间信息，data 为原始消息（cmd + data）
+LOT_START = {
+    "room_display_id": 21452505,
+    "room_real_id": 21452505,
+    "type": "ANCHOR_LOT_START",
+    "data": {
+        "cmd": "ANCHOR_LOT_START",
+        "data": {
+            "award_image": "",
+            "award_name": "鼠标",
+            "award_num": 2,
+            "cur_gift_num": 0,
+            "current_time": 1760000000,
+            "danmu": KEYWORD,
+            "gift_id": 0,
+            "gift_name": "",
+            "gift_num": 1,
+            "gift_price": 0,
+            "goaway_time": 180,
+            "id": LOT_ID,
+            "join_type": 1,
+            "lot_status": 0,
+            "max_time": 600,
+            "require_text": "当前主播粉丝勋章至少1级",
+            "require_type": 2,
+            "require_value": 1,
+            "room_id": 21452505,
+            "status": 1,
+            "time": 599,
+        },
+    },
+}
+
+LOT_AWARD = {
+    "room_display_id": 21452505,
+    "room_real_id": 21452505,
+    "type": "ANCHOR_LOT_AWARD",
+    "data": {
+        "cmd": "ANCHOR_LOT_AWARD",
+        "data": {
+            "award_dont_popup": 1,
+            "award_image": "",
+            "award_name": "鼠标",
+            "award_num": 2,
+            "award_price_text": "价值 199 元",
+            "award_type": 1,
+            "award_users": [
+                {
+                    "uid": 101,
+                    "uname": "甲",
+                    "face": "",
+                    "level": 21,
+                    "color": 0,
+                    "num": 1,
+                },
+                {
+                    "uid": 102,
+                    "uname": "乙",
+                    "face": "",
+                    "level": 7,
+                    "color": 0,
+                    "num": 1,
+                },
+            ],
+            "id": LOT_ID,
+            "lot_status": 2,
+            "url": "",
+            "web_url": "",
+        },
+    },
+}
+
+
+def _danmu(user_mid: int, message: str = KEYWORD) -> DanmuMessage:
+    return DanmuMessage(user_mid=user_mid, message=message)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    """当前时间，修改列表元素模拟时间流逝"""
+    now = [1760000000.0]
+    monkeypatch.setattr(lottery_module, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def lottery(clock) -> LotteryFilter:
+    lottery = LotteryFilter()
+    lottery.start(AnchorLotStart.parse(LOT_START))
+    return lottery
+
+
+def test_award_parse():
+    lot_award = AnchorLotAward.parse(LOT_AWARD)
+    assert lot_award.id == AnchorLotStart.parse(LOT_START).id == LOT_ID
+    assert [(u.user_mid, u.user_name) for u in lot_award.award_users] == [
+        (101, "甲"),
+        (102, "乙"),
+    ]
+    assert (lot_award.user_mid, lot_award.user_name) == (101, "甲")
+    assert AnchorLotStart.parse(LOT_START).duration == 599
+
+
+def test_suppress_keyword(lottery):
+    assert lottery.suppress(_danmu(1))
+    assert lottery.suppress(_danmu(2, f" {KEYWORD} "))
+    assert not lottery.suppress(_danmu(3, "主播好"))
+
+
+def test_award_ends_suppression(lottery):
+    for user_mid in (1, 2, 2, 3):
+        lottery.suppress(_danmu(user_mid))
+    texts = lottery.award(AnchorLotAward.parse(LOT_AWARD))
+    assert texts == [
+        "本次天选时刻共有 3 人参与",
+        '恭喜 "甲" 抽中了鼠标',
+        '恭喜 "乙" 抽中了鼠标',
+    ]
+    assert not lottery.suppress(_danmu(4))
+
+
+def test_repeated_award_spoken_once(lottery):
+    lottery.suppress(_danmu(1))
+    assert len(lottery.award(AnchorLotAward.parse(LOT_AWARD))) == 3
+    assert lottery.award(AnchorLotAward.parse(LOT_AWARD)) == []
+
+
+def test_expired_lottery_not_suppressed(lottery, clock):
+    # 按开始消息给出的剩余时间加 grace 过期
+    clock[0] += 599 + lottery.grace - 1
+    assert lottery.suppress(_danmu(1))
+    clock[0] += 2
+    assert not lottery.suppress(_danmu(1))
+    assert not lottery._lotteries and not lottery._expires
+
+
+def test_awarded_pruned_after_expiry(lottery, clock):
+    assert len(lottery.award(AnchorLotAward.parse(LOT_AWARD))) == 2
+    clock[0] += 599 + lottery.grace + 1
+    # 另一次抽奖开始时清除已过期抽奖的中奖记录
+    other = AnchorLotStart.parse(LOT_START).model_copy(
+        update={"id": LOT_ID + 1, "danmu": "我要抽键盘"}
+    )
+    lottery.start(other)
+    assert list(lottery._awarded) == []
+    assert list(lottery._expires) == [LOT_ID + 1]
@@ -0,0 +1,66 @@
+"""响度测量测试：门限、分块测量与归一化增益"""
+
+import math
+
+import numpy as np
+import pytest
+
+from core.audio import AudioFormat, Loudness
+from core.loudness import MAX_GAIN_DB, PEAK_LIMIT, LoudnessMeter, normalization_gain
+from core.resample import encode_pcm
+
+FORMAT = AudioFormat(16000, 1, 2)
+
+
+def _sine(amplitude: float, seconds: float) -> bytes:
+    t = np.arange(int(FORMAT.sample_rate * seconds), dtype=np.float32)
+    samples = amplitude * np.sin(2 * np.pi * 440 * t / FORMAT.sample_rate)
+    return encode_pcm(samples[:, None], FORMAT.sample_width)
+
+
+def _lufs(amplitude: float) -> float:
+    # 正弦波的均方能量为振幅平方的一半
+    return -0.691 + 10 * math.log10(amplitude**2 / 2)
+
+
+def test_silence_measures_none():
+    meter = LoudnessMeter(FORMAT)
+    assert meter.measure() is None
+    meter.add(bytes(FORMAT.bytes_per_second))
+    assert meter.ready
+    assert meter.measure() is None
+
+
+def test_sine_loudness():
+    meter = LoudnessMeter(FORMAT)
+    meter.add(_sine(0.5, 2))
+    loudness = meter.measure()
+    assert loudness.lufs == pytest.approx(_lufs(0.5), abs=0.1)
+    assert loudness.peak == pytest.approx(0.5, abs=0.01)
+
+
+def test_quiet_section_excluded_by_relative_gate():
+    meter = LoudnessMeter(FORMAT)
+    data = _sine(0.5, 2) + _sine(0.01, 2)
+    # 不按子块对齐的分块写入
+    size = 997 * FORMAT.frame_size
+    for i in range(0, len(data), size):
+        meter.add(data[i : i + size])
+    loudness = meter.measure()
+    # 低于平均响度 10dB 以上的安静部分不计入，结果接近响亮部分本身；
+    # 不加门限时整体平均会低约 3dB
+    assert loudness.lufs == pytest.approx(_lufs(0.5), abs=0.5)
+
+
+def test_normalization_gain():
+    assert normalization_gain(None, -20) == 1.0
+    # 提升增益有上限
+    gain = normalization_gain(Loudness(-50.0, 0.01), -20)
+    assert gain == pytest.approx(10 ** (MAX_GAIN_DB / 20))
+    # 峰值不超过 PEAK_LIMIT
+    assert normalization_gain(Loudness(-30.0, 0.5), -20) == pytest.approx(
+        PEAK_LIMIT / 0.5
+    )
+    assert normalization_gain(Loudness(-10.0, 0.5), -20) == pytest.approx(
+        10 ** (-10 / 20)
+    )
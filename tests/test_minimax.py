@@ -0,0 +1,99 @@
+"""MiniMax 测试：请求体拼接、audio 字段切分与 hex 解码"""
+
+import asyncio
+import binascii
+import json
+
+import pytest
+
+from core.qconfig import cfg
+from tts_service import minimax
+from tts_service.minimax import MinimaxService, decode_hex_audio, split_audio_field
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(cfg.minimaxApiKey, "value", "test-key")
+    monkeypatch.setattr(cfg.aliasDict, "value", {"Merlin": "么林", "kinoko": "蘑菇"})
+    service = MinimaxService()
+    yield service
+    asyncio.run(service.close())
+
+
+def _body(service: MinimaxService, text: str, mode: str = "pcm", **overrides):
+    body, template = service._build_request(text, mode, **overrides)
+    return json.loads(body), template
+
+
+def test_request_injects_only_matched_aliases(service):
+    body, template = _body(service, "Merlin 晚上好")
+    assert body["text"] == "Merlin 晚上好"
+    assert body["pronunciation_dict"] == {"tone": ["Merlin/么林"]}
+    assert template.headers["Authorization"] == "Bearer test-key"
+
+
+def test_request_without_aliases(service):
+    body, _ = _body(service, "晚上好")
+    assert "pronunciation_dict" not in body
+    assert body["stream"] is False
+    assert _body(service, "晚上好", "stream")[0]["stream"] is True
+
+
+def test_template_rebuilt_only_after_config_change(service, monkeypatch):
+    _, template = _body(service, "a")
+    assert _body(service, "b")[1] is template
+    monkeypatch.setattr(cfg.minimaxSpeed, "value", 1.5)
+    body, rebuilt = _body(service, "c")
+    assert rebuilt is not template
+    assert body["voice_setting"]["speed"] == 1.5
+
+
+def test_request_overrides_bypass_snapshot(service):
+    _, template = _body(service, "a")
+    body, overridden = _body(service, "a", voice_id="other", speed=0.5)
+    assert body["voice_setting"]["voice_id"] == "other"
+    assert body["voice_setting"]["speed"] == 0.5
+    assert _body(service, "a")[1] is template
+
+
+def test_decode_hex_round_trip():
+    audio = bytes(range(256)) * 3
+    assert decode_hex_audio(audio.hex().encode()) == audio
+    assert decode_hex_audio(memoryview(audio.hex().encode())) == audio
+
+
+def test_decode_hex_across_chunks(monkeypatch):
+    monkeypatch.setattr(minimax, "_HEX_CHUNK", 6)
+    audio = bytes(range(50))
+    assert decode_hex_audio(audio.hex().upper().encode()) == audio
+
+
+def test_decode_hex_rejects_invalid():
+    with pytest.raises(binascii.Error):
+        decode_hex_audio(b"abc")
+    with pytest.raises(binascii.Error):
+        decode_hex_audio(b"zz")
+
+
+def test_split_audio_field():
+    audio = bytes(range(16)).hex()
+    content = json.dumps(
+        {
+            "data": {"audio": audio, "status": 2},
+            "extra_info": {"audio_length": 8},
+            "base_resp": {"status_code": 0, "status_msg": "success"},
+        }
+    ).encode()
+    result, field = split_audio_field(content)
+    assert field.tobytes() == audio.encode()
+    assert result["data"] == {"audio": "", "status": 2}
+    assert result["base_resp"]["status_code"] == 0
+    assert decode_hex_audio(field) == bytes(range(16))
+
+
+def test_split_without_audio_field():
+    content = b'{"base_resp":{"status_code":1004,"status_msg":"auth failed"}}'
+    result, field = split_audio_field(content)
+    assert not field
+    assert result["base_resp"]["status_code"] == 1004
+    assert split_audio_field(b"") == ({}, memoryview(b""))
@@ -0,0 +1,79 @@
+"""混音器测试：间隔静音与优先声道压低"""
+
+import numpy as np
+import pytest
+
+from core.audio import AudioClip, AudioFormat, PcmStream
+from core.mixer import Channel, Mixer
+from core.resample import encode_pcm
+
+FORMAT = AudioFormat(1000, 1, 2)
+LEVEL = 0.5
+
+
+def _pcm(seconds: float, level: float = LEVEL) -> bytes:
+    frames = round(FORMAT.sample_rate * seconds)
+    return encode_pcm(np.full((frames, 1), level, np.float32), FORMAT.sample_width)
+
+
+def _clip(seconds: float, level: float = LEVEL) -> AudioClip:
+    return AudioClip(FORMAT, _pcm(seconds, level))
+
+
+@pytest.fixture
+def mixer() -> Mixer:
+    mixer = Mixer(FORMAT)
+    mixer.clip_gap = 0.2
+    return mixer
+
+
+def test_clip_gap_between_clips(mixer):
+    mixer.add(Channel.ANNOUNCEMENT, _clip(0.1))
+    mixer.add(Channel.ANNOUNCEMENT, _clip(0.1))
+    out = mixer.mix(500)[:, 0]
+    voiced = np.abs(out) > 0.1
+    assert voiced[:100].all()
+    assert not voiced[100:300].any()
+    assert voiced[300:400].all()
+    assert not voiced[400:].any()
+    assert not mixer.active
+
+
+def test_no_gap_after_last_clip(mixer):
+    mixer.add(Channel.ANNOUNCEMENT, _clip(0.1))
+    out = mixer.mix(300)[:, 0]
+    assert not out[100:].any()
+    assert not mixer.active
+    assert mixer.pending_seconds(Channel.ANNOUNCEMENT) == 0
+
+
+def test_priority_ducks_other_channels(mixer):
+    mixer.add(Channel.ANNOUNCEMENT, _clip(2))
+    mixer.add(Channel.PRIORITY, _clip(1, 0.0))
+    # 增益在 duck_time 内过渡到 duck_gain
+    mixer.mix(500)
+    out = mixer.mix(100)[:, 0]
+    assert out == pytest.approx(LEVEL * mixer.duck_gain, abs=1e-3)
+
+
+def test_priority_still_synthesizing_does_not_duck(mixer):
+    mixer.add(Channel.ANNOUNCEMENT, _clip(2))
+    stream = PcmStream(FORMAT)
+    mixer.add(Channel.PRIORITY, stream)
+    out = mixer.mix(500)[:, 0]
+    assert out == pytest.approx(LEVEL, abs=1e-3)
+
+    stream.feed(_pcm(1, 0.0))
+    stream.close()
+    mixer.mix(500)
+    out = mixer.mix(100)[:, 0]
+    assert out == pytest.approx(LEVEL * mixer.duck_gain, abs=1e-3)
+
+
+def test_gain_restored_after_priority_ends(mixer):
+    mixer.add(Channel.ANNOUNCEMENT, _clip(2))
+    mixer.add(Channel.PRIORITY, _clip(0.3, 0.0))
+    mixer.mix(300)
+    mixer.mix(500)
+    out = mixer.mix(100)[:, 0]
+    assert out == pytest.approx(LEVEL, abs=1e-3)
@@ -0,0 +1,36 @@
+"""文本规范化测试"""
+
+import pytest
+
+from tts_service.normalizer import TextNormalizer
+
+compress = TextNormalizer.compress_repeats
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "我充了10000块",
+        "100000电池",
+        "1.00000",
+        "2333333",
+        "醒目留言 30 元，送了 1111 个小心心",
+    ],
+)
+def test_numbers_pass_through(text):
+    assert compress(text, 3) == text
+
+
+def test_repeated_characters_compressed():
+    assert compress("哈哈哈哈哈哈", 3) == "哈哈哈"
+    assert compress("？？？？？", 1) == "？"
+
+
+def test_repeated_phrases_compressed():
+    assert compress("awslawslawslawsl", 2) == "awslawsl"
+    assert compress("好耶好耶好耶好耶", 3) == "好耶好耶好耶"
+
+
+def test_numbers_next_to_repeats_kept():
+    assert compress("哈哈哈哈哈10000", 3) == "哈哈哈10000"
+    assert compress("好耶好耶好耶好耶100000", 2) == "好耶好耶100000"
@@ -0,0 +1,96 @@
+"""播放器测试：跟随系统默认设备、复用输出流、重新打开输出流时保留缓冲"""
+
+import pytest
+
+from core import player as player_module
+from core.audio import AudioFormat
+from core.player import DEFAULT_OUTPUT_DEVICE, StreamPlayer
+
+FORMAT = AudioFormat(1000, 1, 2)
+
+
+class _FakeStream:
+    """只实现播放器用到的输出流接口，不打开音频设备"""
+
+    def __init__(self, device: int, **kwargs) -> None:
+        self.device = device
+        self.active = False
+        self.stopped = True
+        self.closed = False
+
+    def start(self) -> None:
+        self.active, self.stopped = True, False
+
+    def stop(self) -> None:
+        self.active, self.stopped = False, True
+
+    def close(self, ignore_errors: bool = False) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def default_device(monkeypatch) -> list[int]:
+    """系统默认输出设备，修改列表元素模拟系统设置变化"""
+    device = [3]
+    monkeypatch.setattr(
+        StreamPlayer, "default_output_index", property(lambda self: device[0])
+    )
+    return device
+
+
+@pytest.fixture
+def player(monkeypatch, default_device) -> StreamPlayer:
+    monkeypatch.setattr(player_module.sd, "RawOutputStream", _FakeStream)
+    return StreamPlayer()
+
+
+def test_default_device_resolved_when_stream_opens(player, default_device):
+    assert player.set_output_device(DEFAULT_OUTPUT_DEVICE)
+    assert player.device_index == DEFAULT_OUTPUT_DEVICE
+    assert player._open_stream(FORMAT).device == 3
+
+    default_device[0] = 5
+    stream = player._open_stream(FORMAT)
+    assert stream.device == 5
+    assert player.device_index == DEFAULT_OUTPUT_DEVICE
+
+
+def test_reopen_keeps_buffered_audio(player):
+    player._open_stream(FORMAT)
+    ring = player._ring
+    ring.write(b"\x01\x02" * 10)
+    player._close_stream()
+    player._open_stream(FORMAT)
+    assert player._ring is ring
+    assert ring.available == 20
+
+
+def test_format_change_rebuilds_buffer(player):
+    player._open_stream(FORMAT)
+    ring = player._ring
+    ring.write(b"\x01\x02" * 10)
+    player._open_stream(AudioFormat(2000, 2, 2))
+    assert player._ring is not ring
+    assert player._ring.available == 0
+
+
+def test_fill_skips_stream_closed_by_another_thread(player):
+    stream = player._open_stream(FORMAT)
+    player._close_stream()
+    # 已关闭的流不再启动
+    player._fill(stream, FORMAT)
+    assert not stream.active
+
+
+def test_stream_reused_for_same_device_and_format(player, default_device):
+    stream = player._open_stream(FORMAT)
+    assert player._open_stream(FORMAT) is stream
+    assert not stream.closed
+
+    # 格式或设备变化时才关闭旧流重新打开
+    other = player._open_stream(AudioFormat(2000, 2, 2))
+    assert other is not stream and stream.closed
+    default_device[0] = 4
+    reopened = player._open_stream(AudioFormat(2000, 2, 2))
+    assert reopened is not other and other.closed
+    assert reopened.device == 4
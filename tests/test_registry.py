@@ -0,0 +1,108 @@
+"""TTS 服务注册表测试：热切换时等正在进行的合成结束再关闭旧服务"""
+
+import asyncio
+
+import pytest
+
+from tts_service.registry import TTSServiceRegistry
+
+
+class _Service:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.warmed = False
+        self.closed = False
+
+    async def warm_up(self) -> None:
+        self.warmed = True
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def services(monkeypatch) -> list[_Service]:
+    """按创建顺序记录注册表创建的服务"""
+    created: list[_Service] = []
+
+    def create() -> _Service:
+        created.append(_Service(f"service-{len(created)}"))
+        return created[-1]
+
+    monkeypatch.setattr(TTSServiceRegistry, "_create", staticmethod(create))
+    monkeypatch.setattr(TTSServiceRegistry, "switch_delay", 0)
+    return created
+
+
+async def _switch(registry: TTSServiceRegistry) -> None:
+    registry._on_config_changed(None)
+    await registry._switch_task
+
+
+def test_acquire_creates_and_warms_up(services):
+    async def run():
+        registry = TTSServiceRegistry()
+        async with registry.acquire() as service:
+            assert service.warmed
+        async with registry.acquire() as again:
+            assert again is service
+        assert len(services) == 1
+        assert not service.closed
+
+    asyncio.run(run())
+
+
+def test_close_after_drain(services):
+    async def run():
+        registry = TTSServiceRegistry()
+        async with registry.acquire() as old:
+            await _switch(registry)
+            new = registry.get()
+            assert new is not old and new.warmed
+            # 切换期间正在进行的合成继续使用旧服务
+            assert not old.closed
+            async with registry.acquire() as current:
+                assert current is new
+        assert old.closed
+        assert not new.closed
+
+    asyncio.run(run())
+
+
+def test_idle_service_closed_on_switch(services):
+    async def run():
+        registry = TTSServiceRegistry()
+        async with registry.acquire() as old:
+            pass
+        await _switch(registry)
+        assert old.closed
+        assert registry.get() is services[1]
+
+    asyncio.run(run())
+
+
+def test_rapid_changes_create_one_service(services, monkeypatch):
+    monkeypatch.setattr(TTSServiceRegistry, "switch_delay", 0.01)
+
+    async def run():
+        registry = TTSServiceRegistry()
+        async with registry.acquire():
+            pass
+        for _ in range(3):
+            registry._on_config_changed(None)
+        await registry._switch_task
+        assert len(services) == 2
+
+    asyncio.run(run())
+
+
+def test_close_releases_all(services):
+    async def run():
+        registry = TTSServiceRegistry()
+        async with registry.acquire() as old:
+            await _switch(registry)
+            await registry.close()
+            # 退出时不等正在进行的合成
+            assert old.closed and services[1].closed
+
+    asyncio.run(run())
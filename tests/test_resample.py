@@ -0,0 +1,48 @@
+"""PCM 格式转换测试：重采样后的帧数、声道映射与分块转换"""
+
+import numpy as np
+import pytest
+
+from core.audio import AudioFormat
+from core.resample import PcmConverter, decode_pcm, encode_pcm
+
+TARGET = AudioFormat(48000, 2, 2)
+
+
+def _sine(audio_format: AudioFormat, seconds: float = 1.0) -> bytes:
+    frames = int(audio_format.sample_rate * seconds)
+    t = np.arange(frames, dtype=np.float32) / audio_format.sample_rate
+    samples = 0.5 * np.sin(2 * np.pi * 440 * t)[:, None]
+    samples = np.repeat(samples, audio_format.channels, axis=1)
+    return encode_pcm(samples, audio_format.sample_width)
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_resample_32k_to_48k_stereo_frame_count(channels):
+    source = AudioFormat(32000, channels, 2)
+    out = PcmConverter(source, TARGET).convert(_sine(source))
+    frames = len(out) // TARGET.frame_size
+    assert len(out) % TARGET.frame_size == 0
+    assert abs(frames - 48000) <= 1
+    samples = decode_pcm(out, 2, 2)
+    # 单声道复制到两个声道
+    assert np.array_equal(samples[:, 0], samples[:, 1])
+
+
+def test_chunked_conversion_matches_whole_buffer():
+    source = AudioFormat(32000, 1, 2)
+    data = _sine(source)
+    whole = decode_pcm(PcmConverter(source, TARGET).convert(data), 2, 2)
+
+    converter = PcmConverter(source, TARGET)
+    # 块大小不整除采样率比例，插值相位需跨块保持
+    size = 317 * source.frame_size
+    chunks = [converter.convert(data[i : i + size]) for i in range(0, len(data), size)]
+    chunked = decode_pcm(b"".join(chunks), 2, 2)
+    assert chunked.shape == whole.shape
+    assert np.allclose(chunked, whole, atol=2 / 32768)
+
+
+def test_identity_passes_data_through():
+    data = _sine(TARGET, 0.01)
+    assert PcmConverter(TARGET, TARGET).convert(data) is data
@@ -0,0 +1,53 @@
+"""环形缓冲区测试"""
+
+import random
+
+from core.ring_buffer import RingBuffer
+
+
+def _read(ring: RingBuffer, size: int) -> bytes:
+    out = bytearray(size)
+    read = ring.read_into(memoryview(out))
+    return bytes(out[:read])
+
+
+def test_write_limited_to_free_space():
+    ring = RingBuffer(8)
+    assert ring.write(b"0123456789") == 8
+    assert ring.available == 8
+    assert ring.free == 0
+    assert ring.write(b"x") == 0
+
+
+def test_read_limited_to_available():
+    ring = RingBuffer(8)
+    ring.write(b"abc")
+    out = bytearray(b"......")
+    assert ring.read_into(memoryview(out)) == 3
+    assert out == b"abc..."
+    assert ring.read_into(memoryview(out)) == 0
+
+
+def test_wraparound():
+    ring = RingBuffer(8)
+    ring.write(b"abcdef")
+    assert _read(ring, 5) == b"abcde"
+    # 写入跨过缓冲区末尾
+    assert ring.write(b"ghijklm") == 7
+    assert ring.available == 8
+    # 读取同样跨过末尾
+    assert _read(ring, 8) == b"fghijklm"
+    assert ring.available == 0
+
+
+def test_random_round_trip():
+    rng = random.Random(0)
+    ring = RingBuffer(37)
+    source = bytes(rng.randrange(256) for _ in range(10000))
+    written = 0
+    result = bytearray()
+    while len(result) < len(source):
+        size = rng.randrange(1, 50)
+        written += ring.write(source[written : written + size])
+        result += _read(ring, rng.randrange(1, 50))
+    assert result == source
@@ -0,0 +1,78 @@
+"""配置快照测试：只在相关配置变化后重建"""
+
+from tts_service.snapshot import ConfigSnapshot
+
+
+class _Signal:
+    def __init__(self) -> None:
+        self._slots = []
+
+    def connect(self, slot) -> None:
+        self._slots.append(slot)
+
+    def disconnect(self, slot) -> None:
+        self._slots.remove(slot)
+
+    def emit(self, *args) -> None:
+        for slot in list(self._slots):
+            slot(*args)
+
+
+class _ConfigItem:
+    def __init__(self, value) -> None:
+        self.value = value
+        self.valueChanged = _Signal()
+
+    def set(self, value) -> None:
+        self.value = value
+        self.valueChanged.emit(value)
+
+
+def _snapshot(*items: _ConfigItem):
+    builds = []
+
+    def build():
+        builds.append(None)
+        return tuple(item.value for item in items)
+
+    return ConfigSnapshot(items, build), builds
+
+
+def test_built_lazily_once():
+    item = _ConfigItem(1)
+    snapshot, builds = _snapshot(item)
+    assert not builds
+    assert snapshot.value == (1,)
+    assert snapshot.value == (1,)
+    assert len(builds) == 1
+
+
+def test_rebuilt_after_change():
+    first, second = _ConfigItem(1), _ConfigItem("a")
+    snapshot, builds = _snapshot(first, second)
+    assert snapshot.value == (1, "a")
+    second.set("b")
+    assert snapshot.version == 1
+    first.set(2)
+    assert snapshot.version == 2
+    assert snapshot.value == (2, "b")
+    assert len(builds) == 2
+
+
+def test_unrelated_change_keeps_snapshot():
+    item, other = _ConfigItem(1), _ConfigItem(2)
+    snapshot, builds = _snapshot(item)
+    value = snapshot.value
+    other.set(3)
+    assert snapshot.value is value
+    assert snapshot.version == 0
+
+
+def test_disconnect():
+    item = _ConfigItem(1)
+    snapshot, builds = _snapshot(item)
+    snapshot.value
+    snapshot.disconnect()
+    item.set(2)
+    assert snapshot.value == (1,)
+    assert not item.valueChanged._slots
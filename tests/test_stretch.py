@@ -0,0 +1,42 @@
+"""时间伸缩测试：输出时长与分块处理"""
+
+import numpy as np
+import pytest
+
+from core.stretch import TimeStretcher
+
+SAMPLE_RATE = 16000
+
+
+def _tone(frames: int, channels: int = 1) -> np.ndarray:
+    t = np.arange(frames, dtype=np.float32) / SAMPLE_RATE
+    samples = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)[:, None]
+    return np.repeat(samples, channels, axis=1)
+
+
+def _stretch(stretcher: TimeStretcher, samples: np.ndarray, size: int) -> np.ndarray:
+    outputs = [
+        stretcher.process(samples[i : i + size]) for i in range(0, len(samples), size)
+    ]
+    return np.concatenate([*outputs, stretcher.flush()])
+
+
+@pytest.mark.parametrize("rate", [0.8, 1.0, 1.25, 1.5])
+@pytest.mark.parametrize("size", [160, 1021, 16000])
+def test_output_length_follows_rate(rate, size):
+    samples = _tone(SAMPLE_RATE, channels=2)
+    out = _stretch(TimeStretcher(rate, SAMPLE_RATE, 2), samples, size)
+    assert out.shape == (round(SAMPLE_RATE / rate), 2)
+
+
+def test_short_input_length():
+    # 不足一个分析帧的输入也按倍率输出
+    out = _stretch(TimeStretcher(1.25, SAMPLE_RATE, 1), _tone(400), 400)
+    assert len(out) == 320
+
+
+def test_unit_rate_preserves_tone():
+    samples = _tone(SAMPLE_RATE)
+    out = _stretch(TimeStretcher(1.0, SAMPLE_RATE, 1), samples, 1021)
+    # 重叠一半的 Hann 窗叠加为 1，匀速时波形基本不变
+    assert np.allclose(out[1000:-1000], samples[1000:-1000], atol=1e-3)
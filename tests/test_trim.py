@@ -0,0 +1,62 @@
+"""静音裁剪测试：首尾裁剪、max_trim 上限与中间静音保留"""
+
+import pytest
+
+from core.audio import AudioFormat
+from core.trim import SilenceTrimmer
+
+# 1kHz 单声道：10ms 窗口为 10 帧，padding 为 50 帧
+FORMAT = AudioFormat(1000, 1, 2)
+
+
+def _silence(ms: int) -> bytes:
+    return bytes(ms * FORMAT.frame_size)
+
+
+def _tone(ms: int) -> bytes:
+    return (16000).to_bytes(2, "little", signed=True) * ms
+
+
+def _trim(data: bytes, max_trim: float, size: int = 73) -> tuple[bytes, SilenceTrimmer]:
+    # 块大小为奇数字节，帧会被拆开
+    trimmer = SilenceTrimmer(FORMAT, max_trim, threshold_db=-50)
+    out = []
+    for i in range(0, len(data), size):
+        out += trimmer.feed(data[i : i + size])
+    out += trimmer.finish()
+    return b"".join(bytes(part) for part in out), trimmer
+
+
+def test_trims_leading_and_trailing_keeping_padding():
+    data = _silence(500) + _tone(200) + _silence(300) + _tone(100) + _silence(400)
+    out, trimmer = _trim(data, max_trim=1.0, size=len(data))
+    assert out == _silence(50) + _tone(200) + _silence(300) + _tone(100) + _silence(50)
+    assert trimmer.leading == pytest.approx(0.45)
+    assert trimmer.trailing == pytest.approx(0.35)
+
+
+def test_chunked_trim_within_one_window():
+    data = _silence(500) + _tone(200) + _silence(300) + _tone(100) + _silence(400)
+    out, trimmer = _trim(data, max_trim=1.0)
+    # 分块时有声范围按块内的 10ms 窗口取整，最多多保留一个窗口
+    assert 0.44 <= trimmer.leading <= 0.45
+    assert 0.34 <= trimmer.trailing <= 0.35
+    assert len(data) - len(out) == round(
+        (trimmer.leading + trimmer.trailing) * FORMAT.bytes_per_second
+    )
+    assert _silence(300) + _tone(100) in out
+
+
+def test_trim_bounded_by_max_trim():
+    data = _silence(500) + _tone(200) + _silence(400)
+    out, trimmer = _trim(data, max_trim=0.2)
+    assert out == _silence(300) + _tone(200) + _silence(200)
+    assert trimmer.leading == pytest.approx(0.2)
+    assert trimmer.trailing == pytest.approx(0.2)
+
+
+def test_zero_max_trim_passes_through():
+    data = _silence(100) + _tone(50) + _silence(100)
+    out, trimmer = _trim(data, max_trim=0)
+    assert out == data
+    assert trimmer.leading == trimmer.trailing == 0
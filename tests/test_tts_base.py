@@ -0,0 +1,72 @@
+"""TTS 基类测试：HTTP 连接池复用与默认的流式合成"""
+
+import asyncio
+
+from core.audio import AudioFormat, pcm_to_wav
+from tts_service.base import TTSService
+from tts_service.http import HTTP_LIMITS, create_http_client
+
+FORMAT = AudioFormat(24000, 1, 2)
+PCM = bytes(range(200))
+
+
+class _Service(TTSService):
+    def __init__(self):
+        super().__init__("http://127.0.0.1:9880")
+        self.calls = []
+
+    async def text_to_speech(self, text, **kwargs):
+        self.calls.append((text, kwargs))
+        return pcm_to_wav(FORMAT, PCM)
+
+
+def test_create_http_client_uses_shared_limits():
+    async def run():
+        client = create_http_client(12.5)
+        try:
+            assert client.timeout.read == 12.5
+            pool = client._transport._pool
+            assert pool._max_connections == HTTP_LIMITS.max_connections
+            assert pool._max_keepalive_connections == (
+                HTTP_LIMITS.max_keepalive_connections
+            )
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+
+
+def test_client_reused_until_closed():
+    async def run():
+        service = _Service()
+        client = service._get_client()
+        assert service._get_client() is client
+
+        # 客户端被意外关闭后自动重建
+        await client.aclose()
+        recreated = service._get_client()
+        assert recreated is not client
+        assert not recreated.is_closed
+
+        await service.close()
+        assert recreated.is_closed
+        assert service._client is None
+
+    asyncio.run(run())
+
+
+def test_default_stream_yields_synthesized_clip_once():
+    async def run():
+        service = _Service()
+        items = [item async for item in service.stream_speech("你好", rate=1.5)]
+        await service.close()
+        return service, items
+
+    service, items = asyncio.run(run())
+    assert len(items) == 1
+    audio_format, data = items[0]
+    assert audio_format == FORMAT
+    assert bytes(data) == PCM
+    # 不支持调整语速的后端忽略倍率，只合成一次
+    assert service.calls == [("你好", {})]
+    assert not service.supports_streaming